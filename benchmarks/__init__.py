@@ -0,0 +1,10 @@
+"""Standalone performance benchmarks for the Legal AI Toolkit.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_metadata`` for a
+single suite, or ``python -m benchmarks --save`` to run every suite and store the
+results as ``benchmarks/results/<commit>.json``. Pass ``--compare <file>`` to fail
+on regressions beyond ``--threshold``.
+
+Suites run on deterministic synthetic judgments (``benchmarks.synthetic``) so
+results are comparable between commits.
+"""
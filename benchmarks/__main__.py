@@ -0,0 +1,117 @@
+"""
+Run the benchmark suites, store results per commit and check for regressions.
+
+    python -m benchmarks                         # all suites, default sizes
+    python -m benchmarks --quick                 # small sizes for a fast sanity run
+    python -m benchmarks --suite extractors steps --save
+    python -m benchmarks --compare benchmarks/results/<commit>.json --threshold 0.25
+
+Exits with status 1 when any benchmark regressed by more than the threshold,
+or when a suite with its own pass/fail check (adversarial, imports, executors)
+failed it.
+"""
+import argparse
+import sys
+
+from benchmarks import (
+    bench_adversarial, bench_audit, bench_clustering, bench_executors, bench_extractors, bench_html, bench_imports,
+    bench_metadata, bench_similarity, bench_steps, bench_workers,
+)
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD, RESULTS_DIR, compare, load_results, print_comparison, print_results, save_results,
+)
+
+SUITES = ["metadata", "extractors", "adversarial", "steps", "similarity", "clustering", "audit", "html", "imports", "workers",
+          "executors"]
+
+# Suite parameters: full run and --quick run
+PARAMS = {
+    "metadata": ({"repeat": 20}, {"repeat": 3}),
+    "extractors": ({"documents": 50, "size": 20000, "repeat": 3}, {"documents": 10, "size": 20000, "repeat": 1}),
+    "adversarial": ({"lengths": (100000, 200000, 400000), "repeat": 2}, {"lengths": (100000, 400000), "repeat": 1}),
+    "steps": ({"documents": 100, "size": 20000}, {"documents": 20, "size": 20000}),
+    "similarity": ({"sizes": (1000, 10000, 100000), "max_pairs": 1_000_000}, {"sizes": (1000,), "max_pairs": 100_000}),
+    "clustering": ({"sizes": (500, 1000)}, {"sizes": (200,)}),
+    "audit": ({"documents": 100}, {"documents": 20}),
+    "html": ({"documents": 50, "size": 20000, "repeat": 3}, {"documents": 10, "size": 20000, "repeat": 1}),
+    "imports": ({"repeat": 5}, {"repeat": 2}),
+    "workers": ({"size": 20000}, {"size": 20000}),
+    "executors": ({"documents": 200, "nodes": 3}, {"documents": 60, "nodes": 3}),
+}
+
+
+def run_suite(name, params, failures):
+    """Run one suite and return its results; failed checks are appended to failures."""
+    if name == "metadata":
+        return bench_metadata.run(**params)
+    if name == "extractors":
+        return bench_extractors.run(**params)
+    if name == "adversarial":
+        results, exponents = bench_adversarial.run(**params)
+        for case, extractor in bench_adversarial.superlinear(exponents):
+            print(f"[FAILED] Superlinear: {extractor} on {case} (n^{exponents[(case, extractor)]:.2f})")
+            failures.append(f"adversarial: {extractor} on {case}")
+        return results
+    if name == "steps":
+        return bench_steps.run(**params)
+    if name == "similarity":
+        return bench_similarity.run(**params)
+    if name == "clustering":
+        return bench_clustering.run(**params)
+    if name == "audit":
+        return bench_audit.run(**params)
+    if name == "html":
+        return bench_html.run(**params)
+    if name == "imports":
+        results = bench_imports.run(**params)
+        failures.extend(f"{key}: over budget" for key, row in results.items() if row["violations"])
+        return results
+    if name == "workers":
+        return bench_workers.run(**params)
+    if name == "executors":
+        results = bench_executors.run(**params)
+        failures.extend(f"{key}: a node failed or ran every sharded task" for key in bench_executors.unspread(results))
+        return results
+    raise ValueError(f"Unknown suite: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Legal AI Toolkit benchmark suites")
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=SUITES)
+    parser.add_argument("--quick", action="store_true", help="Use small sizes")
+    parser.add_argument("--save", action="store_true", help=f"Write results to <results-dir>/<commit>.json")
+    parser.add_argument("--results-dir", default=str(RESULTS_DIR))
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = {}
+    params_used = {}
+    failures = []
+    for name in args.suite:
+        params = PARAMS[name][1 if args.quick else 0]
+        params_used[name] = params
+        print(f"\n=== {name} ===")
+        suite_results = run_suite(name, params, failures)
+        if name != "metadata":  # bench_metadata prints its own summary
+            print_results(suite_results)
+        results.update(suite_results)
+
+    if args.save:
+        path = save_results(results, args.results_dir, params={"quick": args.quick, **params_used})
+        print(f"\n[OK] Results written to {path}")
+
+    regressed = False
+    if args.compare:
+        rows = compare(results, load_results(args.compare), args.threshold)
+        print_comparison(rows, args.threshold)
+        regressed = any(row["regression"] for row in rows)
+
+    if failures:
+        print(f"\n[FAILED] {len(failures)} check(s) failed: {', '.join(failures)}")
+    if failures or regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
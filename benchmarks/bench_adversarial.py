@@ -0,0 +1,104 @@
+"""
+Adversarial inputs for the extraction regexes.
+
+Each case is a pathological but realistic document shape (OCR output with no
+full stops, long title-case runs, repeated "v." separators, letter runs with
+no spaces, ...). Every extractor runs on each case at doubling lengths; the
+check fails when time grows clearly faster than the text (the growth exponent
+between the smallest and largest size exceeds ``--max-exponent``) or when a
+call runs out of the per-document time budget.
+"""
+import argparse
+import math
+import sys
+import time
+
+from benchmarks.bench_extractors import EXTRACTORS
+from benchmarks.harness import result_row
+from legal_ai_toolkit.utils.rules import registry
+
+# name -> (repeated unit, terminator); text = unit * k + terminator
+CASES = {
+    "sections_no_period": ("Section 12 and 14 read with Section 302 and ", ""),
+    "section_list_no_act": ("Sections 302, 304, 307, 323, 324, 325, 326, 34 ", ""),
+    "title_case_run": ("In Ramesh Kumar Singh And Others Versus The State ", ""),
+    "versus_chain": ("Ram Kumar v. Shyam Lal v. ", "State"),
+    "letters_no_space": ("ABCDEFGHIJ", ""),
+    "spaces": ("          ", "Section"),
+    "ipc_without_bns": ("Section 302 IPC and Section 304 Indian Penal Code ", ""),
+    "parties_header": ("PETITIONER: RAM KUMAR SHARMA & ORS., ", ""),
+}
+DEFAULT_LENGTHS = (100000, 200000, 400000)
+# Per call; a regression to quadratic time is reported instead of hanging the run
+TIME_BUDGET = 10.0
+DEFAULT_MAX_EXPONENT = 1.5
+# Timings below this are dominated by noise; growth between them is not measured
+NOISE_FLOOR = 0.01
+
+
+def build(case: str, length: int) -> str:
+    unit, terminator = CASES[case]
+    return unit * (length // len(unit) + 1) + terminator
+
+
+def _time(func, text, repeat):
+    """Best time over `repeat` runs and whether any run hit the time budget."""
+    best = float("inf")
+    exceeded = False
+    for _ in range(repeat):
+        with registry.time_budget(TIME_BUDGET) as budget:
+            start = time.perf_counter()
+            func(text)
+            best = min(best, time.perf_counter() - start)
+        exceeded = exceeded or budget.exceeded
+    return best, exceeded
+
+
+def run(lengths=DEFAULT_LENGTHS, repeat=2, only=None):
+    """Return results rows and the growth exponent per (case, extractor)."""
+    results = {}
+    exponents = {}
+    for case in CASES:
+        for name, extractor in EXTRACTORS.items():
+            if only and name not in only:
+                continue
+            runs = [_time(extractor, build(case, n), repeat) for n in lengths]
+            timings = [seconds for seconds, _ in runs]
+            # t ~ n^k  =>  k = log(t2/t1) / log(n2/n1); 1.0 is linear
+            exponent = math.log(max(timings[-1], NOISE_FLOOR) / max(timings[0], NOISE_FLOOR)) / math.log(lengths[-1] / lengths[0])
+            if any(exceeded for _, exceeded in runs):
+                exponent = float("inf")
+            exponents[(case, name)] = exponent
+            results[f"adversarial.{case}.{name}.{lengths[-1] // 1000}k"] = result_row(
+                timings[-1], nbytes=lengths[-1], exponent=exponent)
+    return results, exponents
+
+
+def superlinear(exponents, max_exponent=DEFAULT_MAX_EXPONENT):
+    """(case, extractor) pairs whose time grows faster than n^max_exponent."""
+    return [key for key, exponent in sorted(exponents.items()) if exponent > max_exponent]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check extractor throughput stays ~linear on adversarial input")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS))
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT, help="Allowed growth exponent (1.0 = linear)")
+    parser.add_argument("--only", nargs="*", choices=sorted(EXTRACTORS))
+    args = parser.parse_args()
+
+    results, exponents = run(args.lengths, args.repeat, args.only)
+    failures = superlinear(exponents, args.max_exponent)
+    for (case, name), exponent in sorted(exponents.items()):
+        row = results[f"adversarial.{case}.{name}.{args.lengths[-1] // 1000}k"]
+        flag = "SUPERLINEAR" if (case, name) in failures else ""
+        print(f"  {case:<22} {name:<12} {row['seconds']:9.4f} s  {row['mb_per_sec']:9.2f} MB/s  n^{exponent:.2f}  {flag}")
+
+    if failures:
+        print(f"\n[FAILED] {len(failures)} extractor/input pair(s) grow faster than n^{args.max_exponent}")
+        sys.exit(1)
+    print(f"\n[OK] All extractors within n^{args.max_exponent}")
+
+
+if __name__ == "__main__":
+    main()
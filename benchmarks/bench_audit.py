@@ -0,0 +1,65 @@
+"""
+Audit benchmark: every DataAuditor check over a synthetic processed dataset.
+
+Setup (untimed) runs the pipeline steps on a synthetic raw corpus, then
+similarity and clustering on the result, so the audits see the same files
+they read in a real run.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_steps import run_steps
+from benchmarks.harness import print_results, quiet, result_row
+from legal_ai_toolkit.analytics.audit import DataAuditor
+from legal_ai_toolkit.clustering.centroid import CentroidClusteter
+from legal_ai_toolkit.clustering.refinement import ClusterRefiner
+from legal_ai_toolkit.clustering.similarity import SimilarityProcessor
+
+AUDITS = [
+    "audit_quality",
+    "audit_landmarks",
+    "analyze_edges",
+    "audit_classification_samples",
+    "summarize_clusters",
+    "validate_referential_integrity",
+    "validate_similarity_coherence",
+]
+
+
+def run(documents=100, size=20000, seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_audit_") as workdir:
+        workdir = Path(workdir)
+        _, dirs = run_steps(workdir, documents, size, seed)
+
+        edge_file = workdir / "similarity" / "edges.jsonl"
+        cluster_file = workdir / "similarity" / "clusters.json"
+        refined_file = workdir / "similarity" / "clusters_refined.json"
+        signal_dir = workdir / "similarity" / "signals"
+        with quiet():
+            SimilarityProcessor(dirs["citations_extracted"], signal_dir, edge_file).run(workers=1)
+            CentroidClusteter(edge_file, cluster_file).run()
+            ClusterRefiner(cluster_file, refined_file, signal_dir).run()
+
+        auditor = DataAuditor(dirs["processed"], cluster_file=refined_file, edge_file=edge_file)
+        for name in AUDITS:
+            with quiet():
+                start = time.perf_counter()
+                getattr(auditor, name)()
+                results[f"audit.{name}.{documents}"] = result_row(time.perf_counter() - start, items=documents)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset audits on a synthetic processed corpus")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--size", type=int, default=20000, help="Characters per judgment")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print_results(run(args.documents, args.size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
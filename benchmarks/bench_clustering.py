@@ -0,0 +1,68 @@
+"""
+Clustering benchmark: CentroidClusteter and ClusterRefiner on synthetic edges.
+
+Setup (untimed) writes annotated records and runs SimilarityProcessor to
+produce the edge file and signal files the clustering steps read.
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import print_results, quiet, result_row
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.clustering.centroid import CentroidClusteter, find_clusters_centroid
+from legal_ai_toolkit.clustering.refinement import ClusterRefiner
+from legal_ai_toolkit.clustering.similarity import SimilarityProcessor
+
+DEFAULT_SIZES = (500, 1000)
+
+
+def build_similarity(workdir, documents, seed=0):
+    """Write annotated records and run similarity; returns (signal_dir, edge_file)."""
+    workdir = Path(workdir)
+    SyntheticJudgmentGenerator(seed=seed).write_annotated_corpus(workdir / "judgments", documents)
+    signal_dir = workdir / "signals"
+    edge_file = workdir / "edges.jsonl"
+    with quiet():
+        SimilarityProcessor(workdir / "judgments", signal_dir, edge_file).run(workers=1)
+    return signal_dir, edge_file
+
+
+def run(sizes=DEFAULT_SIZES, seed=0):
+    results = {}
+    for n in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench_clustering_") as workdir:
+            workdir = Path(workdir)
+            signal_dir, edge_file = build_similarity(workdir, n, seed)
+            with open(edge_file, "r", encoding="utf-8") as f:
+                edges = [json.loads(line) for line in f if line.strip()]
+
+            start = time.perf_counter()
+            clusters, _ = find_clusters_centroid(edges)
+            results[f"clustering.centroid_core.{n}"] = result_row(
+                time.perf_counter() - start, items=len(edges), clusters=len(clusters))
+
+            cluster_file = workdir / "clusters.json"
+            with quiet():
+                start = time.perf_counter()
+                CentroidClusteter(edge_file, cluster_file).run()
+                results[f"clustering.centroid.{n}"] = result_row(time.perf_counter() - start, items=len(edges))
+
+                start = time.perf_counter()
+                ClusterRefiner(cluster_file, workdir / "clusters_refined.json", signal_dir).run()
+                results[f"clustering.refine.{n}"] = result_row(time.perf_counter() - start, items=len(clusters))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clustering on synthetic similarity edges")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Judgments per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print_results(run(args.sizes, args.seed))
+
+
+if __name__ == "__main__":
+    main()
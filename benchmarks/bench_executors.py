@@ -0,0 +1,86 @@
+"""
+Full pipeline run with the shared-filesystem executor and several local nodes.
+
+A synthetic raw corpus is run through ``SharedFSExecutor`` in a scratch
+directory, with ``nodes`` node processes started by ``run_local_nodes``
+(short poll interval, so waiting nodes pick up the next wave quickly).
+Besides the wall-clock time of the run, the done markers give the node that
+ran each task: with more than one node and shards big enough to keep a node
+busy, the sharded per-document tasks must not all end up on one node
+(``unspread`` lists the runs where they did, or where a node failed).
+"""
+import argparse
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.harness import print_results, quiet, result_row
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.pipeline.executors import COORDINATION_DIR, SharedFSExecutor, run_local_nodes
+from legal_ai_toolkit.pipeline.orchestrator import PipelineOrchestrator
+from legal_ai_toolkit.utils import codec
+
+# Seconds between a waiting node's checks for free tasks
+POLL_INTERVAL = 0.1
+
+
+def tasks_per_node(run_dir: Path, sharded_only: bool = True) -> Counter:
+    """Number of finished tasks per node, from the run's done markers."""
+    counts = Counter()
+    for path in (run_dir / "done").glob("*.json"):
+        result = codec.load(path)
+        if not sharded_only or "-of-" in result["task"]:
+            counts[result["node"]] += 1
+    return counts
+
+
+def run(documents=200, size=20000, nodes=3, shards=6, seed=0):
+    with tempfile.TemporaryDirectory(prefix="bench_executors_") as workdir:
+        workdir = Path(workdir)
+        raw_paths = SyntheticJudgmentGenerator(seed=seed, size=size).write_raw_corpus(workdir / "raw", documents)
+        nbytes = sum(p.stat().st_size for p in raw_paths)
+        orchestrator = PipelineOrchestrator(
+            raw_dir=str(workdir / "raw"), interim_dir=str(workdir / "interim"),
+            processed_dir=str(workdir / "processed"), annotations_dir=str(workdir / "annotations"),
+        )
+        executor = SharedFSExecutor(workdir / "interim" / COORDINATION_DIR, shards=shards, poll_interval=POLL_INTERVAL)
+        with quiet():
+            start = time.perf_counter()
+            ok = run_local_nodes(orchestrator, executor, nodes)
+            seconds = time.perf_counter() - start
+        counts = tasks_per_node(executor.run_dir)
+
+    tag = f"{documents}x{size // 1000}k"
+    return {
+        f"executors.shared_fs.{nodes}_nodes.{tag}": result_row(
+            seconds, items=documents, nbytes=nbytes, nodes=nodes, ok=ok,
+            sharded_tasks_per_node=dict(sorted(counts.items())),
+        )
+    }
+
+
+def unspread(results):
+    """Runs that failed, or whose sharded tasks all ran on a single node despite several nodes."""
+    return [key for key, row in results.items()
+            if not row["ok"] or (row["nodes"] > 1 and len(row["sharded_tasks_per_node"]) < 2)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a shared-filesystem run with several local nodes")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--size", type=int, default=20000, help="Characters per judgment")
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--shards", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    results = run(args.documents, args.size, args.nodes, args.shards, args.seed)
+    print_results(results)
+    for key, row in results.items():
+        print(f"  {key}: sharded tasks per node {row['sharded_tasks_per_node']}")
+    for key in unspread(results):
+        print(f"[FAILED] {key}: a node failed or one node ran every sharded task")
+
+
+if __name__ == "__main__":
+    main()
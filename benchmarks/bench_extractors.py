@@ -0,0 +1,67 @@
+"""
+Per-extractor throughput on a synthetic corpus.
+
+Every extractor runs over the same deterministic judgments so results are
+comparable between commits (see benchmarks.harness).
+"""
+import argparse
+
+from benchmarks.harness import measure, print_results
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.classification.zero_ml import classify_judgment_domain
+from legal_ai_toolkit.extraction.citations import CitationExtractor
+from legal_ai_toolkit.extraction.metadata import extract_header_metadata
+from legal_ai_toolkit.extraction.sections import SectionExtractor
+from legal_ai_toolkit.extraction.transitions import TransitionExtractor
+from legal_ai_toolkit.pipeline.classification import detect_signals
+from legal_ai_toolkit.utils.database import PrecedentDatabase
+from legal_ai_toolkit.utils.taxonomy import LegalIssueTaxonomy
+
+
+def _match_landmarks(text):
+    for citation in CitationExtractor.extract(text):
+        PrecedentDatabase.match_citation(citation["raw"])
+
+
+EXTRACTORS = {
+    "metadata": extract_header_metadata,
+    "citations": CitationExtractor.extract,
+    "sections": SectionExtractor.extract,
+    "transitions": TransitionExtractor.extract,
+    "taxonomy": LegalIssueTaxonomy.extract,
+    "signals": detect_signals,
+    "zero_ml": classify_judgment_domain,
+    "landmarks": _match_landmarks,
+}
+
+
+def run(documents=50, size=20000, repeat=3, seed=0, only=None):
+    texts = SyntheticJudgmentGenerator(seed=seed, size=size).texts(documents)
+    nbytes = sum(len(t.encode("utf-8")) for t in texts)
+
+    results = {}
+    for name, extractor in EXTRACTORS.items():
+        if only and name not in only:
+            continue
+
+        def work(extractor=extractor):
+            for text in texts:
+                extractor(text)
+
+        results[f"extractors.{name}.{size // 1000}k"] = measure(work, repeat=repeat, items=documents, nbytes=nbytes)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark individual extractors on synthetic judgments")
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--size", type=int, default=20000, help="Characters per judgment")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", choices=sorted(EXTRACTORS))
+    args = parser.parse_args()
+    print_results(run(args.documents, args.size, args.repeat, args.seed, args.only))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Judgment-page HTML-to-text throughput and backend parity.
+
+Runs every available backend of extraction.html_text over synthetic
+Indian Kanoon pages (and optionally saved pages from --html-dir) and
+reports pages/sec. Each fast backend's text is compared with the "bs4"
+reference on every page; ``python -m benchmarks.bench_html`` exits with
+status 1 if any page differs.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.harness import measure, print_results
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.extraction.html_text import BACKENDS, extract_judgment_text
+
+
+def load_pages(documents=50, size=20000, seed=0, html_dir=None):
+    """(name, html) pairs: synthetic pages, then any *.html under html_dir."""
+    generator = SyntheticJudgmentGenerator(seed=seed, size=size)
+    pages = [(generator.judgment_id(i), generator.html(i)) for i in range(documents)]
+    if html_dir:
+        for path in sorted(Path(html_dir).rglob("*.html")):
+            pages.append((str(path), path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def parity(pages, backend):
+    """Names of the pages where backend's text differs from the bs4 reference."""
+    return [name for name, page in pages
+            if extract_judgment_text(page, backend) != extract_judgment_text(page, "bs4")]
+
+
+def run(documents=50, size=20000, repeat=3, seed=0, html_dir=None):
+    pages = load_pages(documents, size, seed, html_dir)
+    nbytes = sum(len(page.encode("utf-8")) for _, page in pages)
+
+    results = {}
+    for backend in BACKENDS:
+        def work(backend=backend):
+            for _, page in pages:
+                extract_judgment_text(page, backend)
+
+        row = measure(work, repeat=repeat, items=len(pages), nbytes=nbytes)
+        if backend != "bs4":
+            mismatches = parity(pages, backend)
+            row["mismatches"] = len(mismatches)
+            if mismatches:
+                print(f"[WARNING] {backend} differs from bs4 on {len(mismatches)}/{len(pages)} page(s), "
+                      f"e.g. {', '.join(mismatches[:3])}")
+            else:
+                print(f"[OK] {backend} matches bs4 on all {len(pages)} page(s)")
+        results[f"html.{backend}.{size // 1000}k"] = row
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark judgment HTML-to-text backends and check parity")
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--size", type=int, default=20000, help="Characters of judgment text per page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--html-dir", help="Also check saved judgment pages (*.html) under this directory")
+    args = parser.parse_args()
+    results = run(args.documents, args.size, args.repeat, args.seed, args.html_dir)
+    print_results(results)
+    if any(row.get("mismatches") for row in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
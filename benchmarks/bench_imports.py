@@ -0,0 +1,92 @@
+"""
+Import-time budget for the package and the CLI.
+
+Each target module is imported in a fresh interpreter under
+``python -X importtime``; the cumulative time of the module (best of
+``repeat`` runs) must stay within its budget in ``IMPORT_BUDGETS``, and
+none of the heavy third-party packages in ``HEAVY_MODULES`` may be loaded
+on the way (``legal_ai_toolkit`` packages export their names lazily, and
+``cli.main`` imports per subcommand). Spawned pool workers pay this cost
+once each, so it is guarded like throughput. ``python -m
+benchmarks.bench_imports`` exits with status 1 on any violation.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+from benchmarks.harness import print_results, result_row
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# module -> allowed cumulative import time (seconds)
+IMPORT_BUDGETS = {
+    "legal_ai_toolkit": 0.05,
+    "legal_ai_toolkit.cli": 0.05,
+    "legal_ai_toolkit.extraction.sections": 0.15,
+    "legal_ai_toolkit.pipeline.runner": 0.3,
+    "legal_ai_toolkit.pipeline.orchestrator": 0.5,
+}
+
+# Loaded only by the commands that use them (downloader, HTML extraction, dashboard, progress bars)
+HEAVY_MODULES = ("requests", "bs4", "lxml", "selectolax", "prettytable", "tqdm", "pyarrow")
+
+
+def import_profile(module: str) -> Tuple[float, Set[str]]:
+    """Cumulative import time of module in a fresh interpreter, and every module it loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT,
+    )
+    seconds = 0.0
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            seconds = int(cumulative) / 1e6
+    return seconds, loaded
+
+
+def violations(module: str, seconds: float, loaded: Set[str]) -> List[str]:
+    problems = []
+    if seconds > IMPORT_BUDGETS[module]:
+        problems.append(f"{module} imports in {seconds * 1000:.1f} ms (budget {IMPORT_BUDGETS[module] * 1000:.0f} ms)")
+    heavy = sorted(name for name in loaded if name in HEAVY_MODULES)
+    if heavy:
+        problems.append(f"{module} loads {', '.join(heavy)}")
+    return problems
+
+
+def run(repeat=5, modules=None):
+    results = {}
+    for module in modules or IMPORT_BUDGETS:
+        profiles = [import_profile(module) for _ in range(repeat)]
+        seconds = min(seconds for seconds, _ in profiles)
+        loaded = set().union(*(loaded for _, loaded in profiles))
+        problems = violations(module, seconds, loaded)
+        for problem in problems:
+            print(f"[WARNING] {problem}")
+        results[f"imports.{module}"] = result_row(seconds, budget=IMPORT_BUDGETS[module], violations=len(problems))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check package and CLI import time against a budget")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (best one counts)")
+    parser.add_argument("--only", nargs="*", choices=sorted(IMPORT_BUDGETS))
+    args = parser.parse_args()
+    results = run(args.repeat, args.only)
+    print_results(results)
+    if any(row["violations"] for row in results.values()):
+        sys.exit(1)
+    print(f"[OK] All {len(results)} module(s) within their import budget")
+
+
+if __name__ == "__main__":
+    main()
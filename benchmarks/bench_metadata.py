@@ -0,0 +1,60 @@
+"""
+Throughput benchmark for extract_header_metadata.
+
+Reports metadata extraction throughput in MB of scanned header per second,
+on the bundled raw judgments and on a newline-free variant of the same text
+(Indian Kanoon pages often come through without line breaks).
+"""
+import argparse
+import time
+from pathlib import Path
+
+from legal_ai_toolkit.extraction.metadata import extract_header, extract_header_metadata
+
+RAW_DIR = Path(__file__).parent.parent / "legal_ai_toolkit" / "data" / "raw" / "judgments"
+
+
+def load_texts():
+    return [p.read_text(encoding="utf-8") for p in sorted(RAW_DIR.glob("*.txt"))]
+
+
+def measure(texts, repeat=20):
+    """Return throughput stats for extracting metadata from every text `repeat` times."""
+    header_bytes = sum(len(extract_header(t).encode("utf-8")) for t in texts) * repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            extract_header_metadata(text)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(texts) * repeat,
+        "header_mb": header_bytes / 1e6,
+        "seconds": elapsed,
+        "mb_per_sec": (header_bytes / 1e6) / elapsed if elapsed else 0.0,
+        "docs_per_sec": (len(texts) * repeat) / elapsed if elapsed else 0.0,
+    }
+
+
+def run(repeat=20):
+    texts = load_texts()
+    results = {
+        "metadata.bundled": measure(texts, repeat),
+        "metadata.no_newlines": measure([t.replace("\n", " ") for t in texts], repeat),
+    }
+    for name, stats in results.items():
+        print(f"{name:<24} {stats['mb_per_sec']:8.2f} MB/s  {stats['docs_per_sec']:8.1f} docs/s  "
+              f"({stats['documents']} docs, {stats['header_mb']:.2f} MB header)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark header metadata extraction")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Similarity benchmark at 1k / 10k / 100k judgments.
+
+Signals come from synthetic annotated records (no text), so large corpora are
+cheap to build. Pairwise scoring is all-pairs up to ``max_pairs``; above that a
+fixed, deterministic sample of pairs is scored and the full all-pairs time is
+projected (100k judgments is ~5e9 pairs). An end-to-end SimilarityProcessor
+run (file I/O, signal files, edge file) is timed at the smallest size.
+"""
+import argparse
+import random
+import tempfile
+import time
+from itertools import combinations, islice
+from pathlib import Path
+
+from benchmarks.harness import print_results, quiet, result_row
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.clustering.similarity import SimilarityProcessor, calculate_similarity_batch, extract_signals
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+BATCH_SIZE = 1000
+
+
+def _label(n: int) -> str:
+    return f"{n // 1000}k" if n >= 1000 and n % 1000 == 0 else str(n)
+
+
+def sample_pairs(ids, max_pairs: int, seed: int = 0):
+    """All pairs when they fit in max_pairs, else a deterministic random sample."""
+    n = len(ids)
+    total = n * (n - 1) // 2
+    if total <= max_pairs:
+        return list(combinations(ids, 2)), total
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < max_pairs:
+        i, j = rng.randrange(n), rng.randrange(n)
+        if i != j:
+            pairs.append((ids[min(i, j)], ids[max(i, j)]))
+    return pairs, total
+
+
+def score_pairs(pairs, signals):
+    edges = 0
+    it = iter(pairs)
+    while True:
+        batch = list(islice(it, BATCH_SIZE))
+        if not batch:
+            return edges
+        edges += len(calculate_similarity_batch((batch, signals)))
+
+
+def run(sizes=DEFAULT_SIZES, max_pairs=1_000_000, seed=0, processor=True):
+    generator = SyntheticJudgmentGenerator(seed=seed)
+    results = {}
+
+    for n in sizes:
+        label = _label(n)
+        records = [generator.annotated_record(i) for i in range(n)]
+
+        start = time.perf_counter()
+        signals = {}
+        for record in records:
+            sig = extract_signals(record)
+            signals[sig["judgment_id"]] = sig
+        results[f"similarity.signals.{label}"] = result_row(time.perf_counter() - start, items=n)
+
+        pairs, total = sample_pairs(list(signals), max_pairs, seed)
+        start = time.perf_counter()
+        edges = score_pairs(pairs, signals)
+        elapsed = time.perf_counter() - start
+        results[f"similarity.pairs.{label}"] = result_row(
+            elapsed, items=len(pairs),
+            total_pairs=total, sampled=len(pairs) < total, edges=edges,
+            projected_all_pairs_seconds=elapsed * total / len(pairs),
+        )
+
+    if processor and sizes:
+        n = min(sizes)
+        with tempfile.TemporaryDirectory(prefix="bench_similarity_") as workdir:
+            workdir = Path(workdir)
+            generator.write_annotated_corpus(workdir / "judgments", n)
+            with quiet():
+                start = time.perf_counter()
+                SimilarityProcessor(workdir / "judgments", workdir / "signals", workdir / "edges.jsonl").run(workers=1)
+                elapsed = time.perf_counter() - start
+        results[f"similarity.processor.{_label(n)}"] = result_row(elapsed, items=n)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark similarity signal extraction and pair scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--max-pairs", type=int, default=1_000_000, help="Score a sample of this many pairs above it")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-processor", action="store_true", help="Skip the end-to-end SimilarityProcessor run")
+    args = parser.parse_args()
+    results = run(args.sizes, args.max_pairs, args.seed, processor=not args.no_processor)
+    print_results(results)
+    for name, row in results.items():
+        if row.get("sampled"):
+            print(f"  {name}: sampled {row['items']} of {row['total_pairs']} pairs, "
+                  f"projected all-pairs time {row['projected_all_pairs_seconds']:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
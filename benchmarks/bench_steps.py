@@ -0,0 +1,77 @@
+"""
+End-to-end timing of every pipeline step on a synthetic raw corpus.
+
+Steps run in pipeline order in a scratch directory, each reading the previous
+step's output, exactly as PipelineOrchestrator.run_full_pipeline wires them.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import print_results, quiet, result_row
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.pipeline.citations import CitationExtractionStep
+from legal_ai_toolkit.pipeline.classification import ClassificationStep
+from legal_ai_toolkit.pipeline.consolidation import ConsolidationStep
+from legal_ai_toolkit.pipeline.dedup import NearDuplicateStep
+from legal_ai_toolkit.pipeline.id_regeneration import IDRegenerationStep
+from legal_ai_toolkit.pipeline.ingestion import IngestionProcessor
+from legal_ai_toolkit.pipeline.issues import IssueExtractionStep
+from legal_ai_toolkit.pipeline.metadata import MetadataExtractionStep
+from legal_ai_toolkit.pipeline.transitions import TransitionStep
+
+# (name, step class, input dir, output dir) in pipeline order
+STEPS = [
+    ("dedup", NearDuplicateStep, "normalized_text", "deduplicated"),
+    ("metadata", MetadataExtractionStep, "deduplicated", "headers_extracted"),
+    ("issues", IssueExtractionStep, "headers_extracted", "issues_extracted"),
+    ("classify", ClassificationStep, "issues_extracted", "classified"),
+    ("id_regen", IDRegenerationStep, "classified", "id_regenerated"),
+    ("transitions", TransitionStep, "id_regenerated", "transitions_extracted"),
+    ("citations", CitationExtractionStep, "transitions_extracted", "citations_extracted"),
+    ("consolidate", ConsolidationStep, "citations_extracted", "processed"),
+]
+
+
+def run_steps(workdir, documents=100, size=20000, seed=0, workers=1):
+    """Generate a raw corpus under workdir and run every step; returns (results, dirs)."""
+    workdir = Path(workdir)
+    raw_paths = SyntheticJudgmentGenerator(seed=seed, size=size).write_raw_corpus(workdir / "raw", documents)
+    nbytes = sum(p.stat().st_size for p in raw_paths)
+    dirs = {"raw": workdir / "raw", "normalized_text": workdir / "normalized_text"}
+    tag = f"{documents}x{size // 1000}k"
+
+    results = {}
+    with quiet():
+        start = time.perf_counter()
+        IngestionProcessor(dirs["raw"], dirs["normalized_text"]).run(workers=workers)
+        results[f"steps.ingest.{tag}"] = result_row(time.perf_counter() - start, items=documents, nbytes=nbytes)
+
+        for name, step_cls, input_name, output_name in STEPS:
+            dirs[output_name] = workdir / output_name
+            start = time.perf_counter()
+            step_cls(dirs[input_name], dirs[output_name]).run()
+            results[f"steps.{name}.{tag}"] = result_row(time.perf_counter() - start, items=documents, nbytes=nbytes)
+
+    return results, dirs
+
+
+def run(documents=100, size=20000, seed=0, workers=1):
+    with tempfile.TemporaryDirectory(prefix="bench_steps_") as workdir:
+        results, _ = run_steps(workdir, documents, size, seed, workers)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline step on a synthetic corpus")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--size", type=int, default=20000, help="Characters per judgment")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    print_results(run(args.documents, args.size, args.seed, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Worker startup and first-document latency, cold and warm.
+
+A fresh pool worker compiles rules and loads the landmark database while
+handling its first judgments. For each variant a one-worker pool is
+started and timed until it answers, then handed two synthetic judgments;
+the in-worker time of each document is reported (``first_doc`` against the
+steady-state ``second_doc``):
+
+- ``spawn.cold``: spawned worker without initializer (everything lazy);
+- ``spawn.warm``: spawned worker with ``utils.warmup.init_worker``;
+- ``fork.prewarmed``: rules and indexes built in this process
+  (``utils.warmup.prefork_warm_up``), then forked; only where fork is
+  available.
+
+Extractors are imported inside the worker function, so the cold variant
+pays for them in its first document as a pipeline worker would.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+from benchmarks.harness import print_results, result_row
+from benchmarks.synthetic import SyntheticJudgmentGenerator
+from legal_ai_toolkit.utils.warmup import init_worker, prefork_warm_up
+
+
+def process_document(text: str) -> float:
+    """Worker: run every extractor on one judgment; returns the time it took in the worker."""
+    started = time.perf_counter()
+    from benchmarks.bench_extractors import EXTRACTORS
+    for extractor in EXTRACTORS.values():
+        extractor(text)
+    return time.perf_counter() - started
+
+
+def measure_variant(make_pool, texts):
+    start = time.perf_counter()
+    pool = make_pool()
+    try:
+        pool.apply(os.getpid)
+        startup = time.perf_counter() - start
+        first, second = (pool.apply(process_document, (text,)) for text in texts[:2])
+    finally:
+        pool.terminate()
+        pool.join()
+    return startup, first, second
+
+
+def prewarmed_pool(context):
+    """Build rules and indexes here, then fork the pool (the way the orchestrator starts step processes)."""
+    prefork_warm_up(context)
+    return context.Pool(1, initializer=init_worker)
+
+
+def variants():
+    spawn = multiprocessing.get_context("spawn")
+    yield "spawn.cold", lambda: spawn.Pool(1)
+    yield "spawn.warm", lambda: spawn.Pool(1, initializer=init_worker)
+    if "fork" in multiprocessing.get_all_start_methods():
+        fork = multiprocessing.get_context("fork")
+        yield "fork.prewarmed", lambda: prewarmed_pool(fork)
+
+
+def run(size=20000, seed=0):
+    texts = SyntheticJudgmentGenerator(seed=seed, size=size).texts(2)
+    results = {}
+    for name, make_pool in variants():
+        startup, first, second = measure_variant(make_pool, texts)
+        results[f"workers.{name}.startup"] = result_row(startup)
+        results[f"workers.{name}.first_doc.{size // 1000}k"] = result_row(first)
+        results[f"workers.{name}.second_doc.{size // 1000}k"] = result_row(second)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pool worker startup and first-document latency")
+    parser.add_argument("--size", type=int, default=20000, help="Characters per judgment")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print_results(run(args.size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
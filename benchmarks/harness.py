@@ -0,0 +1,134 @@
+"""
+Timing, result storage and regression comparison for the benchmark suites.
+
+Every benchmark produces one result row keyed by a stable name
+(e.g. ``extractors.citations.20k``) with at least ``seconds``; rows may add
+``items``/``bytes`` throughput. Runs are stored as JSON named after the git
+commit so two commits can be compared with a regression threshold.
+"""
+import json
+import platform
+import subprocess
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_THRESHOLD = 0.25
+
+
+def measure(func: Callable, repeat: int = 3, items: int = 0, nbytes: int = 0, warmup: int = 1) -> Dict:
+    """
+    Run func `repeat` times and return best/mean seconds and throughput based on the best run.
+
+    `warmup` untimed runs go first so lazy rule compilation and data loading
+    are not counted.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return result_row(min(timings), items=items, nbytes=nbytes, mean=sum(timings) / len(timings), repeat=repeat)
+
+
+def result_row(seconds: float, items: int = 0, nbytes: int = 0, **extra) -> Dict:
+    row = {"seconds": seconds}
+    if items:
+        row["items"] = items
+        row["items_per_sec"] = items / seconds if seconds else 0.0
+    if nbytes:
+        row["mb"] = nbytes / 1e6
+        row["mb_per_sec"] = (nbytes / 1e6) / seconds if seconds else 0.0
+    row.update(extra)
+    return row
+
+
+@contextmanager
+def quiet():
+    """Silence the pipeline's progress prints while timing."""
+    with redirect_stdout(StringIO()):
+        yield
+
+
+def print_results(results: Dict[str, Dict]):
+    for name, row in results.items():
+        line = f"  {name:<42} {row['seconds']:10.4f} s"
+        if "items_per_sec" in row:
+            line += f"  {row['items_per_sec']:12.1f} items/s"
+        if "mb_per_sec" in row:
+            line += f"  {row['mb_per_sec']:8.2f} MB/s"
+        print(line)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: Dict[str, Dict], output_dir=RESULTS_DIR, params: Optional[Dict] = None) -> Path:
+    """Write results to <output_dir>/<commit>.json."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    commit = git_commit()
+    payload = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params or {},
+        "results": results,
+    }
+    path = output_dir / f"{commit}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(path) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare two result sets on `seconds`.
+
+    Returns one row per benchmark present in both, flagged as a regression
+    when it got slower by more than `threshold` (0.25 = 25%).
+    """
+    rows = []
+    for name in sorted(set(current) & set(baseline)):
+        before = baseline[name]["seconds"]
+        after = current[name]["seconds"]
+        change = (after - before) / before if before else 0.0
+        rows.append({
+            "name": name,
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict], threshold: float):
+    print(f"\nComparison against baseline (threshold {threshold:.0%}):")
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"  {row['name']:<42} {row['baseline']:10.4f} -> {row['current']:10.4f} s  {row['change']:+7.1%}  {flag}")
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"\n[FAILED] {len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
+    else:
+        print("\n[OK] No regressions")
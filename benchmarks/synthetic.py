@@ -0,0 +1,362 @@
+"""
+Deterministic synthetic judgment generator.
+
+Produces Indian-Kanoon-style judgment text of a configurable size with
+realistic citation, section, landmark and party density, built from the
+repo's own vocabularies: the reporter formats matched by CitationExtractor,
+IPC_MAPPING sections, PrecedentDatabase landmarks and the issue taxonomy.
+
+Judgments are grouped into topics that share a core set of sections,
+citations and issues, so similarity and clustering see a realistic mix of
+strong, weak and absent edges. Output depends only on (seed, index): the
+same generator settings always produce byte-identical corpora.
+"""
+import html
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+from legal_ai_toolkit.extraction.citations import CitationExtractor
+from legal_ai_toolkit.utils.database import PrecedentDatabase
+from legal_ai_toolkit.utils.mappings import IPCBNSTransitionDB
+from legal_ai_toolkit.utils.taxonomy import LegalIssueTaxonomy
+
+# Rendering of each CitationExtractor reporter (keys match CitationExtractor.PATTERNS)
+REPORTER_FORMATS = {
+    "AIR": "AIR {year} {court} {page}",
+    "SCC": "{year} ({volume}) SCC {page}",
+    "SCR": "{year} ({volume}) SCR {page}",
+    "ACC": "{year} ({volume}) ACC {page}",
+    "JT": "{year} ({volume}) JT {page}",
+    "SCALE": "{year} ({volume}) SCALE {page}",
+    "KLT": "{year} ({volume}) KLT {page}",
+    "BomCR": "{year} ({volume}) Bom CR {page}",
+    "DelLT": "{year} ({volume}) Del LT {page}",
+    "MadLJ": "{year} ({volume}) Mad LJ {page}",
+}
+AIR_COURTS = ["SC", "All", "Bom", "Cal", "Del", "Mad", "Ker", "Kant", "Pat", "Guj", "Raj", "MP"]
+
+COURTS = [
+    ("Supreme Court of India", "SC"),
+    ("Allahabad High Court", "HC"),
+    ("High Court of Judicature at Bombay", "HC"),
+    ("Delhi High Court", "HC"),
+    ("Kerala High Court", "HC"),
+    ("Madras High Court", "HC"),
+    ("High Court of Karnataka", "HC"),
+    ("Central Administrative Tribunal", "TRIBUNAL/LOWER"),
+]
+CASE_TYPES = {
+    "criminal": ["Criminal Appeal", "Criminal Revision", "Criminal Misc. Bail Application"],
+    "civil": ["Civil Appeal", "First Appeal", "Second Appeal"],
+    "service": ["Writ Petition", "Service Single", "O.A."],
+}
+ACT_NAMES = {
+    "criminal": ["of the Indian Penal Code", "IPC", "I.P.C."],
+    "civil": ["of the Code of Civil Procedure", "CPC"],
+    "service": ["of the Constitution of India"],
+}
+FIRST_NAMES = ["Ram", "Shyam", "Sita", "Mohan", "Rakesh", "Sunita", "Abdul", "Harpreet", "Lakshmi", "Arjun",
+               "Kavita", "Suresh", "Farida", "Gopal", "Meena", "Vijay", "Anil", "Rekha", "Iqbal", "Pradeep"]
+SURNAMES = ["Sharma", "Verma", "Yadav", "Khan", "Singh", "Nair", "Reddy", "Gupta", "Mishra", "Pillai",
+            "Chauhan", "Iyer", "Patel", "Das", "Joshi", "Menon", "Tiwari", "Bhat", "Saxena", "Rao"]
+STATES = ["State Of U.P.", "State Of Maharashtra", "State Of Kerala", "Union Of India", "State Of Karnataka",
+          "State (NCT Of Delhi)", "State Of Tamil Nadu"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+FILLER = [
+    "Heard learned counsel for the {party} and perused the material available on record.",
+    "The {party} was served with a notice dated {date} and no reply was filed within the time allowed.",
+    "Learned counsel for the {party} submitted that the impugned order suffers from manifest illegality.",
+    "It is not in dispute that the {party} had approached the authority at the earliest opportunity.",
+    "The trial court, after appreciating the evidence on record, recorded a finding which cannot be said to be perverse.",
+    "A perusal of the record shows that the {party} was afforded sufficient opportunity of hearing.",
+    "The affidavit filed on behalf of the {party} on {date} does not controvert the averments made in the petition.",
+    "We have given our anxious consideration to the rival submissions advanced at the Bar.",
+    "The statement of the witness recorded on {date} corroborates the version of the prosecution in material particulars.",
+    "In view of the aforesaid discussion, the question formulated above is answered accordingly.",
+    "Counsel for the {party} has placed reliance upon the documents annexed as Annexure {number} to the petition.",
+    "The order passed by the authority below is cryptic and does not disclose any reason.",
+]
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(1, 28)}.{rng.randint(1, 12)}.{rng.randint(1990, 2023)}"
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+
+
+def build_citation_pool(size: int = 400, seed: int = 0) -> List[Dict]:
+    """Deterministic pool of reported cases: {"case_name", "citation"} in every reporter format."""
+    rng = random.Random(seed)
+    reporters = [r for r in CitationExtractor.PATTERNS if r in REPORTER_FORMATS]
+    pool = []
+    for i in range(size):
+        reporter = reporters[i % len(reporters)]
+        citation = REPORTER_FORMATS[reporter].format(
+            year=rng.randint(1955, 2023),
+            court=rng.choice(AIR_COURTS),
+            volume=rng.randint(1, 12),
+            page=rng.randint(1, 2000),
+        )
+        respondent = rng.choice(STATES) if rng.random() < 0.6 else _person(rng)
+        pool.append({"case_name": f"{_person(rng)} v. {respondent}", "citation": citation})
+    return pool
+
+
+class SyntheticJudgmentGenerator:
+    """
+    Generates synthetic judgments deterministically from (seed, index).
+
+    Densities are mentions per 10,000 characters of judgment text.
+    """
+
+    def __init__(self, seed: int = 0, size: int = 20000, topics: int = 50,
+                 citation_density: float = 3.0, section_density: float = 3.0,
+                 landmark_density: float = 0.5, issue_density: float = 2.0,
+                 party_density: float = 4.0):
+        self.seed = seed
+        self.size = size
+        self.topics = topics
+        self.citation_density = citation_density
+        self.section_density = section_density
+        self.landmark_density = landmark_density
+        self.issue_density = issue_density
+        self.party_density = party_density
+
+        PrecedentDatabase._ensure_loaded()
+        self.landmarks = sorted(PrecedentDatabase.LANDMARKS.items())
+        self.ipc_sections = sorted(IPCBNSTransitionDB.IPC_MAPPING)
+        self.issues = sorted(LegalIssueTaxonomy.TAXONOMY)
+        self.citation_pool = build_citation_pool(seed=seed)
+
+    # --- planning (cheap; no text) ---
+
+    def _topic(self, topic: int) -> Dict:
+        rng = random.Random(self.seed * 7919 + topic)
+        return {
+            "domain": rng.choice(["criminal", "criminal", "civil", "service"]),
+            "sections": rng.sample(self.ipc_sections, 6),
+            "citations": rng.sample(range(len(self.citation_pool)), 5),
+            "landmarks": rng.sample(range(len(self.landmarks)), 2),
+            "issues": rng.sample(self.issues, 2),
+        }
+
+    def plan(self, index: int) -> Dict:
+        """Choose everything a judgment mentions, without rendering text."""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        topic = self._topic(rng.randrange(self.topics))
+        court, court_level = rng.choice(COURTS)
+        domain = topic["domain"]
+
+        return {
+            "index": index,
+            "judgment_id": self.judgment_id(index),
+            "domain": domain,
+            "court": court,
+            "court_level": court_level,
+            "year": rng.randint(1995, 2023),
+            "month": rng.choice(MONTHS),
+            "day": rng.randint(1, 28),
+            "case_type": rng.choice(CASE_TYPES[domain]),
+            "case_number": rng.randint(1, 9999),
+            "petitioner": _person(rng),
+            "respondent": rng.choice(STATES),
+            "judge": _person(rng),
+            "sections": topic["sections"][:rng.randint(3, 6)] + rng.sample(self.ipc_sections, 2),
+            "citations": topic["citations"][:rng.randint(2, 5)] + rng.sample(range(len(self.citation_pool)), 2),
+            "landmarks": topic["landmarks"][:rng.randint(0, 2)],
+            "issues": topic["issues"] + rng.sample(self.issues, 1),
+        }
+
+    def judgment_id(self, index: int) -> str:
+        return f"SYN-{self.seed}-{index:07d}"
+
+    # --- rendering ---
+
+    def _header(self, plan: Dict) -> List[str]:
+        return [
+            plan["court"],
+            f"{plan['petitioner']} vs {plan['respondent']} on {plan['day']} {plan['month']}, {plan['year']}",
+            f"{plan['case_type']} No. {plan['case_number']} of {plan['year']}",
+            f"Bench:\n{plan['judge']}",
+            "JUDGMENT",
+            f"{plan['judge']}, J.",
+        ]
+
+    def _sentence(self, rng: random.Random, plan: Dict, kind: str, counter: int) -> str:
+        if kind == "citation":
+            case = self.citation_pool[plan["citations"][counter % len(plan["citations"])]]
+            return f"In {case['case_name']}, {case['citation']}, it was held that the discretion must be exercised judicially."
+        if kind == "landmark":
+            _, landmark = self.landmarks[plan["landmarks"][counter % len(plan["landmarks"])]]
+            return f"The principle laid down in {landmark['full_citation']} squarely applies to the facts of this case."
+        if kind == "section":
+            sections = plan["sections"]
+            picked = [sections[(counter + k) % len(sections)] for k in range(rng.randint(1, 3))]
+            act = rng.choice(ACT_NAMES["criminal"])
+            listed = picked[0] if len(picked) == 1 else ", ".join(picked[:-1]) + f" and {picked[-1]}"
+            noun = "Section" if len(picked) == 1 else "Sections"
+            return f"The accused was charged under {noun} {listed} {act} and the charge was read over to him."
+        if kind == "issue":
+            issue = LegalIssueTaxonomy.TAXONOMY[plan["issues"][counter % len(plan["issues"])]]
+            keyword = issue["keywords"][counter % len(issue["keywords"])]
+            return f"The question of {keyword} has been raised before us and requires consideration."
+        if kind == "party":
+            return f"{plan['petitioner']} v. {plan['respondent']} was listed along with the connected matters."
+        return rng.choice(FILLER).format(party=rng.choice(["petitioner", "respondent", "appellant"]),
+                                         date=_date(rng), number=rng.randint(1, 12))
+
+    def text(self, index: int) -> str:
+        """Render the full judgment text (about `size` characters)."""
+        plan = self.plan(index)
+        rng = random.Random(self.seed * 1_000_033 + index)
+        per_char = 1 / 10000
+        rates = [
+            ("citation", self.citation_density * per_char),
+            ("landmark", self.landmark_density * per_char if plan["landmarks"] else 0.0),
+            ("section", self.section_density * per_char),
+            ("issue", self.issue_density * per_char),
+            ("party", self.party_density * per_char),
+        ]
+        budget = {kind: 0.0 for kind, _ in rates}
+        counters = {kind: 0 for kind, _ in rates}
+
+        parts = self._header(plan)
+        length = sum(len(p) + 2 for p in parts)
+        para_no = 1
+        while length < self.size:
+            sentences = []
+            for _ in range(rng.randint(3, 7)):
+                kind = "filler"
+                for name, rate in rates:
+                    if budget[name] >= 1.0:
+                        kind = name
+                        budget[name] -= 1.0
+                        counters[name] += 1
+                        break
+                sentence = self._sentence(rng, plan, kind, counters.get(kind, 0))
+                sentences.append(sentence)
+                for name, rate in rates:
+                    budget[name] += rate * (len(sentence) + 1)
+            paragraph = f"{para_no}. " + " ".join(sentences)
+            parts.append(paragraph)
+            length += len(paragraph) + 2
+            para_no += 1
+
+        return "\n\n".join(parts) + "\n"
+
+    def html(self, index: int) -> str:
+        """
+        Render the judgment as an Indian Kanoon document page.
+
+        Paragraphs are <p> children of div.judgments with inline links,
+        cite_tag counts, entities and comments. Every fifth page instead has
+        the text loose in the div with <br> breaks, as older pages do.
+        """
+        rng = random.Random(self.seed * 1_000_037 + index)
+        blocks = self.text(index).strip().split("\n\n")
+        body = []
+        for i, block in enumerate(blocks, start=1):
+            words = html.escape(block).split(" ")
+            if len(words) > 8:
+                at = rng.randrange(1, len(words) - 4)
+                words[at] = f'<a href="/doc/{rng.randint(1000, 999999)}/">{words[at]}</a>'
+                words[at + 2] = f"<b>{words[at + 2]}</b>"
+                words.insert(at + 3, f'<a class="cite_tag" href="/doc/{rng.randint(1000, 999999)}/cites/">'
+                                     f'[Cites {rng.randint(0, 40)}, Cited by {rng.randint(0, 900)}]</a>')
+            text = " ".join(words).replace(" the ", " the&nbsp;", 1)
+            body.append((i, text))
+
+        if index % 5 == 4:
+            content = "<br>\n".join(text for _, text in body)
+        else:
+            content = "\n".join(
+                f'<p data-structure="Issue" id="p_{i}">{text}</p>' + ("<!-- para end -->" if i % 7 == 0 else "")
+                for i, text in body
+            )
+        return (
+            "<!DOCTYPE html>\n<html><head><title>Synthetic judgment</title>"
+            "<style>.judgments { font-family: serif; }</style>"
+            "<script>var docid = 0;</script></head>\n<body>\n"
+            '<div class="doc_title">Synthetic judgment</div>\n'
+            f'<div class="judgments">\n{content}\n</div>\n'
+            "</body></html>\n"
+        )
+
+    def pages(self, n: int) -> List[str]:
+        return [self.html(i) for i in range(n)]
+
+    # --- record shapes used by the pipeline ---
+
+    def normalized_record(self, index: int) -> Dict:
+        """Record in the shape IngestionProcessor writes (input to MetadataExtractionStep)."""
+        text = self.text(index).strip()
+        return {
+            "judgment_id": f"TEMP_{self.judgment_id(index)}",
+            "metadata": {"court": "UNKNOWN", "court_level": "UNKNOWN", "jurisdiction": "India", "year": 2026},
+            "text": text,
+            "paragraphs": [{"para_id": i, "text": p} for i, p in enumerate(text.split("\n\n"), start=1)],
+            "annotations": {},
+        }
+
+    def annotated_record(self, index: int) -> Dict:
+        """Record with the annotations SimilarityProcessor reads, without text (cheap at 100k scale)."""
+        plan = self.plan(index)
+        sections = list(dict.fromkeys(plan["sections"]))
+        citations = [self.citation_pool[i]["citation"] for i in dict.fromkeys(plan["citations"])]
+        citations += [self.landmarks[i][1]["full_citation"] for i in plan["landmarks"]]
+        return {
+            "judgment_id": plan["judgment_id"],
+            "metadata": {
+                "court": plan["court"],
+                "court_level": plan["court_level"],
+                "decision_date": f"{plan['day']} {plan['month']}, {plan['year']}",
+                "case_number": f"{plan['case_type']} No. {plan['case_number']}",
+            },
+            "classification": {"domain": plan["domain"], "confidence": "high"},
+            "annotations": {
+                "issues": {issue: {"confidence": "high"} for issue in dict.fromkeys(plan["issues"])},
+                "citations": [{"type": "reporter", "raw": c} for c in citations],
+            },
+            "statutory_transitions": {
+                "ipc_detected": [f"IPC {s}" for s in sections],
+                "bns_mapped": [
+                    {"ipc": s, "bns": IPCBNSTransitionDB.IPC_MAPPING[s]["bns"]}
+                    for s in sections if s in IPCBNSTransitionDB.IPC_MAPPING
+                ],
+            },
+        }
+
+    # --- corpora ---
+
+    def texts(self, n: int) -> List[str]:
+        return [self.text(i) for i in range(n)]
+
+    def write_raw_corpus(self, directory, n: int) -> List[Path]:
+        """Write n raw .txt judgments (IngestionProcessor input)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for i in range(n):
+            path = directory / f"{self.judgment_id(i)}.txt"
+            path.write_text(self.text(i), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def write_annotated_corpus(self, directory, n: int) -> List[Path]:
+        """Write n annotated records (SimilarityProcessor input)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for i in range(n):
+            record = self.annotated_record(i)
+            path = directory / f"{record['judgment_id']}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            paths.append(path)
+        return paths
@@ -2,8 +2,23 @@
 
 __version__ = "1.0.0"
 
-from .pipeline.orchestrator import PipelineOrchestrator
-from .analytics.audit import DataAuditor
-from .utils.data_access import load_processed_judgments, load_clusters
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "PipelineOrchestrator": ".pipeline.orchestrator",
+    "DataAuditor": ".analytics.audit",
+    "load_processed_judgments": ".utils.data_access",
+    "load_clusters": ".utils.data_access",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .pipeline.orchestrator import PipelineOrchestrator
+    from .analytics.audit import DataAuditor
+    from .utils.data_access import load_processed_judgments, load_clusters
 
 __all__ = ["PipelineOrchestrator", "DataAuditor", "load_processed_judgments", "load_clusters"]
@@ -1,3 +1,16 @@
-from .reporting import ReportGenerator, BatchIdentifier
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "ReportGenerator": ".reporting",
+    "BatchIdentifier": ".reporting",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .reporting import ReportGenerator, BatchIdentifier
 
 __all__ = ["ReportGenerator", "BatchIdentifier"]
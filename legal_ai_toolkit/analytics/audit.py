@@ -1,7 +1,7 @@
-import json
 import random
 from pathlib import Path
 from collections import Counter
+from legal_ai_toolkit.utils import codec
 
 class DataAuditor:
     def __init__(self, processed_dir, cluster_file=None, edge_file=None):
@@ -43,7 +43,7 @@ class DataAuditor:
 
         for file in files:
             with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = codec.loads(f.read())
 
                 meta = data.get("metadata", {})
                 court = meta.get("court")
@@ -139,7 +139,7 @@ class DataAuditor:
 
         for file in files:
             with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = codec.loads(f.read())
                 # v2.0 structure: extractions.citations.matched_landmarks
                 citations_data = data.get("extractions", {}).get("citations", {})
                 landmarks = citations_data.get("matched_landmarks", [])
@@ -157,7 +157,7 @@ class DataAuditor:
 
         for file in files:
             with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = codec.loads(f.read())
                 # Check v2.0 structure: extractions.citations.matched_landmarks
                 extractions = data.get("extractions", {})
                 citations = extractions.get("citations", {})
@@ -187,7 +187,7 @@ class DataAuditor:
         weights = []
         with open(self.edge_file, "r", encoding="utf-8") as f:
             for line in f:
-                edge = json.loads(line)
+                edge = codec.loads(line)
                 strengths[edge["strength"]] += 1
                 weights.append(edge.get("weight", 0))
 
@@ -202,7 +202,7 @@ class DataAuditor:
         domain_groups = {}
         for file in files:
             with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = codec.loads(f.read())
                 domain = data.get("classification", {}).get("domain", "unknown")
                 if domain not in domain_groups:
                     domain_groups[domain] = []
@@ -232,7 +232,7 @@ class DataAuditor:
             return
 
         with open(self.cluster_file, "r", encoding="utf-8") as f:
-            clusters = json.load(f)
+            clusters = codec.loads(f.read())
 
         print(f"\nCluster Summary ({len(clusters)} Clusters)")
         print("="*40)
@@ -257,7 +257,7 @@ class DataAuditor:
         for file in self.processed_dir.glob("*.json"):
             with open(file, "r", encoding="utf-8") as f:
                 try:
-                    data = json.load(f)
+                    data = codec.loads(f.read())
                     if "judgment_id" in data:
                         existing_ids.add(data["judgment_id"])
                 except Exception:
@@ -270,7 +270,7 @@ class DataAuditor:
                 for line_no, line in enumerate(f, start=1):
                     if not line.strip(): continue
                     try:
-                        edge = json.loads(line)
+                        edge = codec.loads(line)
                         for key in ["from", "to"]:
                             jid = edge.get(key)
                             if jid and jid not in existing_ids:
@@ -283,7 +283,7 @@ class DataAuditor:
             print(f"Checking clusters in {self.cluster_file}...")
             with open(self.cluster_file, "r", encoding="utf-8") as f:
                 try:
-                    clusters = json.load(f)
+                    clusters = codec.loads(f.read())
                     for cluster in clusters:
                         for jid in cluster.get("judgments", []):
                             if jid not in existing_ids:
@@ -309,7 +309,7 @@ class DataAuditor:
         high_strength_pairs = []
         with open(self.edge_file, "r", encoding="utf-8") as f:
             for line in f:
-                edge = json.loads(line)
+                edge = codec.loads(line)
                 if edge.get("strength") == "high":
                     high_strength_pairs.append(edge)
 
@@ -330,8 +330,8 @@ class DataAuditor:
 
             with open(existing_ids[s_id], "r", encoding="utf-8") as f1, \
                  open(existing_ids[t_id], "r", encoding="utf-8") as f2:
-                case1 = json.load(f1)
-                case2 = json.load(f2)
+                case1 = codec.loads(f1.read())
+                case2 = codec.loads(f2.read())
 
             # Analyze coherence: shared IPCs or shared issues
             ipc1 = {m.get("ipc") for m in case1.get("statutory_transitions", {}).get("mapped", [])}
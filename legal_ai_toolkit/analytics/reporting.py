@@ -2,6 +2,7 @@ import json
 import os
 from pathlib import Path
 from collections import Counter
+from legal_ai_toolkit.utils import codec
 
 class ReportGenerator:
     def __init__(self, cluster_file, processed_dir, report_dir):
@@ -20,7 +21,7 @@ class ReportGenerator:
 
         # Load data
         with open(self.cluster_file) as f:
-            clusters = json.load(f)
+            clusters = codec.loads(f.read())
 
         judgments = list(self.processed_dir.glob("*.json"))
 
@@ -35,7 +36,7 @@ class ReportGenerator:
 
         for jfile in judgments:
             with open(jfile) as f:
-                data = json.load(f)
+                data = codec.loads(f.read())
                 domain = data.get('classification', {}).get('domain', 'unknown')
                 domain_counts[domain] += 1
 
@@ -86,7 +87,7 @@ class BatchIdentifier:
             return None
 
         with open(self.cluster_file) as f:
-            clusters = json.load(f)
+            clusters = codec.loads(f.read())
 
         candidates = {
             'service_seniority': None,
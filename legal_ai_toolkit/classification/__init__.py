@@ -1,3 +1,16 @@
-from .zero_ml import ZeroMLClassifier, classify_judgment_domain
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "ZeroMLClassifier": ".zero_ml",
+    "classify_judgment_domain": ".zero_ml",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .zero_ml import ZeroMLClassifier, classify_judgment_domain
 
 __all__ = ["ZeroMLClassifier", "classify_judgment_domain"]
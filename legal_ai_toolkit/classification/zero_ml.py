@@ -1,5 +1,7 @@
 import re
 from typing import Dict, List, Tuple
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
 
 class ZeroMLClassifier:
     """
@@ -37,6 +39,15 @@ class ZeroMLClassifier:
     CrPC_SECTION_PAT = r"(?:CrPC|Cr\.P\.C\.|Code of Criminal Procedure)\s+(\d+[A-Z\-]*)"
     CPC_SECTION_PAT = r"(?:CPC|C\.P\.C\.|Code of Civil Procedure)\s+(\d+[A-Z\-]*)"
 
+    CAUSE_TITLE_RULES = {
+        domain: [register(f"zero_ml.cause_title.{domain}.{i}", pat) for i, pat in enumerate(patterns)]
+        for domain, patterns in CAUSE_TITLE_PATTERNS.items()
+    }
+    IPC_SECTION_RULE = register("zero_ml.ipc_section", IPC_SECTION_PAT, re.IGNORECASE)
+    CrPC_SECTION_RULE = register("zero_ml.crpc_section", CrPC_SECTION_PAT, re.IGNORECASE)
+    CPC_SECTION_RULE = register("zero_ml.cpc_section", CPC_SECTION_PAT, re.IGNORECASE)
+
+    @profiled("zero_ml.classify_judgment_domain")
     def classify_judgment_domain(self, text: str) -> Dict:
         """
         Main classification function with layered logic.
@@ -81,9 +92,9 @@ class ZeroMLClassifier:
     def _analyze_cause_title(self, header: str) -> str:
         """Analyze header for authoritative cause title patterns."""
         header_upper = header.upper()
-        for domain, patterns in self.CAUSE_TITLE_PATTERNS.items():
-            for pat in patterns:
-                if re.search(pat, header_upper):
+        for domain, rules in self.CAUSE_TITLE_RULES.items():
+            for rule in rules:
+                if rule.search(header_upper):
                     return domain
         return ""
 
@@ -93,17 +104,17 @@ class ZeroMLClassifier:
             "has_procedural_verb": any(verb in text_lower for verb in self.PROCEDURAL_VERBS),
             "criminal_keyword_count": sum(1 for kw in self.CRIMINAL_KEYWORDS if kw in text_lower),
             "civil_keyword_count": sum(1 for kw in self.CIVIL_KEYWORDS if kw in text_lower),
-            "has_ipc_section": bool(re.search(self.IPC_SECTION_PAT, text_lower, re.IGNORECASE)),
-            "has_crpc_section": bool(re.search(self.CrPC_SECTION_PAT, text_lower, re.IGNORECASE)),
-            "has_cpc_section": bool(re.search(self.CPC_SECTION_PAT, text_lower, re.IGNORECASE)),
+            "has_ipc_section": bool(self.IPC_SECTION_RULE.search(text_lower)),
+            "has_crpc_section": bool(self.CrPC_SECTION_RULE.search(text_lower)),
+            "has_cpc_section": bool(self.CPC_SECTION_RULE.search(text_lower)),
             "criminal_score": 0,
             "civil_score": 0,
             "sections_found": []
         }
 
         # Count sections
-        for pat in [self.IPC_SECTION_PAT, self.CrPC_SECTION_PAT]:
-            signals["sections_found"].extend(re.findall(pat, text_lower, re.IGNORECASE))
+        for rule in [self.IPC_SECTION_RULE, self.CrPC_SECTION_RULE]:
+            signals["sections_found"].extend(rule.findall(text_lower))
         # Scoring
         signals["criminal_score"] = (signals["has_ipc_section"] or signals["has_crpc_section"]) * 2
         signals["criminal_score"] += min(2, signals["criminal_keyword_count"])  # Cap keyword influence
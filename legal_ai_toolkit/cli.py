@@ -1,9 +1,8 @@
 import argparse
-from .pipeline.orchestrator import PipelineOrchestrator
-from .analytics.reporting import ReportGenerator
-from .analytics.audit import DataAuditor
-from .utils.demo import ShowcasePreparer
-from .cli_dashboard import main as run_dashboard
+import os
+
+# Subcommands import what they need when they run, so `--help` and light
+# commands do not load the pipeline, clustering or the HTTP/HTML stack
 
 def main():
     parser = argparse.ArgumentParser(description="Legal AI Toolkit CLI")
@@ -12,8 +11,32 @@ def main():
     # Pipeline command
     pipeline_parser = subparsers.add_parser("pipeline", help="Run the full data pipeline")
     pipeline_parser.add_argument("--raw-dir", default=None, help="Directory with raw text files (defaults to package data)")
-    pipeline_parser.add_argument("--step", choices=["ingest", "metadata", "issues", "classify", "id_regen", "transitions", "citations", "similarity", "cluster", "consolidate"], help="Run a specific step instead of full pipeline")
+    pipeline_parser.add_argument("--step", choices=["ingest", "dedup", "metadata", "issues", "classify", "id_regen", "transitions", "citations", "similarity", "cluster", "consolidate"], help="Run a specific step instead of full pipeline")
     pipeline_parser.add_argument("--workers", type=int, default=1, help="Number of parallel workers")
+    pipeline_parser.add_argument("--jobs", type=int, default=1, help="Independent steps to run concurrently (full pipeline)")
+    pipeline_parser.add_argument("--force", action="store_true", help="Rerun every step, even if up to date")
+    pipeline_parser.add_argument("--resume", action="store_true", help="Skip records an interrupted run already finished (per-step manifest.jsonl in interim/step_state)")
+    pipeline_parser.add_argument("--quarantine-chars", type=int, default=None, help="Move judgments longer than this to the slow lane of each per-record step")
+    pipeline_parser.add_argument("--quarantine-seconds", type=float, default=None, help="Move judgments still processing after this many seconds (wall-clock) to the slow lane of each per-record step")
+    pipeline_parser.add_argument("--defer-slow-lane", action="store_true", help="Leave quarantined judgments queued (quarantine.jsonl) instead of processing them at the end of the step")
+    pipeline_parser.add_argument("--trace-rules", action="store_true", help="Name the hot rule of each step's slowest judgments in the run report (times every rule call)")
+    pipeline_parser.add_argument("--slow-lane", action="store_true", help="With --step: process the step's deferred quarantine queue")
+    pipeline_parser.add_argument("--prometheus-textfile", default=None, help="Also write run metrics in Prometheus text format (node_exporter textfile collector)")
+    pipeline_parser.add_argument("--executor", choices=["local", "shared-fs"], default="local", help="Run on this machine, or across nodes sharing the pipeline directories")
+    pipeline_parser.add_argument("--coordination-dir", default=None, help="Shared directory for leases (shared-fs; default: <interim>/.cluster)")
+    pipeline_parser.add_argument("--run-id", default=None, help="New id for each distributed run, the same on all its nodes (shared-fs; --local-nodes picks one)")
+    pipeline_parser.add_argument("--node-id", default=None, help="This node's name (shared-fs; default: <hostname>-<pid>)")
+    pipeline_parser.add_argument("--shards", type=int, default=8, help="Tasks each per-document step is split into (shared-fs)")
+    pipeline_parser.add_argument("--lease-seconds", type=float, default=300.0, help="Heartbeat silence after which another node takes a task over (shared-fs)")
+    pipeline_parser.add_argument("--local-nodes", type=int, default=None, help="Start this many nodes on this machine (shared-fs, for testing)")
+    pipeline_parser.add_argument("--streaming", action="store_true", help="Stream judgments through the per-record steps instead of running them one after another")
+    pipeline_parser.add_argument("--queue-size", type=int, default=64, help="Records buffered between streaming stages")
+    pipeline_parser.add_argument("--no-prefork", action="store_true", help="Do not build rules and lookup indexes before forking step processes (each builds its own)")
+    pipeline_parser.add_argument("--storage", choices=["json", "jsonl"], default="json", help="Interim layout: one JSON file per judgment, or sharded JSONL")
+    pipeline_parser.add_argument("--compression", choices=["gzip", "zstd"], default=None, help="Compress JSONL shards (zstd needs the 'zstandard' package)")
+    pipeline_parser.add_argument("--shard-size", type=int, default=1000, help="Records per JSONL shard")
+    pipeline_parser.add_argument("--pretty-json", action="store_true", help="Write indented JSON (debugging); output is compact by default")
+    pipeline_parser.add_argument("--profile", action="store_true", help="Record per-rule and per-document timings (profile_*.json in interim/step_state/<step>)")
 
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate operational report")
@@ -34,21 +57,82 @@ def main():
     showcase_parser.add_argument("--processed-dir", default="legal_ai_toolkit/data/judgments")
     showcase_parser.add_argument("--output-dir", default="demo_showcase")
 
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export the processed dataset")
+    export_parser.add_argument("--format", choices=["parquet", "jsonl"], default="parquet")
+    export_parser.add_argument("--processed-dir", default="legal_ai_toolkit/data/judgments")
+    export_parser.add_argument("--output-dir", default="exports/parquet", help="Parquet dataset directory")
+    export_parser.add_argument("--output-file", default="train.jsonl", help="JSONL output file")
+    export_parser.add_argument("--quarantine", default=None, help="JSONL rejects (default: <output-file>.quarantine.jsonl)")
+    export_parser.add_argument("--workers", type=int, default=None, help="Normalization workers for JSONL (default: CPUs - 1)")
+    export_parser.add_argument("--splits-dir", default=None, help="Directory with train/dev/test.txt (defaults to package data)")
+    export_parser.add_argument("--row-group-size", type=int, default=500, help="Rows per Parquet row group")
+    export_parser.add_argument("--compression", default="zstd", help="Parquet compression codec")
+    export_parser.add_argument("--max-open-writers", type=int, default=64, help="Parquet partition files open at once")
+
+    # Re-extract command
+    reextract_parser = subparsers.add_parser("reextract", help="Re-run judgment text extraction over the downloaded HTML archive")
+    reextract_parser.add_argument("--archive-dir", default="html_archive", help="HTML archive written by the downloader")
+    reextract_parser.add_argument("--output-dir", default="raw/judgments/unclassified", help="Directory for the <category>_<doc_id>.txt files")
+    reextract_parser.add_argument("--workers", type=int, default=None, help="Parallel workers (default: CPUs - 1)")
+    reextract_parser.add_argument("--backend", choices=["selectolax", "lxml", "bs4"], default=None, help="HTML backend (default: fastest installed)")
+
     # Dashboard command
     subparsers.add_parser("dashboard", help="Launch the CLI dashboard")
 
+    # Profile command
+    profile_parser = subparsers.add_parser("profile", help="Summarize profiles written by 'pipeline --profile'")
+    profile_parser.add_argument("path", nargs="?", default="interim", help="Profile JSON file or directory to search for profile_*.json")
+    profile_parser.add_argument("--top", type=int, default=10, help="Number of slowest rules/documents to show")
+
     args = parser.parse_args()
 
     if args.command == "pipeline":
-        orchestrator = PipelineOrchestrator(raw_dir=args.raw_dir)
-        if args.step:
+        from .pipeline.orchestrator import PipelineOrchestrator
+        from .utils.profiling import profiler
+        from .utils import codec
+        if args.profile:
+            profiler.enable()
+        if args.pretty_json:
+            codec.set_pretty(True)
+        orchestrator = PipelineOrchestrator(
+            raw_dir=args.raw_dir, storage=args.storage, compression=args.compression, shard_size=args.shard_size,
+            resume=args.resume, prometheus_file=args.prometheus_textfile, quarantine_chars=args.quarantine_chars,
+            quarantine_seconds=args.quarantine_seconds, defer_slow_lane=args.defer_slow_lane, prefork=not args.no_prefork,
+            trace_rules=args.trace_rules
+        )
+        if args.slow_lane:
+            if not args.step:
+                pipeline_parser.error("--slow-lane needs --step")
+            orchestrator.run_slow_lane(args.step)
+        elif args.step:
             orchestrator.run_step(args.step, workers=args.workers)
+        elif args.streaming:
+            orchestrator.run_streaming_pipeline(workers=args.workers, queue_size=args.queue_size)
+        elif args.executor == "shared-fs":
+            if not args.run_id and not args.local_nodes:
+                pipeline_parser.error("--executor shared-fs needs --run-id, the same on every node of the run")
+            from .pipeline.executors import COORDINATION_DIR, SharedFSExecutor, run_local_nodes
+            executor = SharedFSExecutor(
+                args.coordination_dir or os.path.join(orchestrator.interim_dir, COORDINATION_DIR), run_id=args.run_id,
+                node_id=args.node_id, shards=args.shards, lease_seconds=args.lease_seconds
+            )
+            try:
+                if args.local_nodes:
+                    if not run_local_nodes(orchestrator, executor, args.local_nodes, workers=args.workers):
+                        print(f"\n[FAILED] Not every node finished; see {executor.run_dir / 'done'}")
+                else:
+                    orchestrator.run_full_pipeline(workers=args.workers, executor=executor)
+            except ValueError as e:
+                print(f"[FAILED] {e}")
         else:
-            orchestrator.run_full_pipeline(workers=args.workers)
+            orchestrator.run_full_pipeline(workers=args.workers, jobs=args.jobs, force=args.force)
     elif args.command == "report":
+        from .analytics.reporting import ReportGenerator
         generator = ReportGenerator(args.cluster_file, args.processed_dir, args.output_dir)
         generator.generate()
     elif args.command == "audit":
+        from .analytics.audit import DataAuditor
         auditor = DataAuditor(args.processed_dir, cluster_file=args.cluster_file, edge_file=args.edge_file)
         if args.type == "quality":
             auditor.audit_quality()
@@ -67,10 +151,31 @@ def main():
         elif args.type == "integrity":
             auditor.validate_referential_integrity()
     elif args.command == "showcase":
+        from .utils.demo import ShowcasePreparer
         preparer = ShowcasePreparer(args.cluster_file, args.processed_dir, args.output_dir)
         preparer.prepare()
+    elif args.command == "export":
+        if args.format == "jsonl":
+            from .export.jsonl import JSONLExporter
+            exporter = JSONLExporter(args.output_file, quarantine_file=args.quarantine, workers=args.workers)
+            exporter.run_from_store(args.processed_dir)
+        else:
+            from .export.parquet import ParquetExporter
+            exporter = ParquetExporter(
+                args.processed_dir, args.output_dir, splits_dir=args.splits_dir,
+                row_group_size=args.row_group_size, compression=args.compression,
+                max_open_writers=args.max_open_writers
+            )
+            exporter.run()
+    elif args.command == "reextract":
+        from .extraction.archive import ReExtractor
+        ReExtractor(args.archive_dir, args.output_dir, backend=args.backend).run(workers=args.workers)
     elif args.command == "dashboard":
+        from .cli_dashboard import main as run_dashboard
         run_dashboard()
+    elif args.command == "profile":
+        from .utils.profiling import print_profile_report
+        print_profile_report(args.path, top=args.top)
     else:
         parser.print_help()
 
@@ -1,5 +1,19 @@
-from .similarity import SimilarityProcessor
-from .centroid import CentroidClusteter
-from .refinement import ClusterRefiner
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "SimilarityProcessor": ".similarity",
+    "CentroidClusteter": ".centroid",
+    "ClusterRefiner": ".refinement",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .similarity import SimilarityProcessor
+    from .centroid import CentroidClusteter
+    from .refinement import ClusterRefiner
 
 __all__ = ["SimilarityProcessor", "CentroidClusteter", "ClusterRefiner"]
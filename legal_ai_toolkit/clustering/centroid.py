@@ -2,6 +2,8 @@ import json
 import os
 from collections import defaultdict
 from pathlib import Path
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.metrics import StepMetrics
 
 # Universal filters
 UNIVERSAL_ISSUES = {"jurisdiction", "maintainability", "limitation"}
@@ -87,11 +89,12 @@ class CentroidClusteter:
             print(f"[ERROR] Edge file not found: {self.edge_file}")
             return
 
+        step_metrics = StepMetrics(self.__class__.__name__)
         edges = []
         with open(self.edge_file, "r", encoding="utf-8") as f:
             for line in f:
                 if line.strip():
-                    edges.append(json.loads(line))
+                    edges.append(codec.loads(line))
 
         print(f"Loaded {len(edges)} similarity edges.")
         cluster_nodes_list, edge_data = find_clusters_centroid(edges)
@@ -113,3 +116,7 @@ class CentroidClusteter:
             json.dump(final_clusters, f, indent=2, ensure_ascii=False)
 
         print(f"Identified {len(final_clusters)} clusters. Saved to {self.cluster_file}.")
+        # One thread does all the work: documents are the edges clustered
+        step_metrics.count(len(edges), self.edge_file.stat().st_size)
+        step_metrics.add_busy(step_metrics.elapsed())
+        step_metrics.finish(clusters=len(final_clusters))
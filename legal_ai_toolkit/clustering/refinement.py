@@ -2,6 +2,9 @@ import json
 import os
 from collections import defaultdict
 from pathlib import Path
+from legal_ai_toolkit.pipeline.storage import build_record_path
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.metrics import StepMetrics
 
 def refine_mega_clusters(clusters, signal_dir, max_cluster_size=30):
     """
@@ -21,10 +24,10 @@ def refine_mega_clusters(clusters, signal_dir, max_cluster_size=30):
             # Load signals for all judgments in cluster
             judgment_issues = {}
             for jid in cluster['judgments']:
-                signal_file = signal_dir / f"{jid}.json"
+                signal_file = build_record_path(signal_dir, jid, jid)
                 if signal_file.exists():
                     with open(signal_file) as f:
-                        sig = json.load(f)
+                        sig = codec.loads(f.read())
                         judgment_issues[jid] = sig.get('issues', [])
 
             # Group by primary issue (most frequent)
@@ -66,10 +69,10 @@ def filter_by_domain_purity(clusters, signal_dir):
         # Load domain info from signals
         domains = []
         for jid in cluster['judgments'][:10]:  # Sample first 10
-            signal_file = signal_dir / f"{jid}.json"
+            signal_file = build_record_path(signal_dir, jid, jid)
             if signal_file.exists():
                 with open(signal_file) as f:
-                    sig = json.load(f)
+                    sig = codec.loads(f.read())
                     domains.append(sig.get('domain', 'unknown'))
 
         # Check domain purity
@@ -99,8 +102,9 @@ class ClusterRefiner:
             print(f"[ERROR] Cluster file not found: {self.cluster_file}")
             return
 
+        step_metrics = StepMetrics(self.__class__.__name__)
         with open(self.cluster_file) as f:
-            clusters = json.load(f)
+            clusters = codec.loads(f.read())
 
         print(f"Loaded {len(clusters)} clusters.")
 
@@ -121,3 +125,7 @@ class ClusterRefiner:
             json.dump(filtered, f, indent=2, ensure_ascii=False)
 
         print(f"Refined clusters saved to {self.refined_file}.")
+        # One thread does all the work: documents are the clusters refined
+        step_metrics.count(len(clusters), self.cluster_file.stat().st_size)
+        step_metrics.add_busy(step_metrics.elapsed())
+        step_metrics.finish(clusters=len(filtered))
@@ -1,8 +1,11 @@
 import os
-import json
+import time
 from pathlib import Path
 from itertools import combinations
 from multiprocessing import Pool, cpu_count
+from legal_ai_toolkit.pipeline.storage import build_record_path, open_store
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.metrics import StepMetrics
 
 # Universal filters
 UNIVERSAL_ISSUES = {"jurisdiction", "maintainability", "limitation"}
@@ -94,6 +97,12 @@ def calculate_similarity_batch(args):
 
     return edges
 
+def timed_similarity_batch(args):
+    """Worker: calculate_similarity_batch plus the time it took (for worker utilization)."""
+    started = time.perf_counter()
+    edges = calculate_similarity_batch(args)
+    return edges, time.perf_counter() - started
+
 class SimilarityProcessor:
     def __init__(self, input_dir, signal_dir, edge_file):
         self.input_dir = Path(input_dir)
@@ -106,21 +115,24 @@ class SimilarityProcessor:
         if workers is None:
             workers = max(1, cpu_count() - 1)
 
-        files = list(self.input_dir.glob("*.json"))
+        store = open_store(self.input_dir)
         all_signals = {}
-
-        print(f"Extracting signals from {len(files)} judgments...")
-        for file in files:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            sig = extract_signals(data)
+        step_metrics = StepMetrics(self.__class__.__name__, workers=workers)
+
+        count = store.count()
+        print(f"Extracting signals from {count if count is not None else 'sharded'} judgments...")
+        for record in store.records():
+            raw = record.raw()
+            started = time.perf_counter()
+            sig = extract_signals(codec.loads(raw))
             jid = sig["judgment_id"]
             all_signals[jid] = sig
 
-            # Save signal file
-            with open(self.signal_dir / f"{jid}.json", "w", encoding="utf-8") as out:
-                json.dump(sig, out, indent=2)
+            # Save signal file (hierarchical IDs get subdirectories, as in the judgment stores)
+            signal_file = build_record_path(self.signal_dir, jid, jid)
+            signal_file.parent.mkdir(parents=True, exist_ok=True)
+            codec.dump(sig, signal_file)
+            step_metrics.observe(time.perf_counter() - started, len(raw))
 
         jid_list = list(all_signals.keys())
         pairs = list(combinations(jid_list, 2))
@@ -134,12 +146,14 @@ class SimilarityProcessor:
         print(f"Calculating similarity on {len(batches)} batches using {workers} workers...")
         all_edges = []
         with Pool(workers) as pool:
-            for result in pool.imap_unordered(calculate_similarity_batch, batches):
+            for result, seconds in pool.imap_unordered(timed_similarity_batch, batches):
                 all_edges.extend(result)
+                step_metrics.add_busy(seconds)
 
         print(f"Generated {len(all_edges)} edges. Saving to {self.edge_file}...")
         with open(self.edge_file, "w", encoding="utf-8") as out:
             for edge in all_edges:
-                out.write(json.dumps(edge) + "\n")
+                out.write(codec.dumps(edge, pretty=False) + "\n")
 
         print("[OK] Similarity calculation complete.")
+        step_metrics.finish(pairs=len(pairs), edges=len(all_edges))
@@ -0,0 +1,24 @@
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "JSONLExporter": ".jsonl",
+    "normalize_record": ".jsonl",
+    "ParquetExporter": ".parquet",
+    "load_splits": ".parquet",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .jsonl import JSONLExporter, normalize_record
+    from .parquet import ParquetExporter, load_splits
+
+__all__ = [
+    "JSONLExporter",
+    "normalize_record",
+    "ParquetExporter",
+    "load_splits"
+]
@@ -0,0 +1,276 @@
+"""
+Streaming JSONL export of the dataset (the Hugging Face ``train.jsonl``).
+
+Each source record is normalized to the strict record layout and validated
+against ``schemas/dataset_record.schema.json`` in a process pool. The
+schema is compiled once per worker. Results come back in source order and
+are handed to a writer thread through a bounded queue. Valid records go to
+the output file. Records that fail to parse, normalize or validate go to a
+quarantine JSONL file with their errors, so one bad judgment never stops a
+release. Both files are written atomically (``utils.atomic``): an export
+that fails or is interrupted leaves the previous files in place, and a clean
+export always replaces the quarantine file, empty if nothing was rejected.
+
+Sources are ``(name, raw JSON bytes)`` pairs, from a processed directory
+(``JSONLExporter.run_from_store``) or from git blobs
+(``scripts/normalize_dataset.py``).
+"""
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from legal_ai_toolkit.pipeline.storage import open_store
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+from legal_ai_toolkit.utils.schema import compile_schema, load_schema
+
+RECORD_SCHEMA = "dataset_record"
+# Normalized records waiting in the pool or the writer queue; bounds memory on large exports
+DEFAULT_MAX_IN_FLIGHT = 256
+WRITER_QUEUE_SIZE = 64
+# How often a producer blocked on the full writer queue checks the writer is still running (seconds)
+WRITER_POLL_SECONDS = 1.0
+# Queued instead of the end marker (None) when the producer fails, so neither file is replaced
+_ABORT = object()
+
+
+def normalize_string(val):
+    return str(val) if val is not None else ""
+
+
+def normalize_list(val):
+    if val is None:
+        return []
+    if isinstance(val, list):
+        return [str(v) for v in val] # Ensure all items are strings
+    return []
+
+
+def normalize_dict(val):
+    return val if isinstance(val, dict) else {}
+
+
+def normalize_record(data):
+    """
+    Enforces a strict schema for each record.
+    """
+    # 1. Core Fields
+    judgment_id = normalize_string(data.get("judgment_id"))
+    text = normalize_string(data.get("text"))
+
+    # 2. Metadata (Flatten/normalize known fields)
+    raw_meta = normalize_dict(data.get("metadata"))
+    metadata = {
+        "court": normalize_string(raw_meta.get("court")),
+        "date": normalize_string(raw_meta.get("date")),
+        "bench": normalize_list(raw_meta.get("bench")),
+        "case_type": normalize_string(raw_meta.get("case_type")),
+        "case_number": normalize_string(raw_meta.get("case_number")),
+        "petitioner": normalize_string(raw_meta.get("petitioner")),
+        "respondent": normalize_string(raw_meta.get("respondent"))
+    }
+
+    # 3. Classification
+    raw_class = normalize_dict(data.get("classification"))
+    classification = {
+        "domain": normalize_string(raw_class.get("domain")),
+        "confidence": normalize_string(raw_class.get("confidence", "low")), 
+        "signals": raw_class.get("signals", {}) 
+    }
+    # Ensure signals values are lists
+    if not isinstance(classification["signals"], dict):
+        classification["signals"] = {}
+    for k, v in classification["signals"].items():
+        if not isinstance(v, list):
+            classification["signals"][k] = []
+    
+    # 4. Extractions (Handle both keys and map correctly)
+    raw_extract = data.get("extractions") or data.get("annotations") or {}
+    raw_extract = normalize_dict(raw_extract)
+    
+    # Map 'annotations' keys to 'extractions' schema if needed
+    # In some JSONs: annotations = {citations: [], issues: {details: ...}}
+    # We want extractions = {citations: [], sections: [], landmarks: []}
+    
+    citations = normalize_list(raw_extract.get("citations"))
+    
+    # Try to find sections and landmarks, default to empty if not found
+    sections = normalize_list(raw_extract.get("sections"))
+    landmarks = normalize_list(raw_extract.get("landmarks"))
+    
+    extractions = {
+        "citations": citations,
+        "sections": sections,
+        "landmarks": landmarks
+    }
+
+    # 5. Statutory Transitions
+    raw_trans = data.get("statutory_transitions")
+    statutory_transitions = []
+    if isinstance(raw_trans, list):
+        for item in raw_trans:
+            if isinstance(item, dict):
+                 # Ensure all values in transition dict are strings
+                clean_item = {k: str(v) for k, v in item.items()}
+                statutory_transitions.append(clean_item)
+    
+    # 6. Provenance
+    raw_prov = normalize_dict(data.get("provenance"))
+    provenance = {
+        "version": normalize_string(raw_prov.get("version", "1.0")),
+        "processed_date": normalize_string(raw_prov.get("processed_date", datetime.now().isoformat()))
+    }
+    
+    # Construct final record
+    return {
+        "judgment_id": judgment_id,
+        "text": text,
+        "metadata": metadata,
+        "classification": classification,
+        "extractions": extractions,
+        "statutory_transitions": statutory_transitions,
+        "provenance": provenance
+    }
+
+
+# Compiled schema of the current process (set by _init_worker, or lazily in-process)
+_validate = None
+
+
+def _init_worker(schema_name: str = RECORD_SCHEMA):
+    global _validate
+    _validate = compile_schema(load_schema(schema_name))
+
+
+def process_source(item: Tuple[str, Optional[bytes]]) -> Tuple[str, Optional[str], Optional[Dict]]:
+    """
+    Parse, normalize and validate one source record.
+
+    Returns (name, JSON line, None) for a valid record, or
+    (name, None, quarantine entry) for a rejected one.
+    """
+    name, content = item
+    if _validate is None:
+        _init_worker()
+    if content is None:
+        return name, None, {"source": name, "stage": "read", "errors": ["missing from source"]}
+    try:
+        data = codec.loads(content)
+    except Exception as e:
+        return name, None, {"source": name, "stage": "parse", "errors": [str(e)]}
+    try:
+        record = normalize_record(data)
+    except Exception as e:
+        return name, None, {"source": name, "stage": "normalize", "errors": [str(e)],
+                            "judgment_id": data.get("judgment_id") if isinstance(data, dict) else None}
+
+    errors = _validate(record)
+    if errors:
+        return name, None, {"source": name, "stage": "validate", "errors": errors, "record": record}
+    return name, codec.dumps(record, pretty=False), None
+
+
+class JSONLExporter:
+    """Normalize, validate and write records as JSONL, quarantining the rejects."""
+
+    def __init__(self, output_file, quarantine_file=None, workers=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.output_file = Path(output_file)
+        self.quarantine_file = Path(quarantine_file) if quarantine_file else self.output_file.with_suffix(".quarantine.jsonl")
+        self.workers = workers if workers is not None else max(1, cpu_count() - 1)
+        self.max_in_flight = max_in_flight
+
+    def run_from_store(self, processed_dir) -> Dict[str, int]:
+        """Export every judgment in a processed directory (file-per-judgment or sharded)."""
+        store = open_store(processed_dir)
+        print(f"Exporting {processed_dir} to {self.output_file}...")
+        return self.run(store.raw_records())
+
+    def run(self, sources: Iterable[Tuple[str, Optional[bytes]]]) -> Dict[str, int]:
+        """Export (name, raw bytes) sources in order; returns written/quarantined counts."""
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        self.quarantine_file.parent.mkdir(parents=True, exist_ok=True)
+        writes: "queue.Queue" = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+        counts = {"written": 0, "quarantined": 0}
+        failure = []  # exception that stopped the writer thread
+        writer = threading.Thread(target=self._write, args=(writes, counts, failure), daemon=True)
+        writer.start()
+
+        start = time.perf_counter()
+        results = self._results(sources)
+        end = None
+        try:
+            for result in results:
+                if not self._put(writes, result, writer):
+                    break
+        except BaseException:
+            end = _ABORT
+            raise
+        finally:
+            results.close()  # stops the pool if the writer gave up early
+            self._put(writes, end, writer)
+            writer.join()
+        if failure:
+            raise failure[0]
+        elapsed = time.perf_counter() - start
+
+        total = counts["written"] + counts["quarantined"]
+        rate = total / elapsed if elapsed else 0.0
+        print(f"\n[OK] Wrote {counts['written']}/{total} records to {self.output_file} "
+              f"in {elapsed:.1f}s ({rate:.0f} records/s)")
+        if counts["quarantined"]:
+            print(f"[QUARANTINED] {counts['quarantined']} record(s) rejected, see {self.quarantine_file}")
+        return counts
+
+    def _results(self, sources):
+        """Yield processed sources in order, keeping at most max_in_flight in the pool."""
+        if self.workers <= 1:
+            _init_worker()
+            for item in sources:
+                yield process_source(item)
+            return
+
+        pending = deque()
+        with Pool(self.workers, initializer=_init_worker) as pool:
+            for item in sources:
+                pending.append(pool.apply_async(process_source, (item,)))
+                if len(pending) >= self.max_in_flight:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    @staticmethod
+    def _put(writes: "queue.Queue", item, writer: threading.Thread) -> bool:
+        """Queue item for the writer; returns False (instead of blocking forever) if the writer stopped."""
+        while writer.is_alive():
+            try:
+                writes.put(item, timeout=WRITER_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _write(self, writes: "queue.Queue", counts: Dict[str, int], failure: list):
+        """Writer thread; an exception (disk full, permissions) is left in failure for run() to raise."""
+        try:
+            with atomic_open(self.output_file, "w") as out, atomic_open(self.quarantine_file, "w") as quarantine:
+                while True:
+                    result = writes.get()
+                    if result is None:
+                        break
+                    if result is _ABORT:
+                        raise RuntimeError("Export aborted; output files left unchanged")
+                    name, line, rejected = result
+                    if rejected is None:
+                        out.write(line + "\n")
+                        counts["written"] += 1
+                        continue
+                    rejected["quarantined_at"] = datetime.now().isoformat()
+                    quarantine.write(codec.dumps(rejected, pretty=False) + "\n")
+                    counts["quarantined"] += 1
+        except Exception as e:
+            failure.append(e)
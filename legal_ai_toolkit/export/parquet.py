@@ -0,0 +1,295 @@
+"""
+Partitioned Parquet export of the consolidated corpus.
+
+Writes one Hive-style partitioned dataset::
+
+    <output_dir>/split=train/court_level=HC/year=2006/domain=criminal/part-00000.parquet
+
+The text is its own column, metadata fields are flat columns, and the
+extractions are Arrow lists of structs, so analytics and Hugging Face
+loading only read the columns they need. The split comes from
+``data/splits/{train,dev,test}.txt`` (one judgment ID per line). Judgments
+listed in none of them go to ``split=unassigned``.
+
+Records are streamed from the processed directory and buffered per
+partition. Each buffer is flushed as a row group once it holds
+``row_group_size`` rows, so memory stays bounded by the number of open
+partitions, not by the size of the corpus. At most ``max_open_writers``
+partition files are open at once. When another is needed, the least
+recently written one is closed, and a later row group for that partition
+starts a new file (``part-00001.parquet``, ...), so high-cardinality
+partition keys do not exhaust file handles or writer buffers.
+
+Requires ``pyarrow``.
+"""
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for the Parquet export
+    pa = None
+    pq = None
+
+from legal_ai_toolkit.pipeline.storage import open_store
+from legal_ai_toolkit.utils import codec
+
+SPLITS = ("train", "dev", "test")
+UNASSIGNED_SPLIT = "unassigned"
+PARTITION_COLUMNS = ("split", "court_level", "year", "domain")
+DEFAULT_ROW_GROUP_SIZE = 500
+# Flush the largest partition buffer once this many rows are buffered in total
+MAX_BUFFERED_ROWS = 5000
+# Partition files kept open for further row groups; the least recently written is closed first
+DEFAULT_MAX_OPEN_WRITERS = 64
+
+YEAR_PATTERN = re.compile(r"\b(1[89]\d{2}|20\d{2})\b")
+
+CITATION_FIELDS = ("type", "raw", "reporter", "year", "page", "petitioner", "respondent", "case_name")
+TRANSITION_FIELDS = ("ipc", "bns", "source", "risk", "confidence", "context_snippet", "note")
+LANDMARK_FIELDS = ("precedent_id", "short_name", "full_citation", "matched_by", "binding_authority", "status")
+
+
+def judgment_schema():
+    """Arrow schema of the exported files (partition columns live in the directory names)."""
+    string = pa.string()
+    return pa.schema([
+        ("judgment_id", string),
+        ("text", pa.large_string()),
+        ("court", string),
+        ("jurisdiction", string),
+        ("case_number", string),
+        ("decision_date", string),
+        ("bench", string),
+        ("confidence", string),
+        ("citations", pa.list_(pa.struct(
+            [(name, string) for name in CITATION_FIELDS]
+            + [("start_pos", pa.int64()), ("end_pos", pa.int64()), ("is_landmark", pa.bool_())]
+        ))),
+        ("sections", pa.list_(pa.struct([("act", string), ("section", string)]))),
+        ("transitions", pa.list_(pa.struct(
+            [(name, string) for name in TRANSITION_FIELDS]
+            + [("validated", pa.bool_()), ("requires_judicial_confirmation", pa.bool_())]
+        ))),
+        ("landmarks", pa.list_(pa.struct([(name, string) for name in LANDMARK_FIELDS] + [("year", pa.int32())]))),
+        ("issues", pa.list_(string)),
+        # Free-form nested data kept as JSON text
+        ("classification_signals", string),
+        ("processing_warnings", string),
+    ])
+
+
+def load_splits(splits_dir) -> Dict[str, str]:
+    """Map judgment ID -> split name from <splits_dir>/{train,dev,test}.txt."""
+    assignments = {}
+    for split in SPLITS:
+        path = Path(splits_dir) / f"{split}.txt"
+        if not path.exists():
+            continue
+        for line in _read_text(path).splitlines():
+            judgment_id = line.strip()
+            if judgment_id:
+                assignments[judgment_id] = split
+    return assignments
+
+
+def _read_text(path: Path) -> str:
+    """Read a split file, which may be UTF-8 or UTF-16 (with BOM)."""
+    raw = path.read_bytes()
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return raw.decode("utf-16")
+    return raw.decode("utf-8-sig")
+
+
+def _str(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _details(extractions: Dict, key: str) -> List[Dict]:
+    section = extractions.get(key) or {}
+    details = section.get("details", []) if isinstance(section, dict) else section
+    return [d for d in details if isinstance(d, dict)] if isinstance(details, list) else []
+
+
+def judgment_year(data: Dict) -> Optional[str]:
+    """Year of the judgment: metadata year, else decision date, else the year embedded in the ID."""
+    metadata = data.get("metadata", {})
+    for value in (metadata.get("year"), metadata.get("decision_date"), data.get("judgment_id")):
+        match = YEAR_PATTERN.search(str(value or ""))
+        if match:
+            return match.group(1)
+    return None
+
+
+def to_row(data: Dict) -> Tuple[Dict, Dict]:
+    """Convert a consolidated judgment into (partition values, column values)."""
+    metadata = data.get("metadata", {})
+    classification = data.get("classification", {})
+    extractions = data.get("extractions", {})
+
+    issues = (extractions.get("issues") or {}).get("details", [])
+    issue_names = list(issues.keys()) if isinstance(issues, dict) else [_str(i) for i in issues]
+
+    partition = {
+        "court_level": _str(metadata.get("court_level")) or "UNKNOWN",
+        "year": judgment_year(data) or "unknown",
+        "domain": _str(classification.get("domain")) or "unknown",
+    }
+    row = {
+        "judgment_id": _str(data.get("judgment_id")),
+        "text": data.get("text", ""),
+        "court": _str(metadata.get("court")),
+        "jurisdiction": _str(metadata.get("jurisdiction")),
+        "case_number": _str(metadata.get("case_number")),
+        "decision_date": _str(metadata.get("decision_date")),
+        "bench": _str(metadata.get("bench")),
+        "confidence": _str(classification.get("confidence")),
+        "citations": [
+            dict(
+                {name: _str(c.get(name)) for name in CITATION_FIELDS},
+                start_pos=_int(c.get("start_pos")),
+                end_pos=_int(c.get("end_pos")),
+                is_landmark=c.get("is_landmark"),
+            )
+            for c in _details(extractions, "citations")
+        ],
+        "sections": [
+            {"act": _str(s.get("act")), "section": _str(s.get("section"))}
+            for s in _details(extractions, "sections")
+        ],
+        "transitions": [
+            dict(
+                {name: _str(t.get(name)) for name in TRANSITION_FIELDS},
+                validated=t.get("validated"),
+                requires_judicial_confirmation=t.get("requires_judicial_confirmation"),
+            )
+            for t in _details(extractions, "transitions")
+        ],
+        "landmarks": [
+            dict({name: _str(lm.get(name)) for name in LANDMARK_FIELDS}, year=_int(lm.get("year")))
+            for lm in _details(extractions, "landmarks")
+        ],
+        "issues": issue_names,
+        "classification_signals": codec.dumps(classification["signals"], pretty=False) if "signals" in classification else None,
+        "processing_warnings": codec.dumps(data["processing_warnings"], pretty=False) if "processing_warnings" in data else None,
+    }
+    return partition, row
+
+
+def _partition_value(value: str) -> str:
+    return re.sub(r"[\\/=]+", "_", value.strip()) or "unknown"
+
+
+class ParquetExporter:
+    """Stream a processed directory into a split-aware, partitioned Parquet dataset."""
+
+    def __init__(self, processed_dir, output_dir, splits_dir=None,
+                 row_group_size=DEFAULT_ROW_GROUP_SIZE, compression="zstd", max_open_writers=DEFAULT_MAX_OPEN_WRITERS):
+        if pa is None:
+            raise ImportError("Parquet export requires the 'pyarrow' package")
+        pkg_root = Path(__file__).parent.parent
+        self.processed_dir = Path(processed_dir)
+        self.output_dir = Path(output_dir)
+        self.splits_dir = Path(splits_dir) if splits_dir else pkg_root / "data" / "splits"
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.max_open_writers = max_open_writers
+        self.schema = judgment_schema()
+        # Open writers, least recently written first; files written so far per partition
+        self._writers: "OrderedDict[Tuple, pq.ParquetWriter]" = OrderedDict()
+        self._files: Dict[Tuple, int] = {}
+        self._buffers: Dict[Tuple, List[Dict]] = {}
+        self._buffered = 0
+
+    def run(self) -> Dict[str, int]:
+        """Export every judgment; returns row counts per split."""
+        if not self.processed_dir.exists():
+            print(f"[ERROR] Processed directory not found: {self.processed_dir}")
+            return {}
+
+        splits = load_splits(self.splits_dir)
+        print(f"Exporting {self.processed_dir} to Parquet in {self.output_dir}...")
+        print(f"  Split assignments loaded: {len(splits)}")
+
+        # A rerun replaces the previous export
+        for old in self.output_dir.rglob("part-*.parquet"):
+            old.unlink()
+
+        counts: Dict[str, int] = {}
+        failed = 0
+        try:
+            for data in open_store(self.processed_dir).iter_judgments():
+                try:
+                    partition, row = to_row(data)
+                except Exception as e:
+                    failed += 1
+                    print(f"[ERROR] Skipping {data.get('judgment_id', 'unknown')}: {e}")
+                    continue
+                split = splits.get(row["judgment_id"], UNASSIGNED_SPLIT)
+                key = (split, partition["court_level"], partition["year"], partition["domain"])
+                self._add(key, row)
+                counts[split] = counts.get(split, 0) + 1
+        finally:
+            for key in list(self._buffers):
+                self._flush(key)
+            for writer in self._writers.values():
+                writer.close()
+
+        print(f"\n[OK] Exported {sum(counts.values())} judgments into {len(self._files)} partition(s) "
+              f"({sum(self._files.values())} file(s))")
+        for split, count in sorted(counts.items()):
+            print(f"  {split}: {count}")
+        if failed:
+            print(f"[FAILED] Failed: {failed}")
+        return counts
+
+    def _add(self, key: Tuple, row: Dict):
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(row)
+        self._buffered += 1
+        if len(buffer) >= self.row_group_size:
+            self._flush(key)
+        elif self._buffered >= MAX_BUFFERED_ROWS:
+            self._flush(max(self._buffers, key=lambda k: len(self._buffers[k])))
+
+    def _flush(self, key: Tuple):
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        self._buffered -= len(rows)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._open(key)
+        else:
+            self._writers.move_to_end(key)
+        writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def _open(self, key: Tuple) -> "pq.ParquetWriter":
+        """Start the partition's next file, closing the least recently written one if at the limit."""
+        while len(self._writers) >= self.max_open_writers:
+            _, oldest = self._writers.popitem(last=False)
+            oldest.close()
+        directory = self.output_dir.joinpath(
+            *(f"{column}={_partition_value(value)}" for column, value in zip(PARTITION_COLUMNS, key))
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        index = self._files.get(key, 0)
+        self._files[key] = index + 1
+        writer = self._writers[key] = pq.ParquetWriter(
+            directory / f"part-{index:05d}.parquet", self.schema, compression=self.compression
+        )
+        return writer
@@ -1,6 +1,27 @@
-from .citations import CitationExtractor, CitationNormalizer
-from .transitions import TransitionExtractor
-from .metadata import extract_header_metadata
-from .downloader import IndianKanoonDownloader
+from typing import TYPE_CHECKING
 
-__all__ = ["CitationExtractor", "CitationNormalizer", "TransitionExtractor", "extract_header_metadata", "IndianKanoonDownloader"]
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "CitationExtractor": ".citations",
+    "CitationNormalizer": ".citations",
+    "TransitionExtractor": ".transitions",
+    "extract_header_metadata": ".metadata",
+    "IndianKanoonDownloader": ".downloader",
+    "DownloadJournal": ".journal",
+    "HTMLArchive": ".archive",
+    "ReExtractor": ".archive",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .citations import CitationExtractor, CitationNormalizer
+    from .transitions import TransitionExtractor
+    from .metadata import extract_header_metadata
+    from .downloader import IndianKanoonDownloader
+    from .journal import DownloadJournal
+    from .archive import HTMLArchive, ReExtractor
+
+__all__ = ["CitationExtractor", "CitationNormalizer", "TransitionExtractor", "extract_header_metadata", "IndianKanoonDownloader", "DownloadJournal", "HTMLArchive", "ReExtractor"]
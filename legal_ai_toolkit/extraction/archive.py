@@ -0,0 +1,187 @@
+"""
+Content-addressed archive of downloaded judgment pages, and offline re-extraction.
+
+The downloader stores every fetched page here before cleaning it, so text
+extraction can be re-run over the archive (``cli reextract``) instead of
+re-crawling under rate limits.
+
+Layout::
+
+    <root>/objects/<aa>/<digest>.html.gz   (or .html.zst with compression="zstd")
+    <root>/index.jsonl                     one line per fetch: doc_id, category, url, hash, fetched_at
+
+Objects are named by the hash of their UTF-8 bytes (``utils.hashing``), so a
+page fetched again unchanged is stored once. The index is append-only; the
+last line for a doc_id is its current page.
+"""
+import gzip
+import os
+import threading
+from datetime import datetime
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for compression="zstd"
+    zstandard = None
+
+from legal_ai_toolkit.extraction.html_text import MIN_JUDGMENT_CHARS, extract_judgment_text
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+from legal_ai_toolkit.utils.hashing import hash_bytes, hash_digest
+
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+OBJECT_SUFFIXES = {"gzip": ".html.gz", "zstd": ".html.zst"}
+
+# Pages handed to each re-extraction worker at a time
+REEXTRACT_CHUNKSIZE = 8
+
+
+class HTMLArchive:
+    def __init__(self, root, compression: str = "gzip"):
+        if compression not in OBJECT_SUFFIXES:
+            raise ValueError(f"Unknown archive compression: {compression} (expected one of {', '.join(OBJECT_SUFFIXES)})")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("compression='zstd' requires the 'zstandard' package")
+        self.root = Path(root)
+        self.compression = compression
+        self._lock = threading.Lock()
+        (self.root / OBJECTS_DIR).mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, content_hash: str, compression: str) -> Path:
+        digest = hash_digest(content_hash)
+        return self.root / OBJECTS_DIR / digest[:2] / f"{digest}{OBJECT_SUFFIXES[compression]}"
+
+    def find(self, content_hash: str) -> Optional[Path]:
+        """Stored object for a hash, whichever compression it was written with."""
+        for compression in OBJECT_SUFFIXES:
+            path = self._object_path(content_hash, compression)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, page: str, doc_id: str, category: str, url: str) -> str:
+        """Store a page (if not already stored), index it under doc_id and return its hash."""
+        data = page.encode("utf-8")
+        content_hash = hash_bytes(data)
+        if self.find(content_hash) is None:
+            path = self._object_path(content_hash, self.compression)
+            path.parent.mkdir(exist_ok=True)
+            # Written to a temp file and renamed, so a crash never leaves a truncated object
+            with atomic_open(path, "wb") as f:
+                f.write(_compress(data, self.compression))
+
+        entry = {"doc_id": doc_id, "category": category, "url": url, "hash": content_hash,
+                 "fetched_at": datetime.now().isoformat()}
+        with self._lock:
+            with open(self.root / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(codec.dumps(entry, pretty=False) + "\n")
+        return content_hash
+
+    def get(self, content_hash: str) -> str:
+        path = self.find(content_hash)
+        if path is None:
+            raise KeyError(f"Page not in archive: {content_hash}")
+        return read_object(path)
+
+    def entries(self) -> Dict[str, Dict]:
+        """Current index entry per doc_id."""
+        entries = {}
+        index_path = self.root / INDEX_FILE
+        if index_path.exists():
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = codec.loads(line)
+                        entries[entry["doc_id"]] = entry
+        return entries
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.entries().values())
+
+
+def read_object(path) -> str:
+    with open(path, "rb") as f:
+        data = f.read()
+    if str(path).endswith(OBJECT_SUFFIXES["zstd"]):
+        if zstandard is None:
+            raise ImportError(f"Reading {Path(path).name} requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return gzip.decompress(data).decode("utf-8")
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+
+def reextract_page(args):
+    """Worker: re-run text extraction on one archived page and write the .txt if it changed."""
+    object_path, out_path, backend = args
+    try:
+        text = extract_judgment_text(read_object(object_path), backend)
+        if text is None or len(text) <= MIN_JUDGMENT_CHARS:
+            return "skipped"
+        out_path = Path(out_path)
+        if out_path.exists() and out_path.read_text(encoding="utf-8") == text:
+            return "unchanged"
+        status = "updated" if out_path.exists() else "written"
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return status
+    except Exception as e:
+        print(f"Error re-extracting {object_path}: {e}")
+        return "failed"
+
+
+class ReExtractor:
+    """Re-clean every archived page into <category>_<doc_id>.txt files, in parallel."""
+
+    def __init__(self, archive_dir, output_dir, backend=None):
+        self.archive = HTMLArchive(archive_dir)
+        self.output_dir = Path(output_dir)
+        self.backend = backend
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def run(self, workers=None):
+        if workers is None:
+            workers = max(1, cpu_count() - 1)
+
+        entries = list(self.archive)
+        if not entries:
+            print(f"[WARNING] No archived pages in {self.archive.root}")
+            return {}
+
+        print(f"Re-extracting {len(entries)} archived pages from {self.archive.root} with {workers} workers...")
+        work = []
+        missing = 0
+        for entry in entries:
+            object_path = self.archive.find(entry["hash"])
+            if object_path is None:
+                missing += 1
+                continue
+            out_path = self.output_dir / f"{entry['category']}_{entry['doc_id']}.txt"
+            work.append((str(object_path), str(out_path), self.backend))
+
+        from tqdm import tqdm
+        counts = {"written": 0, "updated": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+        if workers > 1:
+            with Pool(workers) as pool:
+                for status in tqdm(pool.imap_unordered(reextract_page, work, chunksize=REEXTRACT_CHUNKSIZE), total=len(work)):
+                    counts[status] += 1
+        else:
+            for status in tqdm(map(reextract_page, work), total=len(work)):
+                counts[status] += 1
+
+        print(f"\n[OK] Written: {counts['written']}, updated: {counts['updated']}, unchanged: {counts['unchanged']}")
+        if counts["skipped"]:
+            print(f"[SKIPPED] No judgment text (or too short): {counts['skipped']}")
+        if missing:
+            print(f"[WARNING] Indexed pages missing from the archive: {missing}")
+        if counts["failed"]:
+            print(f"[FAILED] Failed: {counts['failed']}")
+        return counts
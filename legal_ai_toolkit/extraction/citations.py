@@ -10,6 +10,8 @@ IMPROVEMENTS:
 """
 import re
 from typing import List, Dict, Optional
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
 
 
 class CitationExtractor:
@@ -31,7 +33,13 @@ class CitationExtractor:
 
     # Case name pattern - requires proper case name format
     # Excludes common procedural patterns like "State vs. Accused"
-    CASE_NAME_PATTERN = r'(?:In|in)\s+([A-Z][a-zA-Z\s&.]+?)\s+(?:vs?\.?|versus)\s+([A-Z][a-zA-Z\s&.]+?)(?:\s+(?:\d{4}|\(|,|;))'
+    # Party names are bounded: unbounded lazy runs backtrack quadratically on
+    # long title-case passages that never reach "v." or the citation.
+    MAX_PARTY_NAME_CHARS = 100
+    CASE_NAME_PATTERN = (
+        rf'(?:In|in)\s+([A-Z][a-zA-Z\s&.]{{0,{MAX_PARTY_NAME_CHARS}}}?)\s+(?:vs?\.?|versus)\s+'
+        rf'([A-Z][a-zA-Z\s&.]{{0,{MAX_PARTY_NAME_CHARS}}}?)(?:\s+(?:\d{{4}}|\(|,|;))'
+    )
 
     # Patterns to exclude (procedural references, not actual citations)
     EXCLUDE_PATTERNS = [
@@ -41,7 +49,22 @@ class CitationExtractor:
         r'Case\s+Crime\s+No',  # Crime case numbers
     ]
 
+    # Compiled rules (shared registry)
+    REPORTER_RULES = {
+        reporter: register(f"citations.reporter.{reporter}", pattern, re.IGNORECASE)
+        for reporter, pattern in PATTERNS.items()
+    }
+    CASE_NAME_RULE = register("citations.case_name", CASE_NAME_PATTERN, version="2")
+    EXCLUDE_RULES = [
+        register(f"citations.exclude.{i}", pattern, re.IGNORECASE)
+        for i, pattern in enumerate(EXCLUDE_PATTERNS)
+    ]
+    WHITESPACE_RULE = register("citations.whitespace", r'\s+')
+    HONORIFIC_RULE = register("citations.honorific_prefix", r'^(?:Smt\.|Shri|Sri|Km\.)\s+')
+    VERSUS_RULE = register("citations.versus", r'\bvs?\.?\b|\bversus\b')
+
     @classmethod
+    @profiled("citations.extract")
     def extract(cls, text: str, judgment_id: Optional[str] = None, current_case_name: Optional[str] = None) -> List[Dict]:
         """
         Extract citations from judgment text.
@@ -58,8 +81,8 @@ class CitationExtractor:
         seen = set()  # For deduplication
 
         # Extract reporter citations (AIR, SCC, etc.)
-        for reporter, pattern in cls.PATTERNS.items():
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for reporter, rule in cls.REPORTER_RULES.items():
+            for match in rule.finditer(text):
                 citation_text = match.group(0)
 
                 # Skip if already seen
@@ -97,13 +120,13 @@ class CitationExtractor:
                 seen.add(citation_text)
 
         # Extract case name citations
-        for match in re.finditer(cls.CASE_NAME_PATTERN, text):
+        for match in cls.CASE_NAME_RULE.finditer(text):
             # Normalize whitespace in extracted groups
-            petitioner = re.sub(r'\s+', ' ', match.group(1)).strip()
-            respondent = re.sub(r'\s+', ' ', match.group(2)).strip()
+            petitioner = cls.WHITESPACE_RULE.sub(' ', match.group(1)).strip()
+            respondent = cls.WHITESPACE_RULE.sub(' ', match.group(2)).strip()
 
             # Additional cleanup for known prefixes
-            petitioner = re.sub(r'^(?:Smt\.|Shri|Sri|Km\.)\s+', '', petitioner)
+            petitioner = cls.HONORIFIC_RULE.sub('', petitioner)
 
             citation_text = f"{petitioner} v. {respondent}"
 
@@ -142,8 +165,8 @@ class CitationExtractor:
     @staticmethod
     def _is_procedural_reference(text: str) -> bool:
         """Check if text matches procedural reference patterns (not actual citations)."""
-        for pattern in CitationExtractor.EXCLUDE_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
+        for rule in CitationExtractor.EXCLUDE_RULES:
+            if rule.search(text):
                 return True
         return False
 
@@ -155,10 +178,10 @@ class CitationExtractor:
             # Lowercase
             text = text.lower()
             # Replace vs./v./versus with just 'v'
-            text = re.sub(r'\bvs?\.?\b|\bversus\b', 'v', text)
+            text = CitationExtractor.VERSUS_RULE.sub('v', text)
             # Remove dots and extra spaces
-            text = re.sub(r'\.', '', text)
-            text = re.sub(r'\s+', ' ', text)
+            text = text.replace('.', '')
+            text = CitationExtractor.WHITESPACE_RULE.sub(' ', text)
             return text.strip()
 
         citation_normalized = normalize(citation_text)
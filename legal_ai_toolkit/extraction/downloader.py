@@ -6,31 +6,100 @@ CHANGES FROM ORIGINAL:
 2. Added whitespace normalization at source
 3. Strips HTML artifacts during extraction
 4. Preserves paragraph structure without excessive newlines
+
+The text extraction itself lives in html_text.py (lxml/selectolax backends
+with BeautifulSoup as the reference).
+
+Requests go through a thread pool: each worker keeps a keep-alive
+requests.Session, and one token bucket shared by all queries bounds the
+request rate. 429/503 responses honour Retry-After (or back off
+exponentially) by pausing the whole bucket. ``base_url`` can point at a
+local stub server for testing.
+
+Every fetched page is stored in a content-addressed HTML archive
+(archive.py) before cleaning, so ``cli reextract`` can redo the text
+extraction offline. Progress is kept in a SQLite download journal (see journal.py): search
+pages, per-document status/retries and ETag/Last-Modified, so a restart
+resumes mid-query and ``refresh=True`` re-fetches with conditional requests.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup, NavigableString, Tag
 import json
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-import re
 import logging
 
+from legal_ai_toolkit.extraction.archive import HTMLArchive
+from legal_ai_toolkit.extraction.html_text import MIN_JUDGMENT_CHARS, clean_element_text, extract_judgment_text
+from legal_ai_toolkit.extraction.journal import DONE, FAILED, SKIPPED, DownloadJournal
+from legal_ai_toolkit.utils.ratelimit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+BASE_URL = "https://indiankanoon.org"
+
+# Polite defaults, the pace of the old serial downloader (a 10-20 s sleep after every
+# document): requests per second across all workers, and the burst allowed. Pass a
+# higher rate=/burst=/workers= to the constructor where the server allows it.
+DEFAULT_RATE = 1 / 15
+DEFAULT_BURST = 1
+DEFAULT_WORKERS = 1
+
+# Retry policy for 429/503 and connection errors
+MAX_RETRIES = 5
+BACKOFF_BASE = 5.0      # seconds, doubled per attempt
+BACKOFF_MAX = 300.0     # never wait longer than the old fixed 5-minute sleep
+RETRY_STATUSES = {429, 503}
+
+# Failed documents are retried on later runs until they have failed this often
+MAX_DOCUMENT_RETRIES = 3
 
 
 class IndianKanoonDownloader:
-    def __init__(self, output_dir='raw/judgments/unclassified', checkpoint_file='download_checkpoint.json'):
+    def __init__(self, output_dir='raw/judgments/unclassified', checkpoint_file='download_checkpoint.json',
+                 base_url=BASE_URL, rate=DEFAULT_RATE, burst=DEFAULT_BURST, workers=DEFAULT_WORKERS,
+                 max_retries=MAX_RETRIES, timeout=15, journal_file=None, html_backend=None,
+                 archive_dir=None, archive_compression='gzip'):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.checkpoint_file = Path(checkpoint_file)
+        # Fine-grained progress lives next to the summary checkpoint by default
+        self.journal = DownloadJournal(journal_file or self.checkpoint_file.with_suffix('.sqlite3'))
+        # Raw pages, kept so text can be re-extracted without re-downloading
+        self.archive = HTMLArchive(archive_dir or self.checkpoint_file.parent / 'html_archive', archive_compression)
+        self.base_url = base_url.rstrip('/')
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
         }
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate, burst)
+        # selectolax/lxml when installed, else BeautifulSoup (see html_text.py)
+        self.html_backend = html_backend
+        self._local = threading.local()
+        self._progress_lock = threading.Lock()
         self.load_checkpoint()
 
+    @property
+    def session(self):
+        """Per-thread keep-alive session (requests.Session is not safe to share between threads)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
     def load_checkpoint(self):
         if self.checkpoint_file.exists():
             with open(self.checkpoint_file, 'r') as f:
@@ -39,8 +108,9 @@ class IndianKanoonDownloader:
             self.progress = {'completed_queries': [], 'total_downloaded': 0}
 
     def save_checkpoint(self):
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(self.progress, f, indent=2)
+        with self._progress_lock:
+            with open(self.checkpoint_file, 'w') as f:
+                json.dump(self.progress, f, indent=2)
 
     @staticmethod
     def extract_clean_text(element) -> str:
@@ -61,132 +131,220 @@ class IndianKanoonDownloader:
         Returns:
             Clean text string with normalized whitespace
         """
-        if not element:
-            return ""
-
-        # CRITICAL FIX: Remove citation elements BEFORE extracting text
-        # Indian Kanoon puts [Cites X, Cited by Y] in <a> tags with class 'cite_tag'
-        for cite_tag in element.find_all('a', class_='cite_tag'):
-            cite_tag.decompose()  # Remove the element entirely
-
-        # Also remove any elements that contain the citation pattern
-        # SAFE FIX: Removing destructive parent.decompose() which was causing data loss
-        # The regex cleaning below handles this text removal safely
-        pass
-
-
-        # Extract text with space separator (prevents \n artifacts)
-        text = element.get_text(separator=' ', strip=True)
+        return clean_element_text(element)
 
-        # Remove any remaining citation count artifacts in text
-        text = re.sub(r'\[\s*Cites\s*\d+\s*,\s*Cited\s*by\s*\d+\s*\]', '', text, flags=re.IGNORECASE)
-
-        # Remove standalone numbers that look like citation counts
-        text = re.sub(r'\s+\d+\s+(?=,|\]|Cited)', ' ', text)
-
-        # Normalize multiple spaces to single space
-        text = re.sub(r'\s+', ' ', text)
-
-        # Normalize paragraph breaks (optional: preserves structure)
-        paragraphs = []
-        for p in element.find_all(['p', 'div'], recursive=False):
-            para_text = p.get_text(separator=' ', strip=True)
-            if para_text and len(para_text) > 10:  # Skip very short fragments
-                paragraphs.append(para_text)
-        if paragraphs:
-            text = '\n\n'.join(paragraphs)
+    @staticmethod
+    def _retry_after(resp):
+        """Seconds requested by a Retry-After header (delta-seconds or HTTP date), or None."""
+        value = resp.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt):
+        return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.8, 1.2)
+
+    def _get(self, url, params=None, headers=None):
+        """GET through the shared rate limit, retrying 429/503 and connection errors."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{url} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
 
-        # FINAL PASS: Remove any lingering citation artifacts
-        text = re.sub(r'\[\s*Cites\s*\d+\s*,\s*Cited\s*by\s*\d+\s*\]', '', text, flags=re.IGNORECASE)
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_after(resp)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                delay = min(delay, BACKOFF_MAX)
+                logger.warning(f"HTTP {resp.status_code} for {url}. Pausing all requests for {delay:.1f}s")
+                # Everyone backs off, not just this thread
+                self.limiter.pause(delay)
+                continue
 
-        return text.strip()
+            resp.raise_for_status()
+            return resp
 
-    def search_and_download(self, query, category, max_results=25):
-        if query in self.progress['completed_queries']:
-            logger.info(f"Skipping completed query: {query}")
-            return 0
+    def search_doc_links(self, query, max_results=25, refresh=False):
+        """
+        Collect up to max_results /doc/ links from the search result pages for query.
 
-        logger.info(f"Query [{category}]: {query} (Target: {max_results})")
-        base_url = "https://indiankanoon.org/search/"
+        Pages already in the journal are not fetched again unless refresh is set.
+        """
+        search_url = f"{self.base_url}/search/"
         doc_links = []
+        seen = set()
         pages = (max_results // 10) + 1
 
-        # === SEARCH PHASE (unchanged) ===
         for page in range(pages):
             if len(doc_links) >= max_results:
                 break
 
-            params = {'formInput': query, 'pagenum': page}
-            try:
-                resp = requests.get(base_url, params=params, headers=self.headers, timeout=15)
-                if resp.status_code == 429:
-                    logger.warning("Rate limit hit. Sleeping 5 mins...")
-                    time.sleep(300)
-                    continue
-
-                resp.raise_for_status()
+            links = None if refresh else self.journal.page_links(query, page)
+            if links is None:
+                params = {'formInput': query, 'pagenum': page}
+                try:
+                    resp = self._get(search_url, params=params)
+                except Exception as e:
+                    logger.error(f"Page {page} failed: {e}")
+                    break
                 soup = BeautifulSoup(resp.text, 'html.parser')
-
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    if href.startswith('/doc/') and any(c.isdigit() for c in href):
-                        if href not in doc_links:
-                            doc_links.append(href)
-
-                time.sleep(random.uniform(3, 6))
-
-            except Exception as e:
-                logger.error(f"Page {page} failed: {e}")
+                links = [
+                    a['href'] for a in soup.find_all('a', href=True)
+                    if a['href'].startswith('/doc/') and any(c.isdigit() for c in a['href'])
+                ]
+                self.journal.record_page(query, page, links)
+
+            found = 0
+            for href in links:
+                if href not in seen:
+                    seen.add(href)
+                    doc_links.append(href)
+                    found += 1
+            if not found:
                 break
 
-        # === DOWNLOAD PHASE (IMPROVED) ===
-        downloaded = 0
-        for link in doc_links[:max_results]:
-            case_url = f"https://indiankanoon.org{link}"
-            doc_id = link.strip('/').split('/')[-1]
-            filename = f"{category}_{doc_id}.txt"
-            file_path = self.output_dir / filename
-
-            if file_path.exists():
-                downloaded += 1
-                continue
-
-            logger.info(f"Downloading: {case_url}")
-            try:
-                resp = requests.get(case_url, headers=self.headers, timeout=15)
-                if resp.status_code == 429:
-                    logger.warning("Rate limit hit. Sleeping 5 mins...")
-                    time.sleep(300)
-                    continue
-
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, 'html.parser')
-
-                # Find judgment content div
-                div = soup.find('div', class_='judgments') or soup.find('div', class_='doc_content')
-
-                if div:
-                    # === KEY CHANGE: Use new extraction method ===
-                    clean_text = self.extract_clean_text(div)
+        return doc_links[:max_results]
 
-                    # Validate minimum content length
-                    if len(clean_text) > 500:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(clean_text)
-                        downloaded += 1
-                        self.progress['total_downloaded'] += 1
-                        logger.info(f"Saved {len(clean_text)} characters")
-                    else:
-                        logger.warning(f"Content too short ({len(clean_text)} chars)")
+    @staticmethod
+    def doc_id(link):
+        return link.strip('/').split('/')[-1]
 
-                time.sleep(random.uniform(10, 20))
+    def download_document(self, link, category, refresh=False):
+        """
+        Download one judgment page; returns True if it is (already) saved.
 
-            except Exception as e:
-                logger.warning(f"Failed {case_url}: {e}")
+        Documents the journal has as done, skipped, or failed too often are
+        not requested again. With refresh, saved documents are re-requested
+        conditionally (If-None-Match / If-Modified-Since).
+        """
+        case_url = f"{self.base_url}{link}"
+        doc_id = self.doc_id(link)
+        entry = self.journal.document(doc_id) or {}
+        # A document found by several queries is saved once, under the first query's category
+        category = entry.get('category', category)
+        file_path = Path(entry['path']) if entry.get('path') else self.output_dir / f"{category}_{doc_id}.txt"
+        status = entry.get('status')
+
+        if not refresh:
+            if file_path.exists():
+                if status != DONE:
+                    self.journal.mark_document(doc_id, DONE, path=str(file_path))
+                return True
+            if status == SKIPPED or (status == FAILED and entry['retries'] >= MAX_DOCUMENT_RETRIES):
+                return False
+
+        headers = {}
+        if refresh and file_path.exists():
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        logger.info(f"Downloading: {case_url}")
+        try:
+            resp = self._get(case_url, headers=headers or None)
+            if resp.status_code == 304:
+                self.journal.mark_document(doc_id, DONE, path=str(file_path))
+                return True
+
+            validators = {'etag': resp.headers.get('ETag'), 'last_modified': resp.headers.get('Last-Modified')}
+            self.archive.put(resp.text, doc_id, category, case_url)
+
+            # Text of the judgment content div (div.judgments or div.doc_content)
+            clean_text = extract_judgment_text(resp.text, self.html_backend)
+
+            if clean_text is None:
+                self.journal.mark_document(doc_id, SKIPPED, error="no judgment content", **validators)
+                return False
+
+            # Validate minimum content length
+            if len(clean_text) <= MIN_JUDGMENT_CHARS:
+                logger.warning(f"Content too short ({len(clean_text)} chars)")
+                self.journal.mark_document(doc_id, SKIPPED, error=f"content too short ({len(clean_text)} chars)", **validators)
+                return False
+
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(clean_text)
+            self.journal.mark_document(doc_id, DONE, path=str(file_path), **validators)
+            with self._progress_lock:
+                self.progress['total_downloaded'] += 1
+            logger.info(f"Saved {len(clean_text)} characters")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed {case_url}: {e}")
+            self.journal.mark_document(doc_id, FAILED, error=str(e))
+        return False
+
+    def _query_complete(self, query):
+        return self.journal.is_query_complete(query) or query in self.progress['completed_queries']
+
+    def download_queries(self, queries, max_results=25, refresh=False):
+        """
+        Search and download several queries concurrently.
 
-        self.progress['completed_queries'].append(query)
-        self.save_checkpoint()
-        return downloaded
+        queries is a list of (query, category). Search pages of all queries
+        are fetched in parallel, then every document; the shared token bucket
+        is what bounds throughput. Completed queries are skipped unless
+        refresh is set. Returns {query: documents saved}.
+        """
+        pending = []
+        for query, category in queries:
+            if not refresh and self._query_complete(query):
+                logger.info(f"Skipping completed query: {query}")
+            else:
+                logger.info(f"Query [{category}]: {query} (Target: {max_results})")
+                pending.append((query, category))
+
+        results = {query: 0 for query, _ in queries}
+        if not pending:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            link_futures = [executor.submit(self.search_doc_links, query, max_results, refresh) for query, _ in pending]
+
+            # Each document is requested once per run, by the first query that found it
+            submitted = {}
+            doc_futures = []
+            for (query, category), links in zip(pending, (f.result() for f in link_futures)):
+                futures = []
+                for link in links:
+                    doc_id = self.doc_id(link)
+                    self.journal.add_document(doc_id, link, query, category)
+                    if doc_id not in submitted:
+                        submitted[doc_id] = executor.submit(self.download_document, link, category, refresh)
+                    futures.append(submitted[doc_id])
+                doc_futures.append(futures)
+
+            for (query, category), futures in zip(pending, doc_futures):
+                results[query] = sum(1 for f in futures if f.result())
+                self.journal.complete_query(query, category)
+                with self._progress_lock:
+                    if query not in self.progress['completed_queries']:
+                        self.progress['completed_queries'].append(query)
+                self.save_checkpoint()
+
+        return results
+
+    def search_and_download(self, query, category, max_results=25, refresh=False):
+        if not refresh and self._query_complete(query):
+            logger.info(f"Skipping completed query: {query}")
+            return 0
+        return self.download_queries([(query, category)], max_results, refresh)[query]
 
 
 # === BACKWARD COMPATIBILITY ===
@@ -0,0 +1,208 @@
+"""
+Judgment text extraction from Indian Kanoon HTML pages.
+
+Three backends produce the same text:
+
+- "selectolax" (lexbor parser) and "lxml" walk the judgment div once,
+  collecting the page's strings and the per-paragraph strings in the same
+  pass. They are used when the package is installed.
+- "bs4" is the reference: BeautifulSoup's html.parser plus the original
+  get_text/regex passes of IndianKanoonDownloader.extract_clean_text.
+
+Text rules (all backends): ``a.cite_tag`` links and script/style content are
+dropped; if the div has direct ``p``/``div`` children longer than 10
+characters their texts, joined by blank lines, are the result; otherwise the
+div's whole text is used with citation-count artifacts and whitespace
+cleaned up. Parsers can build different trees from malformed HTML, so
+``benchmarks/bench_html.py`` checks the fast backends against "bs4".
+"""
+import re
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # optional: faster backend
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: fastest backend
+    LexborHTMLParser = None
+
+CITE_COUNT_PATTERN = re.compile(r'\[\s*Cites\s*\d+\s*,\s*Cited\s*by\s*\d+\s*\]', re.IGNORECASE)
+STRAY_COUNT_PATTERN = re.compile(r'\s+\d+\s+(?=,|\]|Cited)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+JUDGMENT_DIV_CLASSES = ("judgments", "doc_content")
+PARAGRAPH_TAGS = {"p", "div"}
+MIN_PARAGRAPH_CHARS = 10
+# Shorter texts are not saved as judgments (downloader and re-extraction)
+MIN_JUDGMENT_CHARS = 500
+# Elements whose strings BeautifulSoup's get_text leaves out
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+BACKENDS = [name for name, module in (("selectolax", LexborHTMLParser), ("lxml", lxml_html)) if module is not None]
+BACKENDS.append("bs4")
+DEFAULT_BACKEND = BACKENDS[0]
+
+
+def extract_judgment_text(page: str, backend: Optional[str] = None) -> Optional[str]:
+    """Clean text of the judgment div of a page, or None if the page has no judgment div."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"HTML backend not available: {backend} (available: {', '.join(BACKENDS)})")
+    if backend == "selectolax":
+        return _selectolax_text(page)
+    if backend == "lxml":
+        return _lxml_text(page)
+    return _bs4_text(page)
+
+
+def compose_text(strings: List[str], paragraphs: List[str]) -> str:
+    """Final text from the div's stripped strings and its direct p/div children's texts."""
+    paragraphs = [p for p in paragraphs if len(p) > MIN_PARAGRAPH_CHARS]
+    if paragraphs:
+        text = '\n\n'.join(paragraphs)
+    else:
+        text = CITE_COUNT_PATTERN.sub('', ' '.join(strings))
+        text = STRAY_COUNT_PATTERN.sub(' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
+    return CITE_COUNT_PATTERN.sub('', text).strip()
+
+
+def _add(strings: List[str], value: Optional[str]):
+    if value:
+        value = value.strip()
+        if value:
+            strings.append(value)
+
+
+# --- bs4 (reference) ---
+
+def clean_element_text(element) -> str:
+    """Text of a BeautifulSoup element (see IndianKanoonDownloader.extract_clean_text)."""
+    if not element:
+        return ""
+
+    # Indian Kanoon puts [Cites X, Cited by Y] in <a> tags with class 'cite_tag'
+    for cite_tag in element.find_all('a', class_='cite_tag'):
+        cite_tag.decompose()
+
+    # Extract text with space separator (prevents \n artifacts)
+    text = element.get_text(separator=' ', strip=True)
+
+    # Remove any remaining citation count artifacts, then stray counts, then extra whitespace
+    text = CITE_COUNT_PATTERN.sub('', text)
+    text = STRAY_COUNT_PATTERN.sub(' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
+
+    # Preserve paragraph structure when the div has paragraph children
+    paragraphs = []
+    for p in element.find_all(['p', 'div'], recursive=False):
+        para_text = p.get_text(separator=' ', strip=True)
+        if para_text and len(para_text) > MIN_PARAGRAPH_CHARS:
+            paragraphs.append(para_text)
+    if paragraphs:
+        text = '\n\n'.join(paragraphs)
+
+    # FINAL PASS: Remove any lingering citation artifacts
+    text = CITE_COUNT_PATTERN.sub('', text)
+
+    return text.strip()
+
+
+def _bs4_text(page: str) -> Optional[str]:
+    soup = BeautifulSoup(page, 'html.parser')
+    div = soup.find('div', class_='judgments') or soup.find('div', class_='doc_content')
+    return clean_element_text(div) if div else None
+
+
+# --- lxml ---
+
+def _lxml_skipped(node) -> bool:
+    tag = node.tag
+    if not isinstance(tag, str):  # comments, processing instructions
+        return True
+    return tag in NON_TEXT_TAGS or (tag == "a" and "cite_tag" in (node.get("class") or "").split())
+
+
+def _lxml_collect(root, strings: List[str]):
+    """Append the stripped strings inside root (not its tail), in document order."""
+    stack = [(root, False)]
+    while stack:
+        node, tail = stack.pop()
+        if tail:
+            _add(strings, node.tail)
+            continue
+        if _lxml_skipped(node):
+            continue
+        _add(strings, node.text)
+        for child in reversed(node):
+            stack.append((child, True))
+            stack.append((child, False))
+
+
+def _lxml_find_div(root):
+    for css_class in JUDGMENT_DIV_CLASSES:
+        found = root.xpath(f"(//div[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')])[1]")
+        if found:
+            return found[0]
+    return None
+
+
+def _lxml_text(page: str) -> Optional[str]:
+    if not page.strip():
+        return None
+    try:
+        root = lxml_html.fromstring(page)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        root = lxml_html.fromstring(page.encode("utf-8"))
+    div = _lxml_find_div(root)
+    if div is None:
+        return None
+
+    strings, paragraphs = [], []
+    _add(strings, div.text)
+    for child in div:
+        if not _lxml_skipped(child) and child.tag in PARAGRAPH_TAGS:
+            para = []
+            _lxml_collect(child, para)
+            strings.extend(para)
+            paragraphs.append(' '.join(para))
+        else:
+            _lxml_collect(child, strings)
+        _add(strings, child.tail)
+    return compose_text(strings, paragraphs)
+
+
+# --- selectolax ---
+
+def _selectolax_text(page: str) -> Optional[str]:
+    tree = LexborHTMLParser(page)
+    div = None
+    for css_class in JUDGMENT_DIV_CLASSES:
+        div = tree.css_first(f"div.{css_class}")
+        if div is not None:
+            break
+    if div is None:
+        return None
+
+    for node in div.css("a.cite_tag, " + ", ".join(sorted(NON_TEXT_TAGS))):
+        node.decompose()
+
+    strings, paragraphs = [], []
+    for child in div.iter(include_text=True):
+        if child.tag == "-text":
+            _add(strings, child.text_content)
+            continue
+        para = []
+        for node in child.traverse(include_text=True):
+            if node.tag == "-text":
+                _add(para, node.text_content)
+        strings.extend(para)
+        if child.tag in PARAGRAPH_TAGS:
+            paragraphs.append(' '.join(para))
+    return compose_text(strings, paragraphs)
@@ -0,0 +1,130 @@
+"""
+Persistent download journal (SQLite) for IndianKanoonDownloader.
+
+Records every fetched search page with the links it returned, and every
+discovered document with its status, retry count and the ETag /
+Last-Modified validators of the last response. A restarted downloader
+skips pages and documents the journal already has, and document ids are
+unique across queries, so the same judgment is fetched once however many
+queries find it.
+
+One connection is shared by the worker threads and serialized with a lock;
+every write is committed immediately, so a crash loses at most the request
+in flight.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Document status values
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"     # fetched, but no judgment text (or too short) to save
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    query TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    links TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (query, page)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    query TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    etag TEXT,
+    last_modified TEXT,
+    path TEXT,
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queries (
+    query TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    completed_at TEXT
+);
+"""
+
+
+class DownloadJournal:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- search pages ---
+
+    def page_links(self, query: str, page: int) -> Optional[List[str]]:
+        """Links recorded for a search page, or None if it was never fetched."""
+        rows = self._execute("SELECT links FROM pages WHERE query = ? AND page = ?", (query, page))
+        return json.loads(rows[0]["links"]) if rows else None
+
+    def record_page(self, query: str, page: int, links: List[str]):
+        self._execute(
+            "INSERT OR REPLACE INTO pages (query, page, links, fetched_at) VALUES (?, ?, ?, ?)",
+            (query, page, json.dumps(links), _now())
+        )
+
+    # --- documents ---
+
+    def add_document(self, doc_id: str, link: str, query: str, category: str) -> bool:
+        """Register a discovered document; False if another query already found it."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO documents (doc_id, link, query, category, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (doc_id, link, query, category, PENDING, _now())
+            )
+            return cursor.rowcount == 1
+
+    def document(self, doc_id: str) -> Optional[Dict]:
+        rows = self._execute("SELECT * FROM documents WHERE doc_id = ?", (doc_id,))
+        return dict(rows[0]) if rows else None
+
+    def mark_document(self, doc_id: str, status: str, path: str = None, etag: str = None,
+                      last_modified: str = None, error: str = None):
+        """Record the outcome of a fetch; failures increment the retry count."""
+        self._execute(
+            "UPDATE documents SET status = ?, path = COALESCE(?, path), etag = COALESCE(?, etag), "
+            "last_modified = COALESCE(?, last_modified), error = ?, "
+            "retries = retries + (CASE WHEN ? = ? THEN 1 ELSE 0 END), updated_at = ? WHERE doc_id = ?",
+            (status, path, etag, last_modified, error, status, FAILED, _now(), doc_id)
+        )
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self._execute("SELECT status, COUNT(*) AS n FROM documents GROUP BY status")
+        return {row["status"]: row["n"] for row in rows}
+
+    # --- queries ---
+
+    def is_query_complete(self, query: str) -> bool:
+        rows = self._execute("SELECT completed_at FROM queries WHERE query = ?", (query,))
+        return bool(rows and rows[0]["completed_at"])
+
+    def complete_query(self, query: str, category: str):
+        self._execute(
+            "INSERT OR REPLACE INTO queries (query, category, completed_at) VALUES (?, ?, ?)",
+            (query, category, _now())
+        )
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
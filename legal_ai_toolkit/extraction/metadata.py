@@ -1,29 +1,45 @@
 #metadata.py
 import re
-
-COURT_PATTERNS = [
-    r"SUPREME COURT OF INDIA",
-    r"HIGH COURT OF JUDICATURE AT ([A-Z ]+)",
-    r"HIGH COURT OF ([A-Z ]+)",
-    r"([A-Z ]+) HIGH COURT",
-    r"HIGH COURT AT ([A-Z ]+)",
-    r"HIGH COURT - ([A-Z ]+)",
-    r"IN THE COURT OF ([A-Z ]+)",
-    r"DISTRICT COURT",
-    r"SESSIONS COURT",
-    r"BEFORE THE ([A-Z ]+) HIGH COURT",
-    r"IN THE ([A-Z ]+) HIGH COURT",
-    r"CENTRAL ADMINISTRATIVE TRIBUNAL",
-    r"STATE ADMINISTRATIVE TRIBUNAL",
-    r"CONSUMER DISPUTES REDRESSAL COMMISSION",
-    r"ARBITRATION TRIBUNAL",
-    r"ARMED FORCES TRIBUNAL",
-    r"NATIONAL GREEN TRIBUNAL",
-    r"INDUSTRIAL COURT",
-    r"LABOUR COURT",
-    r"FAMILY COURT"
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
+
+# Header window. Indian Kanoon text often has few or no newlines, so the first
+# 100 "lines" can be the whole judgment; cap the window by characters as well.
+HEADER_MAX_LINES = 100
+HEADER_MAX_CHARS = 10000
+
+# Upper bound for free-text name runs (court names, party names). Unbounded
+# runs followed by a required suffix backtrack quadratically on long headers.
+MAX_NAME_CHARS = 80
+MAX_PARTY_CHARS = 150
+
+# Court rules in priority order: (pattern, anchor). A pattern is only tried when
+# its anchor literal occurs in the header; all anchors are found in one pass.
+COURT_RULES = [
+    (r"SUPREME COURT OF INDIA", "SUPREME COURT OF INDIA"),
+    (r"HIGH COURT OF JUDICATURE AT ([A-Z ]+)", "HIGH COURT"),
+    (r"HIGH COURT OF ([A-Z ]+)", "HIGH COURT"),
+    (rf"([A-Z ]{{1,{MAX_NAME_CHARS}}}) HIGH COURT", "HIGH COURT"),
+    (r"HIGH COURT AT ([A-Z ]+)", "HIGH COURT"),
+    (r"HIGH COURT - ([A-Z ]+)", "HIGH COURT"),
+    (r"IN THE COURT OF ([A-Z ]+)", "IN THE COURT OF"),
+    (r"DISTRICT COURT", "DISTRICT COURT"),
+    (r"SESSIONS COURT", "SESSIONS COURT"),
+    (rf"BEFORE THE ([A-Z ]{{1,{MAX_NAME_CHARS}}}) HIGH COURT", "HIGH COURT"),
+    (rf"IN THE ([A-Z ]{{1,{MAX_NAME_CHARS}}}) HIGH COURT", "HIGH COURT"),
+    (r"CENTRAL ADMINISTRATIVE TRIBUNAL", "CENTRAL ADMINISTRATIVE TRIBUNAL"),
+    (r"STATE ADMINISTRATIVE TRIBUNAL", "STATE ADMINISTRATIVE TRIBUNAL"),
+    (r"CONSUMER DISPUTES REDRESSAL COMMISSION", "CONSUMER DISPUTES REDRESSAL COMMISSION"),
+    (r"ARBITRATION TRIBUNAL", "ARBITRATION TRIBUNAL"),
+    (r"ARMED FORCES TRIBUNAL", "ARMED FORCES TRIBUNAL"),
+    (r"NATIONAL GREEN TRIBUNAL", "NATIONAL GREEN TRIBUNAL"),
+    (r"INDUSTRIAL COURT", "INDUSTRIAL COURT"),
+    (r"LABOUR COURT", "LABOUR COURT"),
+    (r"FAMILY COURT", "FAMILY COURT"),
 ]
 
+COURT_PATTERNS = [pattern for pattern, _ in COURT_RULES]
+
 DATE_PATTERNS = [
     r"on\s+([0-9]{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+[0-9]{4})",
     r"Date of Decision[:\s]+([0-9]{1,2}[./-][0-9]{1,2}[./-][0-9]{2,4})",
@@ -44,7 +60,7 @@ CASE_NO_PATTERNS = [
 
 # Enhanced patterns for parties and bench
 PETITIONER_RESPONDENT_PATTERNS = [
-    r'([A-Z][A-Za-z\s.&,]+?)\s+(?:v[s]?\.?|versus)\s+([A-Z][A-Za-z\s.&,]+?)(?:\s+CASE|$|\n)',
+    rf'([A-Z][A-Za-z\s.&,]{{0,{MAX_PARTY_CHARS}}}?)\s+(?:v[s]?\.?|versus)\s+([A-Z][A-Za-z\s.&,]{{0,{MAX_PARTY_CHARS}}}?)(?:\s+CASE|$|\n)',
     r'Petitioner\s*[:\-]\s*([A-Z][A-Za-z\s.&,]+)',
     r'Appellant\s*[:\-]\s*([A-Z][A-Za-z\s.&,]+)',
 ]
@@ -60,9 +76,44 @@ BENCH_PATTERNS = [
     r'BENCH\s*:\s*(.+?)(?:\n\n|$)',
 ]
 
+# Rules are registered once at import; extract_header_metadata runs once per judgment.
+_COURT_RULES = [(register(f"metadata.court.{i}", pattern), anchor) for i, (pattern, anchor) in enumerate(COURT_RULES)]
+_COURT_ANCHOR_RULE = register("metadata.court_anchor", "|".join(re.escape(a) for a in dict.fromkeys(a for _, a in COURT_RULES)))
+_CASE_NO_RULES = [register(f"metadata.case_number.{i}", p, re.I) for i, p in enumerate(CASE_NO_PATTERNS)]
+_DATE_RULES = [register(f"metadata.date.{i}", p, re.I) for i, p in enumerate(DATE_PATTERNS)]
+# (rule, anchor rule): every "X v. Y" match contains the separator, so the
+# expensive party scan is skipped on headers without one.
+_PARTY_SEPARATOR_RULE = register("metadata.party_separator", r'\s(?:v[s]?\.?|versus)\s')
+_PARTY_RULES = [
+    (register("metadata.party.0", PETITIONER_RESPONDENT_PATTERNS[0]), _PARTY_SEPARATOR_RULE),
+    (register("metadata.party.1", PETITIONER_RESPONDENT_PATTERNS[1]), None),
+    (register("metadata.party.2", PETITIONER_RESPONDENT_PATTERNS[2]), None),
+]
+_RESPONDENT_RULES = [register(f"metadata.respondent.{i}", p) for i, p in enumerate(RESPONDENT_PATTERNS)]
+_BENCH_RULES = [register(f"metadata.bench.{i}", p, re.I) for i, p in enumerate(BENCH_PATTERNS)]
+_PARTY_SPLIT_RULE = register("metadata.party_split", r'\s+(?:v[s]?\.?|versus)\s+', re.I)
+
+def extract_header(text: str) -> str:
+    """Return the uppercased header window scanned for metadata."""
+    head = text[:HEADER_MAX_CHARS]
+    lines = head.split("\n", HEADER_MAX_LINES)[:HEADER_MAX_LINES]
+    return " ".join(lines).upper()
+
+
+def _court_level(court: str) -> str:
+    court_upper = court.upper()
+    if "SUPREME" in court_upper:
+        return "SC"
+    if "HIGH" in court_upper:
+        return "HC"
+    if any(x in court_upper for x in ["TRIBUNAL", "COMMISSION", "COURT"]):
+        return "TRIBUNAL/LOWER"
+    return "UNKNOWN"
+
+
+@profiled("metadata.extract_header_metadata")
 def extract_header_metadata(text: str):
-    lines = text.split("\n")[:100]  # Increased search range
-    header = " ".join(lines).upper()
+    header = extract_header(text)
 
     metadata = {
         "court": "UNKNOWN",
@@ -72,41 +123,41 @@ def extract_header_metadata(text: str):
         "jurisdiction": "India"
     }
 
-    # Extract court
-    for pattern in COURT_PATTERNS:
-        match = re.search(pattern, header)
-        if match:
-            metadata["court"] = match.group(0).strip().title()
-            court_upper = metadata["court"].upper()
-            if "SUPREME" in court_upper:
-                metadata["court_level"] = "SC"
-            elif "HIGH" in court_upper:
-                metadata["court_level"] = "HC"
-            elif any(x in court_upper for x in ["TRIBUNAL", "COMMISSION", "COURT"]):
-                metadata["court_level"] = "TRIBUNAL/LOWER"
-            break
+    # Extract court (only rules whose anchor occurs in the header are tried)
+    anchors = set(_COURT_ANCHOR_RULE.findall(header))
+    if anchors:
+        for rule, anchor in _COURT_RULES:
+            if anchor not in anchors:
+                continue
+            match = rule.search(header)
+            if match:
+                metadata["court"] = match.group(0).strip().title()
+                metadata["court_level"] = _court_level(metadata["court"])
+                break
 
     # Extract case number
-    for pattern in CASE_NO_PATTERNS:
-        match = re.search(pattern, header, re.I)
+    for rule in _CASE_NO_RULES:
+        match = rule.search(header)
         if match:
             metadata["case_number"] = match.group(0).strip()
             break
 
     # Extract decision date
-    for pattern in DATE_PATTERNS:
-        match = re.search(pattern, header, re.I)
+    for rule in _DATE_RULES:
+        match = rule.search(header)
         if match:
             metadata["decision_date"] = match.group(1).strip()
             break
 
     # Extract petitioner/respondent
-    for pattern in PETITIONER_RESPONDENT_PATTERNS:
-        match = re.search(pattern, header)
+    for rule, anchor in _PARTY_RULES:
+        if anchor is not None and not anchor.search(header):
+            continue
+        match = rule.search(header)
         if match:
             if 'v' in match.group(0).lower() or 'versus' in match.group(0).lower():
                 # Pattern with "v." or "versus"
-                parts = re.split(r'\s+(?:v[s]?\.?|versus)\s+', match.group(0), flags=re.I)
+                parts = _PARTY_SPLIT_RULE.split(match.group(0))
                 if len(parts) >= 2:
                     metadata["petitioner"] = parts[0].strip()
                     metadata["respondent"] = parts[1].strip()
@@ -117,18 +168,17 @@ def extract_header_metadata(text: str):
 
     # If petitioner found but not respondent, try to find respondent separately
     if "petitioner" in metadata and "respondent" not in metadata:
-        for pattern in RESPONDENT_PATTERNS:
-            match = re.search(pattern, header)
+        for rule in _RESPONDENT_RULES:
+            match = rule.search(header)
             if match:
                 metadata["respondent"] = match.group(1).strip()
                 break
 
     # Extract bench composition
-    for pattern in BENCH_PATTERNS:
-        match = re.search(pattern, header, re.I)
+    for rule in _BENCH_RULES:
+        match = rule.search(header)
         if match:
             metadata["bench"] = match.group(1).strip()
             break
 
     return metadata
-
@@ -17,6 +17,13 @@ FEATURES:
 """
 import re
 from typing import List, Dict
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
+
+# Longest section list scanned between "Section(s)" and the act name. Unbounded,
+# the lazy run re-scans up to the next full stop from every "Section" and goes
+# quadratic on OCR text without full stops.
+MAX_SECTION_LIST_CHARS = 200
 
 
 class SectionExtractor:
@@ -72,7 +79,35 @@ class SectionExtractor:
         r'\d+'  # Simple numbers
     ]
 
+    # Compiled rules per act: [(list rule, "under Section" rule), ...]
+    # "Section(s) <numbers> <Act>" captures everything between "Section(s)" and the act name
+    ACT_RULES = {
+        act_name: [
+            (
+                register(f"sections.{act_name}.{i}.list",
+                         rf'Sections?\s+([^.]{{1,{MAX_SECTION_LIST_CHARS}}}?)\s+{act_pattern}', re.IGNORECASE, version="2"),
+                register(f"sections.{act_name}.{i}.under",
+                         rf'under\s+Sections?\s+([^.]{{1,{MAX_SECTION_LIST_CHARS}}}?)\s+{act_pattern}', re.IGNORECASE, version="2"),
+            )
+            for i, act_pattern in enumerate(act_patterns)
+        ]
+        for act_name, act_patterns in ACT_PATTERNS.items()
+    }
+
+    # One scan per act for its name; the section rules of acts that are never
+    # mentioned are skipped.
+    ACT_ANCHOR_RULES = {
+        act_name: register(f"sections.{act_name}.anchor", r'\s(?:' + "|".join(act_patterns) + ')', re.IGNORECASE)
+        for act_name, act_patterns in ACT_PATTERNS.items()
+    }
+
+    SEPARATOR_RULE = register("sections.parse.separator", r'\s*,\s*|\s+and\s+|\s+&\s+', re.IGNORECASE)
+    TRAILING_WORDS_RULE = register("sections.parse.trailing_words", r'\s+(of|the|under|in|to|for|with|by|from|as|at)\b.*$', re.IGNORECASE)
+    TRAILING_CHARS_RULE = register("sections.parse.trailing_chars", r'[^0-9A-Za-z\-/()]+$')
+    VALID_SECTION_RULE = register("sections.parse.valid", r'^\d+[A-Za-z]?(?:-[A-Z])?(?:\(\d+\))?(?:\([a-z]\))?(?:/\d+)?$')
+
     @classmethod
+    @profiled("sections.extract")
     def extract(cls, text: str) -> List[Dict]:
         """
         Extract all statutory section references from text.
@@ -87,16 +122,14 @@ class SectionExtractor:
         seen = set()  # For deduplication
 
         # Extract sections for each act
-        for act_name, act_patterns in cls.ACT_PATTERNS.items():
-            for act_pattern in act_patterns:
+        for act_name, act_rules in cls.ACT_RULES.items():
+            if not cls.ACT_ANCHOR_RULES[act_name].search(text):
+                continue
+            for list_rule, under_rule in act_rules:
                 # Pattern: "Section(s) <numbers> <Act>"
                 # Examples: "Sections 498-A, 304-B I.P.C."
                 #           "Section 313 Cr.P.C."
-
-                # Multiple sections pattern - capture everything between "Section(s)" and the act name
-                pattern = rf'Sections?\s+([^.]+?)\s+{act_pattern}'
-
-                for match in re.finditer(pattern, text, re.IGNORECASE):
+                for match in list_rule.finditer(text):
                     section_text = match.group(1).strip()
                     act_ref = match.group(0)
 
@@ -122,9 +155,7 @@ class SectionExtractor:
                         seen.add(section_key)
 
                 # Also catch standalone "under Section X" patterns
-                pattern2 = rf'under\s+Sections?\s+([^.]+?)\s+{act_pattern}'
-
-                for match in re.finditer(pattern2, text, re.IGNORECASE):
+                for match in under_rule.finditer(text):
                     section_text = match.group(1).strip()
                     individual_sections = cls._parse_section_list(section_text)
 
@@ -160,8 +191,7 @@ class SectionExtractor:
             List of individual section numbers
         """
         # Split by comma, 'and', '&'
-        separators = r'\s*,\s*|\s+and\s+|\s+&\s+'
-        parts = re.split(separators, section_text, flags=re.IGNORECASE)
+        parts = SectionExtractor.SEPARATOR_RULE.split(section_text)
         
         sections = []
         for part in parts:
@@ -169,14 +199,14 @@ class SectionExtractor:
             section = part.strip()
             
             # Remove common trailing words that shouldn't be part of the section number
-            section = re.sub(r'\s+(of|the|under|in|to|for|with|by|from|as|at)\b.*$', '', section, flags=re.IGNORECASE)
+            section = SectionExtractor.TRAILING_WORDS_RULE.sub('', section)
             
             # Remove any non-section characters at the end
-            section = re.sub(r'[^0-9A-Za-z\-/()]+$', '', section)
+            section = SectionExtractor.TRAILING_CHARS_RULE.sub('', section)
             
             # Only keep if it looks like a valid section number
             # Valid formats: 498-A, 304B, 313, 302(1), 376(2)(n), 3/4
-            if re.match(r'^\d+[A-Za-z]?(?:-[A-Z])?(?:\(\d+\))?(?:\([a-z]\))?(?:/\d+)?$', section):
+            if SectionExtractor.VALID_SECTION_RULE.match(section):
                 sections.append(section)
         
         return sections
@@ -12,6 +12,8 @@ from datetime import datetime
 from typing import List, Dict, Optional
 from legal_ai_toolkit.extraction.sections import SectionExtractor
 from legal_ai_toolkit.utils.mappings import IPCBNSTransitionDB
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
 
 
 class TransitionExtractor:
@@ -38,7 +40,13 @@ class TransitionExtractor:
         r'BNS\s+(\d+[A-Z\-]*)\s*(?:\(|,|;|\.)\s*(?:earlier|formerly|previously)\s+(?:IPC|Indian Penal Code)\s+(\d+[A-Z\-]*)',
     ]
 
+    EXPLICIT_TRANSITION_RULES = [
+        register(f"transitions.explicit.{i}", pattern, re.IGNORECASE)
+        for i, pattern in enumerate(EXPLICIT_TRANSITION_PATTERNS)
+    ]
+
     @classmethod
+    @profiled("transitions.extract")
     def extract(cls, text: str, judgment_date: Optional[str] = None) -> List[Dict]:
         """
         Extract IPC→BNS transitions from judgment text.
@@ -89,8 +97,8 @@ class TransitionExtractor:
         """Extract explicitly mentioned IPC→BNS transition pairs."""
         transitions = []
 
-        for pattern in cls.EXPLICIT_TRANSITION_PATTERNS:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for rule in cls.EXPLICIT_TRANSITION_RULES:
+            for match in rule.finditer(text):
                 ipc = match.group(1).upper()
                 bns = match.group(2).upper() if len(match.groups()) > 1 else None
 
@@ -1,12 +1,47 @@
-from .runner import BaseStep
-from .classification import ClassificationStep
-from .id_regeneration import IDRegenerationStep
-from .transitions import TransitionStep
-from .issues import IssueExtractionStep
-from .citations import CitationExtractionStep
-from .consolidation import ConsolidationStep
-from .metadata import MetadataExtractionStep
-from .orchestrator import PipelineOrchestrator
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "BaseStep": ".runner",
+    "ClassificationStep": ".classification",
+    "IDRegenerationStep": ".id_regeneration",
+    "TransitionStep": ".transitions",
+    "IssueExtractionStep": ".issues",
+    "CitationExtractionStep": ".citations",
+    "ConsolidationStep": ".consolidation",
+    "NearDuplicateStep": ".dedup",
+    "MetadataExtractionStep": ".metadata",
+    "PipelineOrchestrator": ".orchestrator",
+    "DAGScheduler": ".scheduler",
+    "StepNode": ".scheduler",
+    "StreamingRunner": ".streaming",
+    "LocalExecutor": ".executors",
+    "SharedFSExecutor": ".executors",
+    "run_local_nodes": ".executors",
+    "FileStore": ".storage",
+    "ShardedJSONLStore": ".storage",
+    "open_store": ".storage",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .runner import BaseStep
+    from .classification import ClassificationStep
+    from .id_regeneration import IDRegenerationStep
+    from .transitions import TransitionStep
+    from .issues import IssueExtractionStep
+    from .citations import CitationExtractionStep
+    from .consolidation import ConsolidationStep
+    from .dedup import NearDuplicateStep
+    from .metadata import MetadataExtractionStep
+    from .orchestrator import PipelineOrchestrator
+    from .scheduler import DAGScheduler, StepNode
+    from .streaming import StreamingRunner
+    from .executors import LocalExecutor, SharedFSExecutor, run_local_nodes
+    from .storage import FileStore, ShardedJSONLStore, open_store
 
 __all__ = [
     "BaseStep",
@@ -16,6 +51,16 @@ __all__ = [
     "IssueExtractionStep",
     "CitationExtractionStep",
     "ConsolidationStep",
+    "NearDuplicateStep",
     "MetadataExtractionStep",
-    "PipelineOrchestrator"
+    "PipelineOrchestrator",
+    "DAGScheduler",
+    "StepNode",
+    "StreamingRunner",
+    "LocalExecutor",
+    "SharedFSExecutor",
+    "run_local_nodes",
+    "FileStore",
+    "ShardedJSONLStore",
+    "open_store"
 ]
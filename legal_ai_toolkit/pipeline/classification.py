@@ -1,5 +1,7 @@
 import re
 from .runner import BaseStep
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
 
 CRIMINAL_STATUTES = [
     "IPC", "CrPC", "BNS", "BNSS", "IEA", "Indian Penal Code", "Code of Criminal Procedure",
@@ -19,24 +21,28 @@ CRIMINAL_KEYWORDS = ["bail", "fir", "accused", "offence", "custody", "conviction
 CIVIL_KEYWORDS = ["suit", "decree", "injunction", "arbitration", "plaintiff", "defendant", "specific performance"]
 SERVICE_KEYWORDS = ["seniority", "promotion", "DPC", "regularization", "suspension", "departmental inquiry", "pension", "retiral", "back wages", "reinstatement", "daily wage"]
 
+WRIT_PETITION_RULE = register("classification.writ_petition", r"\b(C\.?W\.?P\.?|Writ Petition)\b", re.I)
+
+def _term_rules(group, terms):
+    return [(term, register(f"classification.{group}.{term}", rf"\b{term}\b", re.I)) for term in terms]
+
+# Compiled once at import: domain -> [(signal term, rule), ...]
+SIGNAL_RULES = {
+    "criminal": _term_rules("criminal_statute", CRIMINAL_STATUTES) + _term_rules("criminal_keyword", CRIMINAL_KEYWORDS),
+    "civil": _term_rules("civil_statute", CIVIL_STATUTES) + _term_rules("civil_keyword", CIVIL_KEYWORDS),
+    "service": _term_rules("service_statute", SERVICE_STATUTES) + _term_rules("service_keyword", SERVICE_KEYWORDS),
+}
+
+@profiled("classification.detect_signals", matches=lambda signals: sum(map(len, signals.values())))
 def detect_signals(text):
     signals = {"criminal": [], "civil": [], "service": []}
-    if re.search(r"\b(C\.?W\.?P\.?|Writ Petition)\b", text, re.I):
+    if WRIT_PETITION_RULE.search(text):
         signals["service"].append("Writ Petition")
 
-    for s in CRIMINAL_STATUTES:
-        if re.search(rf"\b{s}\b", text, re.I): signals["criminal"].append(s)
-    for s in CIVIL_STATUTES:
-        if re.search(rf"\b{s}\b", text, re.I): signals["civil"].append(s)
-    for s in SERVICE_STATUTES:
-        if re.search(rf"\b{s}\b", text, re.I): signals["service"].append(s)
-    for k in CRIMINAL_KEYWORDS:
-        if re.search(rf"\b{k}\b", text, re.I): signals["criminal"].append(k)
-    for k in CIVIL_KEYWORDS:
-        if re.search(rf"\b{k}\b", text, re.I): signals["civil"].append(k)
-    for k in SERVICE_KEYWORDS:
-        if re.search(rf"\b{k}\b", text, re.I): signals["service"].append(k)
-    
+    for domain, rules in SIGNAL_RULES.items():
+        for term, rule in rules:
+            if rule.search(text): signals[domain].append(term)
+
     for k in signals: signals[k] = list(set(signals[k]))
     return signals
 
@@ -37,6 +37,7 @@ class ConsolidationStep(BaseStep):
                 "pipeline_version": "2.0",
                 "processing_steps": [
                     "ingestion",
+                    "near_duplicate_detection",
                     "metadata_extraction",
                     "issue_extraction",
                     "classification",
@@ -136,6 +137,18 @@ class ConsolidationStep(BaseStep):
         if 'classification' in data:
             unified["classification"] = data['classification']
 
+        # Keep the raw content hash and ID audit trail for downstream caches/dedup
+        if 'content_hash' in data:
+            unified["provenance"]["content_hash"] = data['content_hash']
+        if 'id_history' in data.get('provenance', {}):
+            unified["provenance"]["id_history"] = data['provenance']['id_history']
+        if 'aliases' in data.get('provenance', {}):
+            unified["provenance"]["aliases"] = data['provenance']['aliases']
+
+        # Carry forward warnings from earlier steps (e.g. time budget exceeded)
+        if 'processing_warnings' in data:
+            unified["processing_warnings"] = data['processing_warnings']
+
         return unified
 
     def run(self):
@@ -145,8 +158,9 @@ class ConsolidationStep(BaseStep):
         print(f"  Output: {self.output_dir}")
         print()
 
-        super().run()
+        succeeded = super().run()
 
         print(f"[Consolidation] ✅ Created unified JSON files in {self.output_dir}")
+        return succeeded
 
 
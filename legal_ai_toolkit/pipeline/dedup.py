@@ -0,0 +1,138 @@
+"""
+Near-Duplicate Detection Step
+
+The same judgment often arrives more than once: under several source doc
+ids, or as reported and unreported versions with slightly different text.
+Byte-identical copies are already dropped at ingestion; this step finds the
+near-identical ones with MinHash + LSH, keeps one canonical record per group
+and records the others as aliases in its provenance. Later steps never see
+the non-canonical copies: they are not written, and a copy an earlier run
+wrote to a file-per-judgment output (before its near-duplicate arrived) is
+deleted. Sharded output is rewritten on every run.
+
+Runs right after ingestion, so aliases carry TEMP_ ids and content hashes.
+"""
+
+from datetime import datetime
+from .runner import BaseStep, SKIP_RECORD
+from legal_ai_toolkit.pipeline.storage import FileStore, build_record_path, open_store
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.minhash import candidate_groups, signature, similarity
+
+# Estimated Jaccard similarity (word 5-gram shingles) at which two judgments are the same document
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+
+class NearDuplicateStep(BaseStep):
+    """Drop near-duplicate judgments, keeping the longest copy of each as canonical."""
+
+    def __init__(self, input_dir, output_dir, threshold=NEAR_DUPLICATE_THRESHOLD, **kwargs):
+        super().__init__(input_dir, output_dir, **kwargs)
+        self.threshold = threshold
+        self.canonical_of = {}  # non-canonical judgment_id -> canonical judgment_id
+        self.aliases = {}       # canonical judgment_id -> alias entries
+
+    def run(self):
+        if self.input_dir.exists():
+            self._find_duplicates()
+        return super().run()
+
+    def run_slow_lane(self):
+        # Quarantined records are judged against the groups of the whole input
+        if self.input_dir.exists():
+            self._find_duplicates()
+        return super().run_slow_lane()
+
+    def _find_duplicates(self):
+        """First pass: sign every judgment and group the near-duplicates."""
+        signatures = {}
+        lengths = {}
+        content_hashes = {}
+        for data in open_store(self.input_dir).iter_judgments():
+            judgment_id = data.get("judgment_id")
+            if not judgment_id or "text" not in data:
+                continue
+            sig = signature(data["text"])
+            if sig is None:
+                continue
+            signatures[judgment_id] = sig
+            lengths[judgment_id] = len(data["text"])
+            content_hashes[judgment_id] = data.get("content_hash")
+
+        parent = {}
+
+        def find(key):
+            root = key
+            while parent.get(root, root) != root:
+                root = parent[root]
+            parent[key] = root
+            return root
+
+        # Each LSH bucket is verified against its first member only, keeping this linear
+        for members in candidate_groups(signatures):
+            first = members[0]
+            for other in members[1:]:
+                a, b = find(first), find(other)
+                if a != b and similarity(signatures[first], signatures[other]) >= self.threshold:
+                    parent[b] = a
+
+        groups = {}
+        for judgment_id in parent:
+            groups.setdefault(find(judgment_id), []).append(judgment_id)
+
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            # The longest text is usually the reported version (headnotes, full bench)
+            canonical = min(members, key=lambda k: (-lengths[k], k))
+            self.aliases[canonical] = []
+            for judgment_id in sorted(members):
+                if judgment_id == canonical:
+                    continue
+                self.canonical_of[judgment_id] = canonical
+                self.aliases[canonical].append({
+                    "judgment_id": judgment_id,
+                    "content_hash": content_hashes[judgment_id],
+                    "similarity": round(similarity(signatures[canonical], signatures[judgment_id]), 3)
+                })
+
+        print(f"[DEDUP] Signed {len(signatures)} judgments: {len(self.canonical_of)} near-duplicate(s) "
+              f"of {len(self.aliases)} canonical judgment(s)")
+        if self.aliases:
+            self._write_duplicates_report()
+        self._remove_stale_copies()
+
+    def _remove_stale_copies(self):
+        """Delete non-canonical records that an earlier run left in the output directory."""
+        if not isinstance(self.output_store, FileStore):
+            return
+        removed = 0
+        for judgment_id in self.canonical_of:
+            path = build_record_path(self.output_dir, judgment_id, judgment_id)
+            if path.exists():
+                path.unlink()
+                removed += 1
+        if removed:
+            print(f"[DEDUP] Removed {removed} earlier copy(ies) that are no longer canonical from {self.output_dir}")
+
+    def process_item(self, data):
+        judgment_id = data.get("judgment_id")
+        if judgment_id in self.canonical_of:
+            return SKIP_RECORD
+        if judgment_id in self.aliases:
+            data.setdefault("provenance", {})["aliases"] = self.aliases[judgment_id]
+        return data
+
+    def _write_duplicates_report(self):
+        report_path = self.state_dir / f"duplicates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "step": self.__class__.__name__,
+            "threshold": self.threshold,
+            "groups": [
+                {"canonical": canonical, "aliases": aliases}
+                for canonical, aliases in sorted(self.aliases.items())
+            ]
+        }
+        codec.dump(report, report_path, pretty=True)
+        print(f"📝 Near-duplicate report written to: {report_path}")
@@ -0,0 +1,333 @@
+"""
+Pluggable execution backends for the full pipeline.
+
+``LocalExecutor`` is the default: the DAG scheduler runs the stale steps on
+this machine (``--jobs`` independent steps at a time, ``--workers`` inside a
+step). ``SharedFSExecutor`` spreads one run over several nodes that share
+the pipeline directories (NFS or any cluster filesystem with atomic
+``O_EXCL`` create and rename, and clocks that agree to well within the
+lease time); there is no broker, the coordination directory is the only
+shared state:
+
+    <coordination dir>/<run id>/plan.json      phases and their tasks
+    <coordination dir>/<run id>/leases/<task>  held by one node, kept fresh by a heartbeat
+    <coordination dir>/<run id>/done/<task>    result of a finished (or given up) task
+
+The steps run in waves of the DAG. Per-document steps are split into
+``shards`` tasks, each processing the input records of one partition
+(``BaseStep(partition=(k, n))``; records are assigned by a hash of their
+name) and writing into the shared step directory. Steps that need the whole
+corpus stay single tasks: ingestion and near-duplicate grouping,
+ID regeneration (collisions are resolved in input order) and the reduce,
+similarity and clustering. Every node runs the same loop: claim a free task
+of the current wave, run it, mark it done; when the wave has no free task
+left, wait for the others to finish theirs, then move to the next wave.
+
+A lease whose heartbeat stopped for ``lease_seconds`` (a crashed node) is
+taken over, and the task is rerun with ``resume=True``, so records the
+crashed node finished are skipped (see pipeline/manifest.py). Outputs are
+written atomically and per record, so a task run twice (a node that was
+only slow) writes the same files. A task failing ``max_attempts`` times
+fails the run. The node finishing the last wave records the scheduler
+state and writes the run report. A run id is used for one run only: once
+its finalize task is done, starting nodes with the same id is an error
+(the plan and done markers would make them skip every task), so each run
+gets a new id.
+
+For testing on one machine, ``run_local_nodes`` starts several nodes as
+processes (``pipeline --executor shared-fs --local-nodes 3``).
+"""
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from legal_ai_toolkit.utils import codec
+
+from .scheduler import fingerprint
+
+# Per-record steps that can be split into shards (the others need every record at once)
+SHARDABLE_STEPS = ("metadata", "issues", "classify", "transitions", "citations", "consolidate")
+
+# Default coordination directory, inside the (shared) interim dir
+COORDINATION_DIR = ".cluster"
+DEFAULT_SHARDS = 8
+# Seconds without a heartbeat after which a lease is considered abandoned
+DEFAULT_LEASE_SECONDS = 300.0
+# Seconds between checks while waiting for other nodes
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+FINALIZE_TASK = "finalize"
+
+
+class LocalExecutor:
+    """Run the stale steps on this machine (see PipelineOrchestrator.run_local)."""
+
+    def __init__(self, jobs: int = 1, force: bool = False):
+        self.jobs = jobs
+        self.force = force
+
+    def run(self, orchestrator, workers: int = 1) -> Dict[str, str]:
+        return orchestrator.run_local(workers=workers, jobs=self.jobs, force=self.force)
+
+
+class LeaseDirectory:
+    """Task leases and completion markers in a shared directory."""
+
+    def __init__(self, root, node_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.root = Path(root)
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        for name in ("leases", "done", "attempts"):
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+
+    def _lease(self, task: str) -> Path:
+        return self.root / "leases" / task
+
+    def _done(self, task: str) -> Path:
+        return self.root / "done" / f"{task}.json"
+
+    def result(self, task: str) -> Optional[Dict]:
+        path = self._done(task)
+        return codec.load(path) if path.exists() else None
+
+    def claim(self, task: str) -> Optional[bool]:
+        """
+        Try to take the lease of an unfinished task.
+
+        Returns None if another node holds it (or it is done), else whether
+        the lease was taken over from a node that stopped heartbeating.
+        """
+        if self._done(task).exists():
+            return None
+        lease = self._lease(task)
+        taken_over = False
+        try:
+            age = time.time() - lease.stat().st_mtime
+        except FileNotFoundError:
+            age = None
+        if age is not None:
+            if age < self.lease_seconds:
+                return None
+            # Only one node can rename the stale lease away; it then competes for a fresh one
+            try:
+                os.replace(lease, lease.with_name(f"{task}.expired.{self.node_id}.{int(time.time())}"))
+            except FileNotFoundError:
+                return None
+            taken_over = True
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"node": self.node_id, "claimed_at": datetime.now().isoformat()}, f)
+        if self._done(task).exists():  # finished between the check and the claim
+            self.release(task)
+            return None
+        return taken_over
+
+    def holder(self, task: str) -> Optional[str]:
+        try:
+            return codec.load(self._lease(task))["node"]
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def heartbeat(self, task: str):
+        try:
+            os.utime(self._lease(task))
+        except FileNotFoundError:
+            pass
+
+    def release(self, task: str):
+        try:
+            os.unlink(self._lease(task))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, task: str, result: Dict):
+        codec.dump({"task": task, "node": self.node_id, "finished_at": datetime.now().isoformat(), **result},
+                   self._done(task), pretty=True)
+        self.release(task)
+
+    def record_attempt(self, task: str, error: str) -> int:
+        """Note a failed attempt; returns the number of attempts so far."""
+        attempts = self.root / "attempts" / task
+        attempts.mkdir(exist_ok=True)
+        codec.dump({"task": task, "node": self.node_id, "error": error},
+                   attempts / f"{self.node_id}.{int(time.time() * 1000)}.json", pretty=True)
+        return len(list(attempts.glob("*.json")))
+
+
+class _Heartbeat:
+    """Keeps a lease fresh while its task runs."""
+
+    def __init__(self, leases: LeaseDirectory, task: str):
+        self.leases = leases
+        self.task = task
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-{task}", daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(self.leases.lease_seconds / 3):
+            if self.leases.holder(self.task) != self.leases.node_id:
+                print(f"[WARNING] Lease on {self.task} was taken over; finishing anyway (outputs are idempotent)")
+                return
+            self.leases.heartbeat(self.task)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class SharedFSExecutor:
+    """Run one pipeline across nodes coordinated through a shared directory (see module docstring)."""
+
+    def __init__(self, coordination_dir, run_id: Optional[str] = None, node_id: Optional[str] = None,
+                 shards: int = DEFAULT_SHARDS, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        # Without a run id this starts a new run; nodes of one run must all be given the same id
+        self.run_id = run_id or datetime.now().strftime("run-%Y%m%d-%H%M%S")
+        self.run_dir = Path(coordination_dir) / self.run_id
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.shards = shards
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+
+    def plan(self, orchestrator) -> List[List[str]]:
+        """Waves of task names: every step runs after all the steps it reads from."""
+        if orchestrator.storage != "json":
+            raise ValueError("Shared-filesystem execution needs file-per-judgment interim storage (--storage json)")
+        scheduler = orchestrator.scheduler()
+        level = {}
+        for name in scheduler.order:
+            level[name] = 1 + max((level[dep] for dep in scheduler.deps[name]), default=-1)
+        waves = [[] for _ in range(max(level.values()) + 1)]
+        for name in scheduler.order:
+            if name in SHARDABLE_STEPS and self.shards > 1:
+                waves[level[name]].extend(f"{name}.{k}-of-{self.shards}" for k in range(self.shards))
+            else:
+                waves[level[name]].append(name)
+        waves.append([FINALIZE_TASK])
+        return waves
+
+    def _load_plan(self, orchestrator) -> List[List[str]]:
+        if (self.run_dir / "done" / f"{FINALIZE_TASK}.json").exists():
+            raise ValueError(f"Run {self.run_id} already finished ({self.run_dir}); start the next run with a new run id")
+        waves = self.plan(orchestrator)
+        path = self.run_dir / "plan.json"
+        if path.exists():
+            existing = codec.load(path)["waves"]
+            if existing != waves:
+                raise ValueError(f"{path} was planned with different steps or shards; use another run id")
+        else:
+            # Every node plans the same waves, so concurrent writes agree
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            codec.dump({"run_id": self.run_id, "shards": self.shards, "waves": waves}, path, pretty=True)
+        return waves
+
+    def run(self, orchestrator, workers: int = 1) -> Dict[str, str]:
+        """Work on the run until every wave is done (or a task failed); returns {task: status}."""
+        waves = self._load_plan(orchestrator)
+        leases = LeaseDirectory(self.run_dir, self.node_id, self.lease_seconds)
+        # One run id on every node, so the finalizing node's report gathers all their step metrics
+        orchestrator._start_metrics(run_id=self.run_id)
+        print(f"[NODE] {self.node_id}: run {self.run_id}, {sum(len(w) for w in waves)} tasks in {len(waves)} waves")
+
+        ran = []
+        for wave in waves:
+            while True:
+                results = {task: leases.result(task) for task in wave}
+                failed = [task for task, result in results.items() if result and result["status"] == "failed"]
+                if failed:
+                    print(f"\n[FAILED] {self.node_id}: task(s) failed: {', '.join(failed)}")
+                    return self._status(waves, leases)
+                pending = [task for task, result in results.items() if result is None]
+                if not pending:
+                    break
+                # Start at a node-specific offset so nodes do not all race for the same lease
+                offset = sum(map(ord, self.node_id)) % len(pending)
+                for task in pending[offset:] + pending[:offset]:
+                    taken_over = leases.claim(task)
+                    if taken_over is not None:
+                        self._run_task(orchestrator, leases, task, workers, taken_over)
+                        ran.append(task)
+                        break
+                else:
+                    time.sleep(self.poll_interval)
+
+        print(f"\n[OK] {self.node_id}: run {self.run_id} complete ({len(ran)} task(s) on this node)")
+        return self._status(waves, leases)
+
+    def _status(self, waves, leases) -> Dict[str, str]:
+        return {task: (leases.result(task) or {}).get("status", "pending") for wave in waves for task in wave}
+
+    def _run_task(self, orchestrator, leases: LeaseDirectory, task: str, workers: int, taken_over: bool):
+        step_name, _, partition = task.partition(".")
+        options = {}
+        if partition:
+            index, count = partition.split("-of-")
+            options["partition"] = (int(index), int(count))
+        if taken_over:
+            # Per-record steps skip what the stopped node finished; other steps ignore resume
+            print(f"[RESUMED] {self.node_id}: taking over {task} from a node that stopped")
+            options["resume"] = True
+
+        started = time.perf_counter()
+        print(f"\n--- {self.node_id}: {task} ---")
+        try:
+            with _Heartbeat(leases, task):
+                if step_name == FINALIZE_TASK:
+                    self._finalize(orchestrator)
+                else:
+                    orchestrator._execute(step_name, workers=workers, **options)
+        except Exception as e:
+            traceback.print_exc()
+            attempts = leases.record_attempt(task, str(e))
+            if attempts >= self.max_attempts:
+                leases.complete(task, {"status": "failed", "error": str(e), "attempts": attempts})
+            else:
+                print(f"[WARNING] {task} failed (attempt {attempts}/{self.max_attempts}); releasing it for a retry")
+                leases.release(task)
+            return
+        leases.complete(task, {"status": "ran", "seconds": round(time.perf_counter() - started, 3)})
+
+    def _finalize(self, orchestrator):
+        """Record every step as up to date for the local scheduler and write the run report."""
+        scheduler = orchestrator.scheduler()
+        for name in scheduler.order:
+            node = scheduler.nodes[name]
+            scheduler.record(name, fingerprint(node.inputs, node.params))
+        orchestrator._write_run_report()
+
+
+def _node_main(orchestrator, executor: SharedFSExecutor, workers: int):
+    status = executor.run(orchestrator, workers=workers)
+    raise SystemExit(0 if all(state == "ran" for state in status.values()) else 1)
+
+
+def run_local_nodes(orchestrator, executor: SharedFSExecutor, nodes: int, workers: int = 1) -> bool:
+    """Run executor's plan with several node processes on this machine; returns whether all succeeded."""
+    executor._load_plan(orchestrator)  # a finished run id fails here rather than in every node
+    processes = []
+    for i in range(nodes):
+        node = SharedFSExecutor(executor.run_dir.parent, run_id=executor.run_id, node_id=f"local-{i}",
+                                shards=executor.shards, lease_seconds=executor.lease_seconds,
+                                poll_interval=executor.poll_interval, max_attempts=executor.max_attempts)
+        process = multiprocessing.Process(target=_node_main, name=f"node-{i}", args=(orchestrator, node, workers))
+        process.start()
+        processes.append(process)
+    for process in processes:
+        process.join()
+    return all(process.exitcode == 0 for process in processes)
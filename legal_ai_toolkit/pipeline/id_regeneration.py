@@ -12,14 +12,33 @@ Before this step: TEMP_ABC123DEF456
 After this step:  IN-HC-DEL-2023-CV-ABC123 (with correct domain)
 """
 
+import hashlib
 import re
 from .runner import BaseStep
+from legal_ai_toolkit.utils import codec
 from legal_ai_toolkit.utils.ids import generate_judgment_id
 
+# Hash widths tried, in order, when a generated ID is already taken by another document
+ID_HASH_LENGTHS = (6, 8, 10, 12)
+
 
 class IDRegenerationStep(BaseStep):
     """Regenerate judgment IDs after classification is available."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # judgment_id -> content key of the document that was given it
+        self.issued_ids = {}
+
+    def _content_key(self, data):
+        return data.get("content_hash") or hashlib.sha1(data.get("text", "").encode("utf-8")).hexdigest()
+
+    def resume_item(self, entry):
+        # IDs issued in the earlier run stay taken, so collisions resolve as in an uninterrupted run
+        if entry.get("output"):
+            data = codec.load(self.output_dir / entry["output"])
+            self.issued_ids[entry["judgment_id"]] = self._content_key(data)
+
     def _extract_year_from_date(self, date_str):
         """Extract year from decision date string."""
         if not date_str or date_str == "UNKNOWN":
@@ -56,14 +75,23 @@ class IDRegenerationStep(BaseStep):
         # ✅ NOW we have classification domain available
         domain = classification.get("domain", "unknown")
 
-        # Generate proper semantic ID
-        proper_id = generate_judgment_id(
-            court_level=court_level,
-            court_code=court_code,
-            year=year,
-            domain=domain,
-            text=text
-        )
+        # Generate proper semantic ID, widening the hash if it collides with another document
+        content_key = self._content_key(data)
+        for hash_length in ID_HASH_LENGTHS:
+            proper_id = generate_judgment_id(
+                court_level=court_level,
+                court_code=court_code,
+                year=year,
+                domain=domain,
+                text=text,
+                hash_length=hash_length
+            )
+            if self.issued_ids.get(proper_id, content_key) == content_key:
+                break
+        else:
+            raise ValueError(f"ID collision could not be resolved for {data.get('judgment_id')}: {proper_id}")
+        self.issued_ids[proper_id] = content_key
+        collided = hash_length != ID_HASH_LENGTHS[0]
 
         # Track ID change for audit trail
         old_id = data.get("judgment_id", "UNKNOWN")
@@ -78,6 +106,9 @@ class IDRegenerationStep(BaseStep):
             "final_id": proper_id,
             "regeneration_step": "id_regeneration"
         }
+        if collided:
+            data["provenance"]["id_history"]["collision_resolved"] = True
+            self.logger.warning(f"ID collision for {old_id}: widened hash to {hash_length} characters")
 
         self.logger.info(f"ID regenerated: {old_id} → {proper_id}")
 
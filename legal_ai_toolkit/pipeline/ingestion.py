@@ -1,14 +1,35 @@
+import hashlib
 import os
-import json
 import re
+import tarfile
+import time
+import zipfile
 from datetime import datetime
 from pathlib import Path
 from multiprocessing import Pool, cpu_count
+from legal_ai_toolkit.pipeline.runner import STATE_DIR
+from legal_ai_toolkit.pipeline.storage import CONTENT_INDEX_FILE, FileStore, open_store
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+from legal_ai_toolkit.utils.hashing import hash_bytes, hash_digest, hash_file
+from legal_ai_toolkit.utils.metrics import StepMetrics
+
+# Raw input: .txt judgments, loose or inside these archives (read without extracting)
+RAW_SUFFIX = ".txt"
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+ZIP_SUFFIXES = (".zip",)
+
+# Work items handed to each worker at a time
+INGEST_CHUNKSIZE = 16
+
+CRLF_PATTERN = re.compile(r'\r\n')
+BLANK_LINES_PATTERN = re.compile(r'\n{2,}')
+SPACES_PATTERN = re.compile(r'[ \t]+')
 
 def normalize_text(text: str) -> str:
-    text = re.sub(r'\r\n', '\n', text)
-    text = re.sub(r'\n{2,}', '\n\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = CRLF_PATTERN.sub('\n', text)
+    text = BLANK_LINES_PATTERN.sub('\n\n', text)
+    text = SPACES_PATTERN.sub(' ', text)
     return text.strip()
 
 def paragraphize(text: str):
@@ -18,66 +39,299 @@ def paragraphize(text: str):
         paras.append({"para_id": i, "text": p})
     return paras
 
-def process_single_file(args):
-    file_path, output_dir = args
+def build_record_from_text(raw_text: str):
+    """Normalize one raw judgment into a record with a TEMP_ ID."""
+    clean_text = normalize_text(raw_text)
+    paragraphs = paragraphize(clean_text)
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            raw_text = f.read()
+    metadata = {
+        "court": "UNKNOWN",
+        "court_level": "UNKNOWN",
+        "jurisdiction": "India",
+        "year": datetime.now().year
+    }
 
-        clean_text = normalize_text(raw_text)
-        paragraphs = paragraphize(clean_text)
+    # Generate TEMPORARY ID during ingestion
+    # This will be regenerated in MetadataExtractionStep with proper metadata
+    temp_hash = hashlib.sha1(clean_text[:500].encode("utf-8")).hexdigest()[:12].upper()
+    temp_id = f"TEMP_{temp_hash}"
 
-        metadata = {
-            "court": "UNKNOWN",
-            "court_level": "UNKNOWN",
-            "jurisdiction": "India",
-            "year": datetime.now().year
-        }
+    data = {
+        "judgment_id": temp_id,
+        "metadata": metadata,
+        "text": clean_text,
+        "paragraphs": paragraphs,
+        "annotations": {}
+    }
 
-        # Generate TEMPORARY ID during ingestion
-        # This will be regenerated in MetadataExtractionStep with proper metadata
-        import hashlib
-        temp_hash = hashlib.sha1(clean_text[:500].encode("utf-8")).hexdigest()[:12].upper()
-        temp_id = f"TEMP_{temp_hash}"
-
-        data = {
-            "judgment_id": temp_id,
-            "metadata": metadata,
-            "text": clean_text,
-            "paragraphs": paragraphs,
-            "annotations": {}
-        }
+    return data
 
-        out_path = Path(output_dir) / f"{temp_id}.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+def build_record(file_path):
+    """Read and normalize one raw judgment file into a record with a TEMP_ ID."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        raw_text = f.read()
+    return build_record_from_text(raw_text)
 
-        return True
+def ingest_source(args):
+    """
+    Worker: build the record for one raw source.
+
+    args is (name, payload, content_hash): payload is a file path or the raw
+    bytes of an archive member. Returns (name, record, seconds, bytes read);
+    the record is None on failure.
+    """
+    name, payload, content_hash = args
+    started = time.perf_counter()
+    try:
+        if isinstance(payload, bytes):
+            nbytes = len(payload)
+            data = build_record_from_text(payload.decode("utf-8"))
+        else:
+            nbytes = os.path.getsize(payload)
+            data = build_record(payload)
+        # Hash of the raw bytes; kept for dedup and downstream caches
+        data["content_hash"] = content_hash
+        return name, data, time.perf_counter() - started, nbytes
     except Exception as e:
-        print(f"Error processing {file_path.name}: {e}")
-        return False
+        print(f"Error processing {name}: {e}")
+        return name, None, time.perf_counter() - started, 0
+
+def is_archive(path: Path) -> bool:
+    name = path.name.lower()
+    return name.endswith(TAR_SUFFIXES) or name.endswith(ZIP_SUFFIXES)
+
+def iter_raw_sources(input_path: Path):
+    """
+    Lazily yield (name, payload) for every raw judgment under input_path.
+
+    Loose .txt files are yielded as paths (workers read them); members of
+    tar/zip archives are yielded as bytes, read one at a time.
+    """
+    if input_path.is_file():
+        if is_archive(input_path):
+            yield from iter_archive(input_path)
+        elif input_path.name.endswith(RAW_SUFFIX):
+            yield input_path.name, input_path
+        return
+
+    for root, dirs, files in os.walk(input_path):
+        dirs.sort()
+        for filename in sorted(files):
+            path = Path(root) / filename
+            if filename.endswith(RAW_SUFFIX):
+                yield str(path.relative_to(input_path)), path
+            elif is_archive(path):
+                yield from iter_archive(path)
+
+def iter_archive(path: Path):
+    """Yield (archive:member, bytes) for each .txt member of a tar or zip archive."""
+    if path.name.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.endswith(RAW_SUFFIX):
+                    yield f"{path.name}:{info.filename}", archive.read(info)
+        return
+
+    # Streaming mode ("r|*") reads compressed tars sequentially without seeking
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            if member.isfile() and member.name.endswith(RAW_SUFFIX):
+                yield f"{path.name}:{member.name}", archive.extractfile(member).read()
 
 class IngestionProcessor:
-    def __init__(self, input_dir, output_dir):
+    def __init__(self, input_dir, output_dir, output_format="json", state_dir=None, **storage_options):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.output_store = open_store(self.output_dir, output_format, **storage_options)
         os.makedirs(self.output_dir, exist_ok=True)
+        # Duplicates reports go here, as BaseStep keeps its reports (see runner.STATE_DIR)
+        self.state_dir = Path(state_dir) if state_dir else self.output_dir / STATE_DIR
+        os.makedirs(self.state_dir, exist_ok=True)
+        # Outcome of the last stream(): sources ingested or unchanged, and sources that failed
+        self.succeeded = 0
+        self.failed = 0
 
     def run(self, workers=None):
+        """Ingest every source; returns False if sources failed and none was ingested (or unchanged)."""
+        for _ in self.stream(workers=workers):
+            pass
+        return not (self.failed and not self.succeeded)
+
+    def stream(self, workers=None, include_unchanged=False):
+        """
+        Ingest, yielding each record as soon as it is written.
+
+        With include_unchanged, records skipped as already ingested are
+        loaded from the output dir and yielded at the end, so a consumer sees
+        the whole corpus (the streaming runtime feeds later steps this way).
+        """
         if workers is None:
             workers = max(1, cpu_count() - 1)
 
-        files = list(self.input_dir.rglob("*.txt"))
-        if not files:
+        if not self.input_dir.exists():
             print(f"No .txt files found in {self.input_dir}")
             return
 
-        print(f"Ingesting {len(files)} files with {workers} workers...")
-        args = [(f, self.output_dir) for f in files]
+        print(f"Ingesting {self.input_dir} with {workers} workers...")
 
-        with Pool(workers) as pool:
-            results = pool.map(process_single_file, args)
+        # File-per-judgment output persists across runs, so unchanged documents can be skipped
+        incremental = isinstance(self.output_store, FileStore)
+        index = self._load_content_index() if incremental else {}
+        indexed = dict(index)
+        # source -> content_hash it was last ingested with, so an edited source replaces its record
+        ingested_as = {source: content_hash for content_hash, (_, source) in index.items() if source}
+        # TEMP_ id -> (content_hash, source) that held it in the previous run
+        previous = {judgment_id: (content_hash, source) for content_hash, (judgment_id, source) in index.items()}
+        owners = {}        # TEMP_ id -> source holding it in this run
 
-        success_count = sum(1 for r in results if r)
-        print(f"Successfully ingested {success_count}/{len(files)} judgments.")
+        seen = {}          # content_hash -> first source name in this run
+        duplicates = []    # byte-identical sources skipped in this run
+        counts = {"sources": 0, "unchanged": 0, "replaced": 0}
+        unchanged_ids = []
+
+        def work():
+            for name, payload in iter_raw_sources(self.input_dir):
+                counts["sources"] += 1
+                content_hash = hash_bytes(payload) if isinstance(payload, bytes) else hash_file(payload)
+                if content_hash in seen:
+                    duplicates.append({"source": name, "duplicate_of": seen[content_hash], "content_hash": content_hash})
+                    continue
+                seen[content_hash] = name
+                if content_hash in index:
+                    judgment_id = index[content_hash][0]
+                    counts["unchanged"] += 1
+                    unchanged_ids.append(judgment_id)
+                    index[content_hash] = (judgment_id, name)
+                    owners.setdefault(judgment_id, name)
+                    continue
+                yield name, payload, content_hash
+
+        collisions = []
+        pending = []       # records whose TEMP_ id a previous-run source held; settled once all sources are seen
+        success_count = 0
+        failed = 0
+        step_metrics = StepMetrics(self.__class__.__name__, workers=workers)
+        from tqdm import tqdm
+        with self.output_store.writer() as writer:
+
+            def claim(name, data):
+                """Write a record under its TEMP_ id, or its full-content id if another source holds that."""
+                temp_id, content_hash = data["judgment_id"], data["content_hash"]
+                if owners.get(temp_id, name) != name:
+                    # Same first 500 chars, different document: fall back to the full-content hash
+                    data["judgment_id"] = f"TEMP_{hash_digest(content_hash)[:12].upper()}"
+                    collisions.append({"temp_id": temp_id, "resolved_as": data["judgment_id"],
+                                       "source": name, "content_hash": content_hash})
+                writer.write(data["judgment_id"], data)
+                owners[data["judgment_id"]] = name
+                # An edited source replaces what it was ingested as, including a record under another ID
+                old_hash = ingested_as.pop(name, None)
+                if old_hash is not None and old_hash != content_hash and index.get(old_hash, (None, None))[1] == name:
+                    old_id = index.pop(old_hash)[0]
+                    if old_id != data["judgment_id"] and owners.get(old_id, name) == name:
+                        (self.output_dir / f"{old_id}.json").unlink(missing_ok=True)
+                    counts["replaced"] += 1
+                # A source gone from the corpus loses the ID it held, or restoring it would look unchanged
+                held = previous.get(data["judgment_id"])
+                if held is not None and held[1] != name and index.get(held[0], (None, None))[0] == data["judgment_id"]:
+                    del index[held[0]]
+                index[content_hash] = (data["judgment_id"], name)
+
+            if workers > 1:
+                pool = Pool(workers)
+                # Ordered: on a TEMP_ collision the first source in input order keeps the ID,
+                # whichever worker finishes first (imap_unordered made the outcome vary per run)
+                results = pool.imap(ingest_source, work(), chunksize=INGEST_CHUNKSIZE)
+            else:
+                pool = None
+                results = map(ingest_source, work())
+            try:
+                for name, data, seconds, nbytes in tqdm(results, unit="file"):
+                    step_metrics.observe(seconds, nbytes)
+                    if data is None:
+                        failed += 1
+                        continue
+                    temp_id = data["judgment_id"]
+                    if temp_id not in owners and previous.get(temp_id, (None, name))[1] != name:
+                        # Only a collision if that source is still in the corpus, which may not be known yet
+                        pending.append((name, data))
+                        continue
+                    claim(name, data)
+                    success_count += 1
+                    yield data
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+
+            for name, data in pending:
+                claim(name, data)
+                success_count += 1
+                yield data
+
+        self.succeeded, self.failed = success_count + counts["unchanged"], failed
+        if counts["sources"] == 0:
+            print(f"No .txt files found in {self.input_dir}")
+            return
+
+        # Rewritten only when it changed (it is not part of the step's fingerprint, see scheduler.py)
+        if incremental and index != indexed:
+            self._write_content_index(index)
+        step_metrics.finish(succeeded=success_count, unchanged=counts["unchanged"],
+                            duplicates=len(duplicates), failed=failed)
+
+        print(f"Successfully ingested {success_count}/{counts['sources']} judgments.")
+        if counts["unchanged"]:
+            print(f"[SKIPPED] Already ingested (unchanged content): {counts['unchanged']}")
+        if counts["replaced"]:
+            print(f"[UPDATED] Changed sources re-ingested over their previous record: {counts['replaced']}")
+        if duplicates:
+            print(f"[DUPLICATE] Byte-identical files skipped: {len(duplicates)}")
+        if collisions:
+            print(f"[COLLISION] TEMP_ ID collisions resolved with the content hash: {len(collisions)}")
+        if failed:
+            print(f"[FAILED] Failed: {failed}")
+        if (duplicates or collisions) and not self._same_as_last_report(duplicates, collisions):
+            self._write_duplicates_report(duplicates, collisions)
+
+        if include_unchanged:
+            for judgment_id in unchanged_ids:
+                yield codec.load(self.output_dir / f"{judgment_id}.json")
+
+    def _load_content_index(self):
+        """content_hash -> (judgment_id, source) for previously ingested files that still exist."""
+        path = self.output_dir / CONTENT_INDEX_FILE
+        index = {}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = codec.loads(line)
+                    if (self.output_dir / f"{entry['judgment_id']}.json").exists():
+                        # Indexes written before sources were recorded have no "source"
+                        index[entry["content_hash"]] = (entry["judgment_id"], entry.get("source"))
+        return index
+
+    def _write_content_index(self, index):
+        with atomic_open(self.output_dir / CONTENT_INDEX_FILE, "w") as f:
+            for content_hash, (judgment_id, source) in index.items():
+                entry = {"content_hash": content_hash, "judgment_id": judgment_id, "source": source}
+                f.write(codec.dumps(entry, pretty=False) + "\n")
+
+    def _same_as_last_report(self, duplicates, collisions):
+        """Whether the latest duplicates report already lists exactly these duplicates and collisions."""
+        reports = sorted(self.state_dir.glob("duplicates_*.json"))
+        if not reports:
+            return False
+        report = codec.load(reports[-1])
+        return report.get("duplicates") == duplicates and report.get("temp_id_collisions") == collisions
+
+    def _write_duplicates_report(self, duplicates, collisions):
+        report_path = self.state_dir / f"duplicates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "step": self.__class__.__name__,
+            "duplicates": duplicates,
+            "temp_id_collisions": collisions
+        }
+        codec.dump(report, report_path, pretty=True)
+        print(f"📝 Duplicate report written to: {report_path}")
@@ -0,0 +1,67 @@
+"""
+Per-step manifest of completed inputs, for resuming a crashed run.
+
+``manifest.jsonl`` in a step's state directory gets one line per input
+record as soon as its output is written: the input's name and content hash,
+and the output file (relative to the output dir) with its hash. Records the
+step deliberately dropped (SKIP_RECORD) are recorded without an output.
+
+Lines are appended and flushed one at a time, so a killed run leaves a
+manifest of everything it finished (a torn last line is ignored). With
+``resume=True`` a step skips an input whose hash matches its manifest line
+and whose output still exists with the recorded hash; outputs are written
+atomically, so an output that exists is complete.
+"""
+from pathlib import Path
+from typing import Dict, Optional
+
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.hashing import hash_file
+
+MANIFEST_FILE = "manifest.jsonl"
+
+
+class StepManifest:
+    def __init__(self, output_dir, resume: bool = False, filename: str = MANIFEST_FILE, state_dir=None):
+        self.output_dir = Path(output_dir)
+        self.path = Path(state_dir or output_dir) / filename
+        self.entries: Dict[str, Dict] = self._load() if resume else {}
+        # A fresh run starts a new manifest; a resumed one extends it
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> Dict[str, Dict]:
+        entries = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = codec.loads(line)
+                    except Exception:
+                        continue  # torn write from a killed run
+                    entries[entry["input"]] = entry
+        return entries
+
+    def completed(self, name: str, input_hash: str) -> Optional[Dict]:
+        """The manifest entry for an input if its output is still valid, else None."""
+        entry = self.entries.get(name)
+        if entry is None or entry["input_hash"] != input_hash:
+            return None
+        if entry.get("output") is None:
+            return entry
+        output_path = self.output_dir / entry["output"]
+        if not output_path.exists() or hash_file(output_path) != entry["output_hash"]:
+            return None
+        return entry
+
+    def record(self, name: str, input_hash: str, output_path: Optional[Path] = None, judgment_id: str = None):
+        entry = {"input": name, "input_hash": input_hash, "output": None}
+        if output_path is not None:
+            entry["output"] = str(Path(output_path).relative_to(self.output_dir))
+            entry["output_hash"] = hash_file(output_path)
+            entry["judgment_id"] = judgment_id
+        self.entries[name] = entry
+        self._file.write(codec.dumps(entry, pretty=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
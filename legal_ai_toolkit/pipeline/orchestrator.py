@@ -5,121 +5,350 @@ from .transitions import TransitionStep
 from .issues import IssueExtractionStep
 from .citations import CitationExtractionStep
 from .consolidation import ConsolidationStep
+from .dedup import NearDuplicateStep
 from ..clustering.similarity import SimilarityProcessor
 from ..clustering.centroid import CentroidClusteter
 from ..clustering.refinement import ClusterRefiner
+from .scheduler import DAGScheduler, StepNode, fingerprint
+from .executors import LocalExecutor
+from .streaming import DEFAULT_QUEUE_SIZE, StreamingRunner
 import os
+import time
+from .storage import DEFAULT_SHARD_SIZE, open_store
+from ..utils.metrics import StepMetrics, metrics
+from ..utils.warmup import prefork_warm_up
+
+# Scheduler state (input/output fingerprints of each step's last run), in the interim dir
+STATE_FILE = ".pipeline_state.json"
+# Per-step metrics and the report assembled from them at the end of a run, in the interim dir
+METRICS_DIR = "metrics"
+RUN_REPORT_FILE = "run_report.json"
+# Per-step run state (manifest, quarantine queue, error logs, profiles), in the interim dir,
+# so the processed dataset directory only holds judgments
+STEP_STATE_DIR = "step_state"
+
+STEP_ALIASES = {"id_regeneration": "id_regen"}
+
+# Per-record steps: step name -> (class, input path key, output path key)
+RECORD_STEPS = {
+    "dedup": (NearDuplicateStep, "normalized", "deduplicated"),
+    "metadata": (MetadataExtractionStep, "deduplicated", "headers"),
+    "issues": (IssueExtractionStep, "headers", "issues"),
+    "classify": (ClassificationStep, "issues", "classified"),
+    "id_regen": (IDRegenerationStep, "classified", "id_regen"),
+    "transitions": (TransitionStep, "id_regen", "transitions"),
+    "citations": (CitationExtractionStep, "transitions", "citations"),
+}
+
+STEP_TITLES = {
+    "ingest": "Ingestion",
+    "dedup": "Near-Duplicate Detection",
+    "metadata": "Metadata Extraction",
+    "issues": "Issue Extraction",
+    "classify": "Classification",
+    "id_regen": "ID Regeneration",
+    "transitions": "Statutory Transitions",
+    "citations": "Citation Extraction",
+    "similarity": "Similarity Analysis",
+    "cluster": "Clustering",
+    "consolidate": "Consolidation",
+}
 
 class PipelineOrchestrator:
-    def __init__(self, raw_dir=None, interim_dir="interim", processed_dir=None, annotations_dir="annotations"):
+    def __init__(self, raw_dir=None, interim_dir="interim", processed_dir=None, annotations_dir="annotations",
+                 storage="json", compression=None, shard_size=DEFAULT_SHARD_SIZE, resume=False,
+                 prometheus_file=None, quarantine_chars=None, quarantine_seconds=None, defer_slow_lane=False,
+                 prefork=True, trace_rules=False):
         pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.raw_dir = raw_dir or os.path.join(pkg_root, "data", "raw", "judgments")
         self.interim_dir = interim_dir
         self.processed_dir = processed_dir or os.path.join(pkg_root, "data", "judgments")
         self.annotations_dir = annotations_dir
+        # Layout of the interim step outputs; the final processed dataset is always one file per judgment
+        self.storage = storage
+        self.compression = compression
+        self.shard_size = shard_size
+        # Per-record steps skip inputs already done in an interrupted run (see pipeline/manifest.py)
+        self.resume = resume
+        # Optional Prometheus textfile written with the run report (see utils/metrics.py)
+        self.prometheus_file = prometheus_file
+        # Per-record steps divert outliers to a slow lane (see pipeline/quarantine.py)
+        self.quarantine_chars = quarantine_chars
+        self.quarantine_seconds = quarantine_seconds
+        self.defer_slow_lane = defer_slow_lane
+        # Name the hot rule of each step's slowest judgments in the run report (times every rule call)
+        self.trace_rules = trace_rules
+        # Build rules and lookup indexes once before forking step/stage processes (see utils/warmup.py)
+        self.prefork = prefork
 
-    def run_step(self, step_name, workers=1):
-        """Run a specific step of the pipeline."""
-        normalized_dir = os.path.join(self.interim_dir, "normalized_text")
-        headers_dir = os.path.join(self.interim_dir, "headers_extracted")
-        classified_dir = os.path.join(self.interim_dir, "classified")
-        id_regen_dir = os.path.join(self.interim_dir, "id_regenerated")
-        transitions_dir = os.path.join(self.interim_dir, "transitions_extracted")
-        issues_dir = os.path.join(self.interim_dir, "issues_extracted")
-        citations_dir = os.path.join(self.interim_dir, "citations_extracted")
+    def _interim_storage(self):
+        """Storage keyword arguments for steps writing to the interim directory."""
+        if self.storage == "json":
+            return {}
+        return {"output_format": self.storage, "compression": self.compression, "shard_size": self.shard_size}
+
+    def _step_options(self):
+        """Keyword arguments shared by the per-record (BaseStep) steps of a batch run."""
+        return {"resume": self.resume, "quarantine_chars": self.quarantine_chars,
+                "quarantine_seconds": self.quarantine_seconds, "defer_slow_lane": self.defer_slow_lane,
+                "trace_rules": self.trace_rules}
+
+    def _record_step(self, step_name, **options):
+        """A per-record step; options (e.g. partition, resume) override the batch defaults."""
+        p = self._paths()
+        options = {**self._step_options(), "state_dir": self._state_dir(step_name), **options}
+        if step_name == "consolidate":
+            return ConsolidationStep(p["citations"], self.processed_dir, **options)
+        step_class, input_key, output_key = RECORD_STEPS[step_name]
+        return step_class(p[input_key], p[output_key], **options, **self._interim_storage())
+
+    def _state_dir(self, step_name):
+        return os.path.join(self.interim_dir, STEP_STATE_DIR, step_name)
+
+    def _paths(self):
+        interim = lambda name: os.path.join(self.interim_dir, name)
+        similarity = lambda name: os.path.join(self.annotations_dir, "similarity", name)
+        return {
+            "normalized": interim("normalized_text"),
+            "deduplicated": interim("deduplicated"),
+            "headers": interim("headers_extracted"),
+            "issues": interim("issues_extracted"),
+            "classified": interim("classified"),
+            "id_regen": interim("id_regenerated"),
+            "transitions": interim("transitions_extracted"),
+            "citations": interim("citations_extracted"),
+            "signals": similarity("signals"),
+            "edges": similarity("edges.jsonl"),
+            "clusters": similarity("clusters.json"),
+            "clusters_refined": similarity("clusters_refined.json"),
+        }
+
+    def nodes(self):
+        """The pipeline as a DAG: each step with the paths it reads and writes, in run order."""
+        p = self._paths()
+        storage = {"storage": self.storage, "compression": self.compression, "shard_size": self.shard_size}
+        return [
+            StepNode("ingest", (self.raw_dir,), (p["normalized"],), storage),
+            StepNode("dedup", (p["normalized"],), (p["deduplicated"],), storage),
+            StepNode("metadata", (p["deduplicated"],), (p["headers"],), storage),
+            StepNode("issues", (p["headers"],), (p["issues"],), storage),
+            # Classification uses the extracted issues as signals
+            StepNode("classify", (p["issues"],), (p["classified"],), storage),
+            # IDs are regenerated once court metadata and domain are known
+            StepNode("id_regen", (p["classified"],), (p["id_regen"],), storage),
+            StepNode("transitions", (p["id_regen"],), (p["transitions"],), storage),
+            StepNode("citations", (p["transitions"],), (p["citations"],), storage),
+            # Similarity and consolidation read the stable (regenerated) IDs and are independent
+            StepNode("similarity", (p["citations"],), (p["signals"], p["edges"])),
+            StepNode("cluster", (p["edges"], p["signals"]), (p["clusters"], p["clusters_refined"])),
+            StepNode("consolidate", (p["citations"],), (self.processed_dir,)),
+        ]
 
+    def scheduler(self):
+        return DAGScheduler(self.nodes(), os.path.join(self.interim_dir, STATE_FILE))
+
+    def _execute(self, step_name, workers=1, **options):
+        """Run one step (no staleness check); options go to per-record steps (see _record_step)."""
+        p = self._paths()
+        storage = self._interim_storage()
+
+        succeeded = True
         if step_name == "ingest":
             from .ingestion import IngestionProcessor
-            IngestionProcessor(self.raw_dir, normalized_dir).run(workers=workers)
-        elif step_name == "metadata":
-            MetadataExtractionStep(normalized_dir, headers_dir).run()
-        elif step_name == "issues":
-            IssueExtractionStep(headers_dir, issues_dir).run()
-        elif step_name == "classify":
-            ClassificationStep(issues_dir, classified_dir).run()
-        elif step_name == "id_regen" or step_name == "id_regeneration":
-            IDRegenerationStep(classified_dir, id_regen_dir).run()
-        elif step_name == "transitions":
-            TransitionStep(id_regen_dir, transitions_dir).run()
-        elif step_name == "citations":
-            CitationExtractionStep(transitions_dir, citations_dir).run()
+            succeeded = IngestionProcessor(self.raw_dir, p["normalized"], state_dir=self._state_dir("ingest"),
+                                           **storage).run(workers=workers)
         elif step_name == "similarity":
-            signal_dir = os.path.join(self.annotations_dir, "similarity/signals")
-            edge_file = os.path.join(self.annotations_dir, "similarity/edges.jsonl")
-            SimilarityProcessor(citations_dir, signal_dir, edge_file).run(workers=workers)
+            SimilarityProcessor(p["citations"], p["signals"], p["edges"]).run(workers=workers)
         elif step_name == "cluster":
-            edge_file = os.path.join(self.annotations_dir, "similarity/edges.jsonl")
-            cluster_file = os.path.join(self.annotations_dir, "similarity/clusters.json")
-            refined_cluster_file = os.path.join(self.annotations_dir, "similarity/clusters_refined.json")
-            signal_dir = os.path.join(self.annotations_dir, "similarity/signals")
-            CentroidClusteter(edge_file, cluster_file).run()
-            ClusterRefiner(cluster_file, refined_cluster_file, signal_dir).run()
-        elif step_name == "consolidate":
-            ConsolidationStep(citations_dir, self.processed_dir).run()
+            CentroidClusteter(p["edges"], p["clusters"]).run()
+            ClusterRefiner(p["clusters"], p["clusters_refined"], p["signals"]).run()
         else:
+            succeeded = self._record_step(step_name, **options).run()
+        # Raised so the step is not recorded as up to date (and the steps after it do not run)
+        if not succeeded:
+            raise RuntimeError(f"{STEP_TITLES[step_name]} produced nothing: every record failed or its input is missing")
+
+    def run_slow_lane(self, step_name):
+        """Process the quarantine queue a deferred run of a per-record step left behind."""
+        step_name = STEP_ALIASES.get(step_name, step_name)
+        if step_name != "consolidate" and step_name not in RECORD_STEPS:
+            print(f"[ERROR] {step_name} has no quarantine queue (per-record steps only)")
+            return False
+        print(f"\n--- Slow lane: {STEP_TITLES[step_name]} ---")
+        self._record_step(step_name).run_slow_lane()
+        return True
+
+    def _start_metrics(self, run_id=None):
+        metrics.start_run(os.path.join(self.interim_dir, METRICS_DIR), run_id=run_id)
+
+    def _write_run_report(self):
+        report_path = metrics.write_report(os.path.join(self.interim_dir, RUN_REPORT_FILE), self.prometheus_file)
+        print(f"📝 Run report written to: {report_path}")
+        if self.prometheus_file:
+            print(f"📝 Prometheus metrics written to: {self.prometheus_file}")
+
+    def run_step(self, step_name, workers=1):
+        """Run a specific step of the pipeline, then report which downstream steps are now stale."""
+        step_name = STEP_ALIASES.get(step_name, step_name)
+        scheduler = self.scheduler()
+        if step_name not in scheduler.nodes:
             print(f"Unknown step: {step_name}")
+            return
+
+        node = scheduler.nodes[step_name]
+        inputs_fingerprint = fingerprint(node.inputs, node.params)
+        self._start_metrics()
+        try:
+            self._execute(step_name, workers=workers)
+        except RuntimeError as e:
+            print(f"\n[FAILED] {e}")
+            self._write_run_report()
+            return
+        scheduler.record(step_name, inputs_fingerprint)
+        self._write_run_report()
+
+        stale = scheduler.downstream(step_name)
+        if stale:
+            print(f"\n[STALE] Now out of date: {', '.join(stale)} (run the pipeline to update them)")
 
-    def run_full_pipeline(self, workers=1):
+    def run_full_pipeline(self, workers=1, jobs=1, force=False, executor=None):
+        """
+        Run the pipeline with an executor (see pipeline/executors.py).
+
+        The default, LocalExecutor(jobs, force), runs the stale steps on this
+        machine (run_local); SharedFSExecutor spreads the run over nodes.
+        """
+        if executor is None:
+            executor = LocalExecutor(jobs=jobs, force=force)
+        return executor.run(self, workers=workers)
+
+    def run_local(self, workers=1, jobs=1, force=False):
+        """
+        Run every step that is out of date, in dependency order.
+
+        Steps whose inputs, parameters and outputs are unchanged since their
+        last run are skipped (force=True reruns everything). With jobs > 1
+        independent steps run concurrently (similarity/cluster alongside
+        consolidation).
+        """
         print("Starting Full Legal AI Toolkit Pipeline...")
+        self._start_metrics()
+        scheduler = self.scheduler()
+        stale = scheduler.stale() if not force else list(scheduler.order)
+        if not stale:
+            print("\n[OK] Everything is up to date")
+        else:
+            print(f"Steps to run: {', '.join(stale)}")
+
+        def run_node(name):
+            print(f"\n--- Step: {STEP_TITLES[name]} ---")
+            self._execute(name, workers=workers)
+
+        if jobs > 1 and len(stale) > 1 and self.prefork:
+            prefork_warm_up()
+        status = scheduler.run(run_node, force=force, jobs=jobs)
+        failed = [name for name, state in status.items() if state in ("failed", "blocked")]
+
+        p = self._paths()
+        if failed:
+            print(f"\n[FAILED] Pipeline incomplete; not finished: {', '.join(failed)}")
+        else:
+            print("\nPipeline execution complete!")
+        print(f"\n📊 Summary:")
+        print(f"  - Steps run: {sum(1 for state in status.values() if state == 'ran')}, up to date: {sum(1 for state in status.values() if state == 'up-to-date')}")
+        print(f"  - Normalized text: {p['normalized']}")
+        print(f"  - Final output: {self.processed_dir}")
+        print(f"  - Similarity edges: {p['edges']}")
+        print(f"  - Clusters: {p['clusters_refined']}")
+        self._write_run_report()
+        return status
 
-        # Define paths
-        normalized_dir = os.path.join(self.interim_dir, "normalized_text")
-        headers_dir = os.path.join(self.interim_dir, "headers_extracted")
-        issues_dir = os.path.join(self.interim_dir, "issues_extracted")
-        classified_dir = os.path.join(self.interim_dir, "classified")
-        id_regen_dir = os.path.join(self.interim_dir, "id_regenerated")
-        transitions_dir = os.path.join(self.interim_dir, "transitions_extracted")
-        citations_dir = os.path.join(self.interim_dir, "citations_extracted")
+    def run_streaming_pipeline(self, workers=1, queue_size=DEFAULT_QUEUE_SIZE, dedup=True):
+        """
+        Run the pipeline with the per-record steps streaming (see pipeline/streaming.py).
 
-        # Step 1: Ingestion (generates TEMP_ IDs)
+        Writes normalized text, citations-extracted records and the final
+        output; the other interim directories only receive reports.
+        Similarity and clustering run once the stream has drained.
+        """
         from .ingestion import IngestionProcessor
-        print("\n--- Step 1: Ingestion ---")
-        IngestionProcessor(self.raw_dir, normalized_dir).run(workers=workers)
-
-        # Step 2: Metadata Extraction (keeps TEMP_ IDs)
-        print("\n--- Step 2: Metadata Extraction ---")
-        MetadataExtractionStep(normalized_dir, headers_dir).run()
-
-        # Step 3: Issue Extraction (MOVED UP - before classification)
-        print("\n--- Step 3: Issue Extraction ---")
-        IssueExtractionStep(headers_dir, issues_dir).run()
-
-        # Step 4: Classification (uses issues as signals)
-        print("\n--- Step 4: Classification ---")
-        ClassificationStep(issues_dir, classified_dir).run()
-
-        # Step 4.5: ID Regeneration (✅ NEW - AFTER classification)
-        print("\n--- Step 4.5: ID Regeneration ---")
-        print("  Regenerating IDs with proper court metadata and domain...")
-        IDRegenerationStep(classified_dir, id_regen_dir).run()
-
-        # Step 5: Transitions
-        print("\n--- Step 5: Statutory Transitions ---")
-        TransitionStep(id_regen_dir, transitions_dir).run()
-
-        # Step 6: Citations
-        print("\n--- Step 6: Citation Extraction ---")
-        CitationExtractionStep(transitions_dir, citations_dir).run()
-
-        # Step 7: Similarity (✅ FIXED - uses stable IDs from id_regen_dir)
-        print("\n--- Step 7: Similarity Analysis ---")
-        signal_dir = os.path.join(self.annotations_dir, "similarity/signals")
-        edge_file = os.path.join(self.annotations_dir, "similarity/edges.jsonl")
-        cluster_file = os.path.join(self.annotations_dir, "similarity/clusters.json")
-        refined_cluster_file = os.path.join(self.annotations_dir, "similarity/clusters_refined.json")
-
-        # Use citations_dir which has stable IDs (after id_regeneration)
-        SimilarityProcessor(citations_dir, signal_dir, edge_file).run(workers=workers)
-        CentroidClusteter(edge_file, cluster_file).run()
-        ClusterRefiner(cluster_file, refined_cluster_file, signal_dir).run()
-
-        # Step 8: Consolidate
-        print("\n--- Step 8: Consolidation ---")
-        ConsolidationStep(citations_dir, self.processed_dir).run()
+        print("Starting Streaming Legal AI Toolkit Pipeline...")
+        self._start_metrics()
+        p = self._paths()
+        storage = self._interim_storage()
+        ingestion = IngestionProcessor(self.raw_dir, p["normalized"], state_dir=self._state_dir("ingest"), **storage)
+
+        stages = []
+        if dedup:
+            # Barrier: groups need every judgment, so ingestion completes first
+            print("\n--- Step: Ingestion ---")
+            ingestion.run(workers=workers)
+            dedup_step = NearDuplicateStep(p["normalized"], p["deduplicated"], state_dir=self._state_dir("dedup"),
+                                           trace_rules=self.trace_rules, **storage)
+            dedup_step._find_duplicates()
+            stages.append(("dedup", dedup_step))
+            source = open_store(p["normalized"]).iter_judgments()
+        else:
+            source = ingestion.stream(workers=workers, include_unchanged=True)
+        for name in ("metadata", "issues", "classify", "id_regen", "transitions", "citations"):
+            step_class, input_key, output_key = RECORD_STEPS[name]
+            stages.append((name, step_class(p[input_key], p[output_key], state_dir=self._state_dir(name),
+                                            trace_rules=self.trace_rules, **storage)))
+
+        consolidation = ConsolidationStep(p["citations"], self.processed_dir, state_dir=self._state_dir("consolidate"),
+                                          trace_rules=self.trace_rules)
+        consolidation_metrics = StepMetrics(ConsolidationStep.__name__)
+        written = {"citations": 0, "consolidated": 0, "failed": 0}
+
+        print(f"\n--- Streaming: {' → '.join(name for name, _ in stages)} → consolidate ---")
+        with stages[-1][1].output_store.writer() as citations_writer, \
+                consolidation.output_store.writer() as processed_writer:
+
+            def sink(source_id, data):
+                judgment_id = data.get("judgment_id", source_id)
+                citations_writer.write(judgment_id, data, fallback_stem=source_id)
+                written["citations"] += 1
+                started = time.perf_counter()
+                try:
+                    unified, _, hot_rule = consolidation.apply(data, judgment_id, judgment_id)
+                    text_length = len(data.get("text", ""))
+                    consolidation_metrics.observe(time.perf_counter() - started, text_length,
+                                                  judgment_id, text_length, hot_rule)
+                    processed_writer.write(unified.get("judgment_id", judgment_id), unified, fallback_stem=source_id)
+                    written["consolidated"] += 1
+                except Exception as e:
+                    written["failed"] += 1
+                    print(f"[ERROR] Error consolidating {judgment_id}: {str(e)}")
+
+            results = StreamingRunner(stages, queue_size=queue_size, prefork=self.prefork).run(source, sink)
+        consolidation_metrics.finish(succeeded=written["consolidated"], failed=written["failed"])
+
+        print(f"\n[OK] Streamed {results['source']['records']} records")
+        for name, _ in stages:
+            counts = results[name]
+            line = f"  - {name}: {counts['processed']} processed"
+            if counts["skipped"]:
+                line += f", {counts['skipped']} not carried forward"
+            if counts["over_budget"]:
+                line += f", {counts['over_budget']} over time budget"
+            if counts["failed"]:
+                line += f", {counts['failed']} failed"
+            print(line)
+        print(f"  - consolidate: {written['consolidated']} written")
+        if written["failed"]:
+            print(f"[FAILED] Consolidation failed: {written['failed']}")
+
+        # Barrier: similarity and clustering need every judgment
+        print("\n--- Step: Similarity Analysis ---")
+        self._execute("similarity", workers=workers)
+        print("\n--- Step: Clustering ---")
+        self._execute("cluster", workers=workers)
 
         print("\nPipeline execution complete!")
         print(f"\n📊 Summary:")
-        print(f"  - Normalized text: {normalized_dir}")
+        print(f"  - Normalized text: {p['normalized']}")
         print(f"  - Final output: {self.processed_dir}")
-        print(f"  - Similarity edges: {edge_file}")
-        print(f"  - Clusters: {refined_cluster_file}")
+        print(f"  - Similarity edges: {p['edges']}")
+        print(f"  - Clusters: {p['clusters_refined']}")
+        self._write_run_report()
+        return results
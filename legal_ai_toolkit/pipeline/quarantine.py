@@ -0,0 +1,73 @@
+"""
+Quarantine queue for judgments too large or too slow for a step's main pass.
+
+A few huge or malformed judgments (e.g. multi-megabyte scanned
+compilations) dominate every step's tail latency. BaseStep can divert them:
+records longer than ``quarantine_chars``, or still processing (wall-clock)
+after ``quarantine_seconds``, are appended to ``quarantine.jsonl`` in the step's
+state directory instead of being written, and are processed afterwards in
+the slow lane with a larger time budget, so they never hold up the batch.
+
+Each line keeps the record's original serialized bytes, so the slow lane
+sees (and the step manifest hashes) exactly what the main pass read.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from legal_ai_toolkit.pipeline.storage import StoredRecord
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+
+QUARANTINE_FILE = "quarantine.jsonl"
+
+
+class QuarantineQueue:
+    def __init__(self, directory, reset: bool = False, filename: str = QUARANTINE_FILE):
+        self.path = Path(directory) / filename
+        if reset and self.path.exists():
+            self.path.unlink()
+
+    def put(self, record: StoredRecord, raw: bytes, reason: str, **details):
+        """Queue a record; reason is "size" or "time", details go into the entry as-is."""
+        entry = {
+            "input": record.name,
+            "stem": record.stem,
+            "reason": reason,
+            **details,
+            "queued_at": datetime.now().isoformat(),
+            "raw": raw.decode("utf-8") if isinstance(raw, bytes) else raw,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(codec.dumps(entry, pretty=False) + "\n")
+
+    def entries(self) -> List[Dict]:
+        """Queued entries, latest per input."""
+        entries = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = codec.loads(line)
+                        entries[entry["input"]] = entry
+        return list(entries.values())
+
+    def __len__(self):
+        return len(self.entries())
+
+    def records(self) -> Iterator[StoredRecord]:
+        for entry in self.entries():
+            raw = entry["raw"].encode("utf-8")
+            yield StoredRecord(entry["input"], entry["stem"], lambda raw=raw: codec.loads(raw), lambda raw=raw: raw)
+
+    def remove(self, names: Iterable[str]):
+        """Drop the entries for the given inputs (deleting the file once empty)."""
+        names = set(names)
+        remaining = [entry for entry in self.entries() if entry["input"] not in names]
+        if not remaining:
+            if self.path.exists():
+                self.path.unlink()
+            return
+        with atomic_open(self.path, "w") as f:
+            for entry in remaining:
+                f.write(codec.dumps(entry, pretty=False) + "\n")
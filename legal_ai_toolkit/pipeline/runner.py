@@ -1,17 +1,67 @@
 import os
 import json
 import logging
-import re
+import time
+import zlib
 from pathlib import Path
-from tqdm import tqdm
 from datetime import datetime
+from legal_ai_toolkit.pipeline.manifest import MANIFEST_FILE, StepManifest
+from legal_ai_toolkit.pipeline.quarantine import QUARANTINE_FILE, QuarantineQueue
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+from legal_ai_toolkit.utils.hashing import hash_bytes
+from legal_ai_toolkit.utils.metrics import StepMetrics
+from legal_ai_toolkit.utils.profiling import profiler
+from legal_ai_toolkit.utils.rules import registry as rule_registry
+from legal_ai_toolkit.pipeline.storage import FileStore, build_record_path, open_store, sanitize_segment
+
+# Wall-clock time allowed per judgment per step before extraction degrades (seconds)
+DOCUMENT_TIME_BUDGET = 60.0
+# Wall-clock time allowed per judgment in the slow lane, where quarantined outliers are processed (seconds)
+SLOW_LANE_TIME_BUDGET = 600.0
+
+# Run-state files (manifest, quarantine queue, error logs, profiles) go to this subdirectory of
+# the output dir unless the step is given a state_dir; never read back as judgments
+STATE_DIR = ".state"
+
+# Returned by process_item for records that are deliberately not carried forward (e.g. duplicates)
+SKIP_RECORD = object()
+
+
+def partition_of(name: str, count: int) -> int:
+    """Stable partition (0..count-1) of an input record name, the same on every node."""
+    return zlib.crc32(name.encode("utf-8")) % count
+
 
 class BaseStep:
-    def __init__(self, input_dir, output_dir, remove_processed=False):
+    def __init__(self, input_dir, output_dir, remove_processed=False, time_budget=DOCUMENT_TIME_BUDGET,
+                 output_format="json", resume=False, quarantine_chars=None, quarantine_seconds=None,
+                 slow_lane_time_budget=SLOW_LANE_TIME_BUDGET, defer_slow_lane=False, partition=None,
+                 state_dir=None, trace_rules=False, **storage_options):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.remove_processed = remove_processed
+        self.time_budget = time_budget
+        # Skip inputs the manifest shows as done with a valid output (see pipeline/manifest.py)
+        self.resume = resume
+        # Outliers over these budgets go to the quarantine queue (see pipeline/quarantine.py)
+        self.quarantine_chars = quarantine_chars
+        self.quarantine_seconds = quarantine_seconds
+        self.slow_lane_time_budget = slow_lane_time_budget
+        # Leave the quarantine queue for run_slow_lane() instead of draining it at the end of run()
+        self.defer_slow_lane = defer_slow_lane
+        # (index, count): process only the input records of one partition (see pipeline/executors.py);
+        # the manifest, quarantine queue, error log and metrics get a per-partition name
+        self.partition = partition
+        self.partition_suffix = f".{partition[0]}-of-{partition[1]}" if partition else ""
+        # Time every rule call to name the hot rule of the slowest documents (always on while profiling)
+        self.trace_rules = trace_rules
+        # Input layout is detected; output layout is "json" (file per judgment) or "jsonl" (shards)
+        self.output_store = open_store(self.output_dir, output_format, **storage_options)
         os.makedirs(self.output_dir, exist_ok=True)
+        # Bookkeeping is kept apart from the records, which may be the published dataset
+        self.state_dir = Path(state_dir) if state_dir else self.output_dir / STATE_DIR
+        os.makedirs(self.state_dir, exist_ok=True)
 
         # Set up logging
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -23,77 +73,266 @@ class BaseStep:
             self.logger.setLevel(logging.INFO)
 
     def run(self):
+        """Process every input record; returns False if the input is missing or every record failed."""
         if not self.input_dir.exists():
             self.logger.error(f"Input directory not found: {self.input_dir}")
             print(f"[ERROR] Input directory not found: {self.input_dir}")
-            return
+            return False
 
-        files = list(self.input_dir.glob("*.json"))
-        if not files:
+        input_store = open_store(self.input_dir)
+        total = input_store.count()
+        if input_store.empty():
             self.logger.warning(f"No .json files found in {self.input_dir}")
             print(f"[WARNING] No .json files found in {self.input_dir}")
-            return
+            return True
 
-        print(f"Processing {len(files)} files from {self.input_dir} to {self.output_dir}...")
+        if total is None:
+            print(f"Processing {input_store.format_name} shards from {self.input_dir} to {self.output_dir}...")
+        else:
+            print(f"Processing {total} files from {self.input_dir} to {self.output_dir}...")
+        if self.partition:
+            print(f"  (partition {self.partition[0] + 1} of {self.partition[1]})")
+            total = None
 
-        failed_files = []
-        successful = 0
-        renamed_count = 0
-        processed_files = []  # Track files to delete
+        # Imported here: pool and streaming workers import this module but draw no progress bars
+        from tqdm import tqdm
 
-        for file in tqdm(files):
-            try:
-                with open(file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                processed_data = self.process_item(data)
-
-                if processed_data:
-                    # ✅ Check if judgment_id changed (file renaming needed)
-                    old_id = file.stem  # Filename without extension
-                    new_id = processed_data.get("judgment_id", old_id)
-
-                    if old_id != new_id:
-                        # ID was regenerated - rename file to match
-                        out_path = self._build_out_path(new_id, file.name)
-                        if out_path.stem != new_id:
-                            self.logger.info(f"Path sanitized: {new_id} → {out_path.relative_to(self.output_dir)}")
-                        self.logger.info(f"Renaming: {old_id} → {new_id}")
-                        renamed_count += 1
-                    else:
-                        # ID unchanged - keep same filename
-                        out_path = self._build_out_path(file.stem, file.name)
-
-                    # Create parent directories if they don't exist (for hierarchical IDs)
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    with open(out_path, "w", encoding="utf-8") as out:
-                        json.dump(processed_data, out, indent=2, ensure_ascii=False)
-                    successful += 1
-                    processed_files.append(file)  # Track for deletion
-                else:
-                    failed_files.append((file.name, "process_item returned None"))
-                    self.logger.warning(f"Skipped {file.name}: process_item returned None")
-            except Exception as e:
-                failed_files.append((file.name, str(e)))
-                self.logger.error(f"Error processing {file.name}: {str(e)}", exc_info=True)
-                print(f"[ERROR] Error processing {file.name}: {str(e)}")
+        manifest = self._open_manifest()
+        # A fresh run re-decides what to quarantine; a resumed one keeps the queue
+        quarantine = self._quarantine_queue(reset=not self.resume)
+        state = self._new_run_state()
+
+        if profiler.enabled:
+            profiler.begin_step(self.__class__.__name__)
+        step_metrics = StepMetrics(f"{self.__class__.__name__}{self.partition_suffix}")
+
+        with self.output_store.writer() as writer:
+            for record in tqdm(self._records(input_store), total=total):
+                self._run_record(record, writer, manifest, quarantine, state, step_metrics)
+            if state["quarantined"] and self._slow_lane_inline():
+                self._run_slow_lane(quarantine, writer, manifest, state, step_metrics)
+
+        if manifest is not None:
+            manifest.close()
 
         # Remove processed files if requested
-        if self.remove_processed and processed_files:
-            self._remove_files(processed_files)
+        if self.remove_processed and state["processed_records"]:
+            self._remove_files(input_store, state["processed_records"])
+
+        self._report(state, step_metrics)
+
+        if profiler.enabled:
+            profile_path = profiler.write(profiler.end_step(), self.state_dir)
+            print(f"⏱️  Profile written to: {profile_path}")
+        return self._succeeded(state)
+
+    def run_slow_lane(self):
+        """Process the records an earlier run left in the quarantine queue (see defer_slow_lane)."""
+        quarantine = self._quarantine_queue()
+        if not len(quarantine):
+            print(f"[OK] Quarantine queue is empty: {self.state_dir}")
+            return True
+        manifest = self._open_manifest(resume=True)
+        state = self._new_run_state()
+        state["seen"] = len(quarantine)
+        step_metrics = StepMetrics(f"{self.__class__.__name__}{self.partition_suffix}.slow_lane")
+        with self.output_store.writer() as writer:
+            self._run_slow_lane(quarantine, writer, manifest, state, step_metrics)
+        if manifest is not None:
+            manifest.close()
+        self._report(state, step_metrics)
+        return self._succeeded(state)
+
+    def _open_manifest(self, resume=None):
+        # The manifest needs per-record output files; shards are rewritten on every run
+        resume = self.resume if resume is None else resume
+        if isinstance(self.output_store, FileStore):
+            return StepManifest(self.output_dir, resume=resume, state_dir=self.state_dir,
+                                filename=MANIFEST_FILE.replace(".jsonl", f"{self.partition_suffix}.jsonl"))
+        if resume:
+            print("[WARNING] --resume needs file-per-judgment output; reprocessing every record")
+        return None
+
+    def _quarantine_queue(self, reset=False):
+        return QuarantineQueue(self.state_dir, reset=reset,
+                               filename=QUARANTINE_FILE.replace(".jsonl", f"{self.partition_suffix}.jsonl"))
+
+    def _records(self, input_store):
+        if self.partition is None:
+            return input_store.records()
+        index, count = self.partition
+        return (record for record in input_store.records() if partition_of(record.name, count) == index)
+
+    def _slow_lane_inline(self):
+        if not self.defer_slow_lane:
+            return True
+        if not isinstance(self.output_store, FileStore):
+            # A later writer would replace the shards written now, so the slow lane cannot wait
+            print("[WARNING] Deferring the slow lane needs file-per-judgment output; running it now")
+            return True
+        return False
+
+    def _succeeded(self, state):
+        """A run succeeded unless records failed and none was processed (or was already done)."""
+        return not state["failed_files"] or state["successful"] + state["skipped"] + state["resumed"] > 0
 
-        # Report summary
-        print(f"\n[OK] Successfully processed: {successful}/{len(files)}")
-        if renamed_count > 0:
-            print(f"[RENAMED] Files renamed (ID regenerated): {renamed_count}")
-        if failed_files:
-            print(f"[FAILED] Failed: {len(failed_files)}/{len(files)}")
-            self._write_error_log(failed_files)
+    def _new_run_state(self):
+        return {"seen": 0, "successful": 0, "renamed": 0, "skipped": 0, "resumed": 0, "quarantined": 0,
+                "slow_lane": 0, "failed_files": [], "processed_records": [], "over_budget": []}
+
+    def _run_record(self, record, writer, manifest, quarantine, state, step_metrics, slow_lane=False):
+        """Process one stored record: resume, quarantine, or apply the step and write the result."""
+        if not slow_lane:
+            state["seen"] += 1
+        try:
+            raw = record.raw()
+            input_hash = hash_bytes(raw) if manifest is not None else None
+            if manifest is not None and self.resume and not slow_lane:
+                entry = manifest.completed(record.name, input_hash)
+                if entry is not None:
+                    self.resume_item(entry)
+                    state["resumed"] += 1
+                    state["processed_records"].append(record)
+                    return
+            data = codec.loads(raw)
+            # ✅ Remember the incoming ID (file renaming needed if it changes)
+            old_id = record.stem or data.get("judgment_id") or record.name
+            text_length = len(data.get("text", ""))
+
+            if not slow_lane and self.quarantine_chars is not None and text_length > self.quarantine_chars:
+                quarantine.put(record, raw, "size", text_length=text_length)
+                state["quarantined"] += 1
+                return
+
+            if slow_lane:
+                time_budget = self.slow_lane_time_budget
+            elif self.quarantine_seconds is not None:
+                time_budget = min(self.quarantine_seconds, self.time_budget or self.quarantine_seconds)
+            else:
+                time_budget = self.time_budget
+            started = time.perf_counter()
+            # Records cut short by the main-lane budget are redone, so only the slow lane warns
+            to_quarantine = not slow_lane and self.quarantine_seconds is not None
+            processed_data, exceeded, hot_rule = self.apply(data, old_id, record.name, time_budget=time_budget,
+                                                            warn=not to_quarantine)
+            seconds = time.perf_counter() - started
+            step_metrics.observe(seconds, len(raw), old_id, text_length, hot_rule)
+
+            if processed_data is SKIP_RECORD:
+                state["skipped"] += 1
+                state["processed_records"].append(record)
+                if manifest is not None:
+                    manifest.record(record.name, input_hash)
+                return
+
+            if exceeded and to_quarantine:
+                # Cut short by the main-lane budget: redo it in the slow lane instead of keeping partial results
+                quarantine.put(record, raw, "time", text_length=text_length, seconds=round(seconds, 3),
+                               hot_rule=hot_rule[0] if hot_rule else None)
+                state["quarantined"] += 1
+                return
+
+            if exceeded:
+                state["over_budget"].append(record.name)
+
+            if processed_data:
+                new_id = processed_data.get("judgment_id", old_id)
+                out_path = writer.write(new_id, processed_data, fallback_stem=old_id)
+                if manifest is not None:
+                    manifest.record(record.name, input_hash, out_path, new_id)
+
+                if old_id != new_id:
+                    # ID was regenerated - file written under the new ID
+                    if self.output_store.format_name == "json" and out_path.stem != new_id:
+                        self.logger.info(f"Path sanitized: {new_id} → {out_path.relative_to(self.output_dir)}")
+                    self.logger.info(f"Renaming: {old_id} → {new_id}")
+                    state["renamed"] += 1
+
+                state["successful"] += 1
+                state["processed_records"].append(record)  # Track for deletion
+            else:
+                state["failed_files"].append((record.name, "process_item returned None"))
+                self.logger.warning(f"Skipped {record.name}: process_item returned None")
+        except Exception as e:
+            state["failed_files"].append((record.name, str(e)))
+            self.logger.error(f"Error processing {record.name}: {str(e)}", exc_info=True)
+            print(f"[ERROR] Error processing {record.name}: {str(e)}")
+
+    def _run_slow_lane(self, quarantine, writer, manifest, state, step_metrics):
+        """Process quarantined records one by one under the slow-lane time budget."""
+        records = list(quarantine.records())
+        print(f"\n[SLOW LANE] Processing {len(records)} quarantined record(s) "
+              f"(time budget: {self.slow_lane_time_budget}s)...")
+        failed_before = len(state["failed_files"])
+        done = []
+        for record in records:
+            self._run_record(record, writer, manifest, quarantine, state, step_metrics, slow_lane=True)
+            if len(state["failed_files"]) == failed_before:
+                done.append(record.name)
+                state["slow_lane"] += 1
+            failed_before = len(state["failed_files"])
+        # Failed records stay queued for another attempt
+        quarantine.remove(done)
+
+    def _report(self, state, step_metrics):
+        print(f"\n[OK] Successfully processed: {state['successful']}/{state['seen']}")
+        if state["resumed"]:
+            print(f"[RESUMED] Already done in an earlier run: {state['resumed']}")
+        if state["renamed"] > 0:
+            print(f"[RENAMED] Files renamed (ID regenerated): {state['renamed']}")
+        if state["skipped"]:
+            print(f"[SKIPPED] Not carried forward: {state['skipped']}")
+        if state["quarantined"]:
+            print(f"[QUARANTINED] Over the size/time budget, moved to the slow lane: {state['quarantined']} "
+                  f"(processed there: {state['slow_lane']})")
+        if state["over_budget"]:
+            print(f"[WARNING] Time budget ({self.time_budget}s) exceeded, extraction incomplete: {len(state['over_budget'])} file(s)")
+        if state["failed_files"]:
+            print(f"[FAILED] Failed: {len(state['failed_files'])}/{state['seen']}")
+            self._write_error_log(state["failed_files"])
+        step_metrics.finish(succeeded=state["successful"], skipped=state["skipped"], resumed=state["resumed"],
+                            quarantined=state["quarantined"], slow_lane=state["slow_lane"],
+                            failed=len(state["failed_files"]))
+
+    def apply(self, data, old_id, name, time_budget=None, warn=True):
+        """
+        Run process_item on one record under the time budget (and the profiler, if on).
+
+        Returns (processed_data, budget_exceeded, hot_rule) with hot_rule the
+        (rule_id, seconds) that took the most regex time, or None (also when
+        rule calls are not traced); shared by run() and the streaming runtime.
+        """
+        rule_registry.rule_times = rule_times = {} if self.trace_rules or profiler.enabled else None
+        try:
+            with rule_registry.time_budget(time_budget or self.time_budget) as budget:
+                if profiler.enabled:
+                    with profiler.document(old_id, len(data.get("text", ""))):
+                        processed_data = self.process_item(data)
+                else:
+                    processed_data = self.process_item(data)
+        finally:
+            rule_registry.rule_times = None
+
+        exceeded = bool(budget.exceeded and processed_data and processed_data is not SKIP_RECORD)
+        if exceeded and warn:
+            self._record_budget_warning(processed_data, budget)
+            self.logger.warning(f"Time budget exceeded for {name}: skipped {sorted(budget.skipped)}")
+        hot_rule = max(rule_times.items(), key=lambda item: item[1]) if rule_times else None
+        return processed_data, exceeded, hot_rule
+
+    def _record_budget_warning(self, data, budget):
+        """Attach a warning to a judgment whose extraction was cut short by the time budget."""
+        data.setdefault("processing_warnings", []).append({
+            "step": self.__class__.__name__,
+            "type": "time_budget_exceeded",
+            "budget_seconds": budget.seconds,
+            "rules_skipped": budget.skipped,
+            "timestamp": datetime.now().isoformat()
+        })
 
     def _write_error_log(self, failed_files):
-        """Write error log to output directory."""
-        error_log_path = self.output_dir / f"errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        """Write error log to the state directory."""
+        error_log_path = self.state_dir / f"errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}{self.partition_suffix}.json"
         error_data = {
             "timestamp": datetime.now().isoformat(),
             "step": self.__class__.__name__,
@@ -103,25 +342,31 @@ class BaseStep:
                 for filename, error in failed_files
             ]
         }
-        with open(error_log_path, "w", encoding="utf-8") as f:
+        with atomic_open(error_log_path, "w") as f:
             json.dump(error_data, f, indent=2, ensure_ascii=False)
         print(f"📝 Error log written to: {error_log_path}")
 
-    def _remove_files(self, files):
-        """Remove processed files from the input directory."""
+    def _remove_files(self, input_store, records):
+        """Remove processed records from the input directory."""
+        if not isinstance(input_store, FileStore):
+            # Shards are removed only once every record in them was processed
+            removed_count = input_store.remove(records)
+            print(f"🗑️  Removed {removed_count}/{len(records)} processed records from input directory")
+            return
+
         removed_count = 0
         failed_removals = []
 
-        for file in files:
+        for record in records:
             try:
-                file.unlink()
+                (self.input_dir / record.name).unlink()
                 removed_count += 1
-                self.logger.debug(f"Removed: {file.name}")
+                self.logger.debug(f"Removed: {record.name}")
             except Exception as e:
-                failed_removals.append((file.name, str(e)))
-                self.logger.error(f"Failed to remove {file.name}: {str(e)}")
+                failed_removals.append((record.name, str(e)))
+                self.logger.error(f"Failed to remove {record.name}: {str(e)}")
 
-        print(f"🗑️  Removed {removed_count}/{len(files)} processed files from input directory")
+        print(f"🗑️  Removed {removed_count}/{len(records)} processed files from input directory")
         if failed_removals:
             print(f"⚠️  Failed to remove {len(failed_removals)} file(s)")
             for filename, error in failed_removals:
@@ -130,21 +375,14 @@ class BaseStep:
     def process_item(self, data):
         raise NotImplementedError("Subclasses must implement process_item")
 
+    def resume_item(self, entry):
+        """Called instead of process_item for a record resumed from the manifest (for step state)."""
+        pass
+
     def _build_out_path(self, judgment_id: str, original_filename: str) -> Path:
         """Return a filesystem-safe path for a judgment ID while keeping directory semantics."""
-        parts = [self._sanitize_segment(p) for p in re.split(r"[\\/]+", judgment_id) if p]
-        if not parts:
-            parts = [self._sanitize_segment(Path(original_filename).stem)]
-
-        # Last part becomes the filename; preceding parts become directories
-        filename = f"{parts[-1]}.json"
-        subdirs = parts[:-1]
-        return self.output_dir.joinpath(*subdirs, filename)
+        return build_record_path(self.output_dir, judgment_id, Path(original_filename).stem)
 
     def _sanitize_segment(self, segment: str) -> str:
         """Strip unsafe characters and normalize whitespace for safe filesystem usage."""
-        cleaned = segment.strip()
-        cleaned = re.sub(r'[<>:"|?*]', "_", cleaned)
-        cleaned = re.sub(r"\s+", "-", cleaned)
-        return cleaned or "unnamed"
-
+        return sanitize_segment(segment)
@@ -0,0 +1,205 @@
+"""
+Dependency-aware scheduling of pipeline steps.
+
+Each step is a ``StepNode`` with the paths it reads and writes; a step
+depends on every step that writes one of its inputs. The scheduler keeps a
+state file recording, per step, the fingerprint of its inputs and outputs
+at the end of its last successful run. A step is stale when it never ran,
+its outputs changed or disappeared since, or its inputs (including the
+step's parameters) no longer match: rerunning "citations" changes its
+output, so similarity, cluster and consolidate become stale too.
+
+Fingerprints hash file names, sizes and modification times (like make),
+not contents. Reports, indexes and hidden files (run state, temp files) are
+left out: a step rewrites them on runs that change no record, and they must
+not make the steps after it stale. With ``jobs > 1`` independent branches (e.g. similarity →
+cluster and consolidation, which only need the citations output) run
+concurrently in separate processes.
+"""
+import hashlib
+import multiprocessing
+import os
+from multiprocessing.connection import wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from legal_ai_toolkit.pipeline.storage import CONTENT_INDEX_FILE, REPORT_FILE_PREFIXES
+from legal_ai_toolkit.utils import codec
+
+
+class StepNode(NamedTuple):
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    params: Dict = {}
+
+
+def _fingerprinted(name: str) -> bool:
+    return not (name.startswith(".") or name.startswith(REPORT_FILE_PREFIXES) or name == CONTENT_INDEX_FILE)
+
+
+def fingerprint(paths: Iterable[str], params: Optional[Dict] = None) -> str:
+    """Hash of the names, sizes and mtimes of the files under paths (plus params); see _fingerprinted."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(codec.dumpb(params or {}))
+    for path in paths:
+        path = Path(path)
+        digest.update(str(path).encode("utf-8"))
+        if not path.exists():
+            digest.update(b"\0missing")
+            continue
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(filter(_fingerprinted, files)):
+                file_path = os.path.join(root, name)
+                stat = os.stat(file_path)
+                digest.update(f"\0{os.path.relpath(file_path, path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class DAGScheduler:
+    def __init__(self, nodes: List[StepNode], state_file):
+        self.nodes = {node.name: node for node in nodes}
+        self.order = [node.name for node in nodes]
+        self.state_file = Path(state_file)
+        self.state = codec.load(self.state_file) if self.state_file.exists() else {}
+
+        writers = {}
+        for node in nodes:
+            for output in node.outputs:
+                writers[os.path.normpath(output)] = node.name
+        self.deps = {
+            node.name: sorted({writers[os.path.normpath(i)] for i in node.inputs if os.path.normpath(i) in writers} - {node.name},
+                              key=self.order.index)
+            for node in nodes
+        }
+
+    def downstream(self, name: str) -> List[str]:
+        """Every step that (transitively) reads the outputs of name, in pipeline order."""
+        found = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for other, deps in self.deps.items():
+                if current in deps and other not in found:
+                    found.add(other)
+                    frontier.append(other)
+        return [n for n in self.order if n in found]
+
+    def upstream(self, names: Iterable[str]) -> Set[str]:
+        found = set(names)
+        frontier = list(found)
+        while frontier:
+            for dep in self.deps[frontier.pop()]:
+                if dep not in found:
+                    found.add(dep)
+                    frontier.append(dep)
+        return found
+
+    def is_stale(self, name: str) -> bool:
+        node = self.nodes[name]
+        recorded = self.state.get(name)
+        if not recorded:
+            return True
+        if any(not Path(output).exists() for output in node.outputs):
+            return True
+        return (recorded.get("outputs") != fingerprint(node.outputs)
+                or recorded.get("inputs") != fingerprint(node.inputs, node.params))
+
+    def stale(self) -> List[str]:
+        """Steps that would run now: stale ones and everything downstream of them."""
+        result = set()
+        for name in self.order:
+            if name in result:
+                continue
+            if self.is_stale(name):
+                result.add(name)
+                result.update(self.downstream(name))
+        return [n for n in self.order if n in result]
+
+    def record(self, name: str, inputs_fingerprint: str):
+        node = self.nodes[name]
+        self.state[name] = {
+            "inputs": inputs_fingerprint,
+            "outputs": fingerprint(node.outputs),
+            "completed_at": datetime.now().isoformat()
+        }
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(self.state, self.state_file, pretty=True)
+
+    def run(self, run_node: Callable[[str], None], targets: Optional[Iterable[str]] = None,
+            force: bool = False, jobs: int = 1) -> Dict[str, str]:
+        """
+        Run the stale steps needed for targets (default: all), in dependency order.
+
+        ``run_node(name)`` runs one step; with jobs > 1 it is called in a child
+        process, up to jobs at a time. A step whose dependency failed is not
+        run. Returns {step: "ran" | "up-to-date" | "failed" | "blocked"}.
+        """
+        wanted = self.upstream(targets) if targets else set(self.order)
+        pending = [n for n in self.order if n in wanted]
+        status: Dict[str, str] = {}
+        running: Dict[str, Tuple[multiprocessing.Process, str]] = {}
+
+        def ready(name):
+            return all(dep in status for dep in self.deps[name] if dep in wanted)
+
+        def start(name):
+            if any(status.get(dep) in ("failed", "blocked") for dep in self.deps[name]):
+                status[name] = "blocked"
+                return
+            if not (force or self.is_stale(name)):
+                print(f"[UP-TO-DATE] {name}")
+                status[name] = "up-to-date"
+                return
+            inputs_fingerprint = fingerprint(self.nodes[name].inputs, self.nodes[name].params)
+            if jobs <= 1:
+                try:
+                    run_node(name)
+                except Exception as e:
+                    print(f"[FAILED] {name}: {e}")
+                    status[name] = "failed"
+                    return
+                self._finish(name, inputs_fingerprint, status)
+                return
+            process = multiprocessing.Process(target=run_node, args=(name,), name=f"step-{name}")
+            process.start()
+            running[name] = (process, inputs_fingerprint)
+
+        while pending or running:
+            # Start ready steps; steps found up to date can unblock others straight away
+            started = True
+            while started:
+                started = False
+                for name in [n for n in pending if ready(n)]:
+                    if jobs > 1 and len(running) >= jobs:
+                        break
+                    pending.remove(name)
+                    start(name)
+                    started = True
+            if not running:
+                if pending:
+                    raise RuntimeError(f"Unschedulable steps: {', '.join(pending)}")
+                break
+
+            # Wait for any running step to finish
+            finished = wait([p.sentinel for p, _ in running.values()])
+            for name, (process, inputs_fingerprint) in list(running.items()):
+                if process.sentinel in finished:
+                    process.join()
+                    del running[name]
+                    if process.exitcode == 0:
+                        self._finish(name, inputs_fingerprint, status)
+                    else:
+                        print(f"[FAILED] {name} (exit code {process.exitcode})")
+                        status[name] = "failed"
+        return status
+
+    def _finish(self, name, inputs_fingerprint, status):
+        self.record(name, inputs_fingerprint)
+        status[name] = "ran"
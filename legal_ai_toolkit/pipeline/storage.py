@@ -0,0 +1,319 @@
+"""
+Storage backends for the judgment records passed between pipeline steps.
+
+Two layouts are supported:
+
+- ``json``: one ``<judgment_id>.json`` file per judgment (the original
+  layout, still used for the final processed dataset).
+- ``jsonl``: sharded JSON Lines, ``shard-00000.jsonl[.gz|.zst]`` with up to
+  ``shard_size`` compact records per shard. At 200k judgments this turns
+  ~1.4M small file creates per run into a few hundred shard writes.
+
+Records are serialized with ``utils.codec`` (compact unless pretty printing
+is switched on; shard lines are always compact). Both stream record by record. Readers detect the layout of an existing
+directory, so a step can read per-file input and write sharded output (and
+vice versa). Files and shards are written atomically (``utils.atomic``), so
+a killed run never leaves a truncated record behind.
+"""
+import gzip
+import io
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for compression="zstd"
+    zstandard = None
+
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import commit, temp_path
+
+# Reports a step writes next to its output; never read back as judgments
+REPORT_FILE_PREFIXES = ("errors_", "profile_", "duplicates_")
+# content_hash -> judgment_id and source of everything ingested into a file-per-judgment output dir
+CONTENT_INDEX_FILE = "content_index.jsonl"
+
+DEFAULT_SHARD_SIZE = 1000
+SHARD_PREFIX = "shard-"
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class StoredRecord(NamedTuple):
+    """One judgment in a store; ``load()`` parses it so read errors stay per-record."""
+    name: str                   # path in the store or "<shard>:<line>", used in logs
+    stem: Optional[str]         # ID implied by the location (path without .json), None for shards
+    load: Callable[[], Dict]
+    raw: Callable[[], bytes]    # serialized bytes (hashed for the step manifest)
+
+
+def sanitize_segment(segment: str) -> str:
+    """Strip unsafe characters and normalize whitespace for safe filesystem usage."""
+    cleaned = segment.strip()
+    cleaned = re.sub(r'[<>:"|?*]', "_", cleaned)
+    cleaned = re.sub(r"\s+", "-", cleaned)
+    return cleaned or "unnamed"
+
+
+def build_record_path(root: Path, judgment_id: str, fallback_stem: str) -> Path:
+    """Return a filesystem-safe path for a judgment ID while keeping directory semantics."""
+    parts = [sanitize_segment(p) for p in re.split(r"[\\/]+", judgment_id) if p]
+    if not parts:
+        parts = [sanitize_segment(fallback_stem)]
+
+    # Last part becomes the filename; preceding parts become directories
+    return Path(root).joinpath(*parts[:-1], f"{parts[-1]}.json")
+
+
+class JudgmentStore:
+    """Base class for a directory of judgment records."""
+
+    format_name = None
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def records(self) -> Iterator[StoredRecord]:
+        raise NotImplementedError
+
+    def count(self) -> Optional[int]:
+        """Number of records, if it can be known without reading them."""
+        return None
+
+    def empty(self) -> bool:
+        return next(iter(self.records()), None) is None
+
+    def iter_judgments(self) -> Iterator[Dict]:
+        """Yield parsed judgments, in storage order."""
+        for record in self.records():
+            yield record.load()
+
+    def raw_records(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield (name, unparsed JSON bytes), for handing records to worker processes."""
+        raise NotImplementedError
+
+    @contextmanager
+    def writer(self):
+        raise NotImplementedError
+        yield
+
+    def remove(self, records: List[StoredRecord]) -> int:
+        """Remove processed records; returns the number removed."""
+        raise NotImplementedError
+
+
+class FileStore(JudgmentStore):
+    """One JSON file per judgment."""
+
+    format_name = "json"
+
+    def _files(self) -> List[Path]:
+        # Recursive: hierarchical IDs ("IN-TRIBUNAL/LOWER-...") are written to subdirectories;
+        # hidden ones (a step's .state) hold no judgments
+        return sorted(
+            f for f in self.path.rglob("*.json")
+            if not f.name.startswith(REPORT_FILE_PREFIXES)
+            and not any(part.startswith(".") for part in f.relative_to(self.path).parts[:-1])
+        )
+
+    def _name(self, file: Path) -> str:
+        """Path relative to the store, e.g. "IN-TRIBUNAL/LOWER-CEN-2001-CR-0FFAFD.json"."""
+        return file.relative_to(self.path).as_posix()
+
+    def records(self) -> Iterator[StoredRecord]:
+        for file in self._files():
+            name = self._name(file)
+            yield StoredRecord(name, name[:-len(".json")], lambda file=file: _load_file(file), file.read_bytes)
+
+    def raw_records(self) -> Iterator[Tuple[str, bytes]]:
+        for file in self._files():
+            yield self._name(file), file.read_bytes()
+
+    def count(self) -> int:
+        return len(self._files())
+
+    def empty(self) -> bool:
+        return self.count() == 0
+
+    @contextmanager
+    def writer(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        yield FileWriter(self.path)
+
+    def remove(self, records: List[StoredRecord]) -> int:
+        removed = 0
+        for record in records:
+            (self.path / record.name).unlink()
+            removed += 1
+        return removed
+
+
+class FileWriter:
+    def __init__(self, root: Path):
+        self.root = root
+        self.written = 0
+
+    def write(self, judgment_id: str, data: Dict, fallback_stem: str = "unnamed") -> Path:
+        out_path = build_record_path(self.root, judgment_id, fallback_stem)
+        # Create parent directories if they don't exist (for hierarchical IDs)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(data, out_path)
+        self.written += 1
+        return out_path
+
+
+class ShardedJSONLStore(JudgmentStore):
+    """Judgments as compact JSON lines, split into shards of ``shard_size`` records."""
+
+    format_name = "jsonl"
+
+    def __init__(self, path, shard_size: int = DEFAULT_SHARD_SIZE, compression: Optional[str] = None):
+        super().__init__(path)
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compression} (expected one of gzip, zstd)")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("compression='zstd' requires the 'zstandard' package")
+        self.shard_size = shard_size
+        self.compression = compression
+        # shard name -> records read, filled in by records() for remove()
+        self._shard_sizes: Dict[str, int] = {}
+
+    def shards(self) -> List[Path]:
+        return sorted(self.path.glob(f"{SHARD_PREFIX}*.jsonl*"))
+
+    def empty(self) -> bool:
+        return not self.shards()
+
+    def records(self) -> Iterator[StoredRecord]:
+        for shard in self.shards():
+            lines = 0
+            with _open_shard(shard, "r") as f:
+                for lineno, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    lines += 1
+                    yield StoredRecord(f"{shard.name}:{lineno}", None, lambda line=line: codec.loads(line), lambda line=line: line)
+            self._shard_sizes[shard.name] = lines
+
+    def raw_records(self) -> Iterator[Tuple[str, bytes]]:
+        for shard in self.shards():
+            with _open_shard(shard, "r") as f:
+                for lineno, line in enumerate(f, start=1):
+                    if line.strip():
+                        yield f"{shard.name}:{lineno}", line
+
+    @contextmanager
+    def writer(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        stale = self.shards()
+        writer = ShardWriter(self.path, self.shard_size, self.compression)
+        try:
+            yield writer
+        finally:
+            writer.close()
+            # A rerun rewrites the directory; drop shards left over from a larger previous run
+            for shard in stale:
+                if shard not in writer.paths:
+                    shard.unlink()
+
+    def remove(self, records: List[StoredRecord]) -> int:
+        """Remove shards whose records were all processed; returns the records removed."""
+        done: Dict[str, int] = {}
+        for record in records:
+            shard_name = record.name.rsplit(":", 1)[0]
+            done[shard_name] = done.get(shard_name, 0) + 1
+
+        removed = 0
+        for shard_name, count in done.items():
+            if count == self._shard_sizes.get(shard_name):
+                (self.path / shard_name).unlink()
+                removed += count
+        return removed
+
+
+class ShardWriter:
+    def __init__(self, root: Path, shard_size: int, compression: Optional[str]):
+        self.root = root
+        self.shard_size = shard_size
+        self.compression = compression
+        self.paths: List[Path] = []
+        self.written = 0
+        self._in_shard = 0
+        self._file = None
+        self._tmp = None
+
+    def _next_shard(self):
+        self.close()
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        path = self.root / f"{SHARD_PREFIX}{len(self.paths):05d}.jsonl{suffix}"
+        self.paths.append(path)
+        # Each shard is written to a temp file and renamed into place when complete
+        self._tmp = temp_path(path)
+        self._file = _open_shard(path, "w", target=self._tmp)
+        self._in_shard = 0
+
+    def write(self, judgment_id: str, data: Dict, fallback_stem: str = "unnamed") -> Path:
+        if self._file is None or self._in_shard >= self.shard_size:
+            self._next_shard()
+        self._file.write(codec.dumpb(data, pretty=False))
+        self._file.write(b"\n")
+        self._in_shard += 1
+        self.written += 1
+        return self.paths[-1]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            commit(self._tmp, self.paths[-1])
+
+
+STORAGE_FORMATS = {
+    FileStore.format_name: FileStore,
+    ShardedJSONLStore.format_name: ShardedJSONLStore,
+}
+
+
+def detect_format(path) -> str:
+    """Return the layout of an existing directory ("jsonl" if it holds shards, else "json")."""
+    path = Path(path)
+    if path.exists() and next(path.glob(f"{SHARD_PREFIX}*.jsonl*"), None) is not None:
+        return ShardedJSONLStore.format_name
+    return FileStore.format_name
+
+
+def open_store(path, format: Optional[str] = None, **options) -> JudgmentStore:
+    """
+    Open a judgment store at path.
+
+    ``format`` is "json" or "jsonl"; when None, it is detected from the
+    directory contents. ``options`` (shard_size, compression) apply to jsonl.
+    """
+    format = format or detect_format(path)
+    if format not in STORAGE_FORMATS:
+        raise ValueError(f"Unknown storage format: {format} (expected one of {', '.join(STORAGE_FORMATS)})")
+    if format == FileStore.format_name:
+        return FileStore(path)
+    return ShardedJSONLStore(path, **options)
+
+
+def _load_file(path: Path) -> Dict:
+    return codec.load(path)
+
+
+def _open_shard(path: Path, mode: str, target: Optional[Path] = None):
+    """Open a shard in binary mode, (de)compressing by suffix; target is the file actually opened."""
+    target = target or path
+    if path.suffix == ".gz":
+        return gzip.open(target, mode + "b")
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError(f"Reading {path.name} requires the 'zstandard' package")
+        if mode == "r":
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(target, "rb")))
+        return zstandard.ZstdCompressor().stream_writer(open(target, "wb"))
+    return open(target, mode + "b")
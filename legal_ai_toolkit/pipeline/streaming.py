@@ -0,0 +1,166 @@
+"""
+Streaming runtime: judgments flow through the per-record steps one by one.
+
+The batch pipeline runs each step over the whole corpus before the next
+starts, writing every intermediate directory. Here each per-record step
+(dedup → metadata → issues → classify → id_regen → transitions → citations) runs in
+its own process, connected by bounded queues, so document 1000 can be
+ingested while document 10 has its citations extracted. A full queue blocks
+the stage feeding it (backpressure), so at most ``queue_size`` records wait
+between any two stages whatever the corpus size.
+
+Only the outputs later steps need are written: the citations-extracted
+records (read by similarity) and the consolidated judgments. Barriers remain
+where a step needs the whole corpus:
+
+- near-duplicate detection picks the canonical copy of a group only once it
+  has seen every member, so with ``dedup=True`` ingestion completes and the
+  groups are computed before records are streamed from the normalized dir
+  (``dedup=False`` streams straight from ingestion, without the step);
+- similarity and clustering run after the stream has drained.
+
+Stages run in record-arrival order, which with parallel ingestion is not
+the sorted order of the batch pipeline; ID collisions in id_regen may be
+resolved in a different order.
+"""
+import queue
+import threading
+import time
+from multiprocessing import Process, Queue
+from typing import Dict, Iterable, List, Tuple
+
+from legal_ai_toolkit.pipeline.runner import SKIP_RECORD, BaseStep
+from legal_ai_toolkit.utils.metrics import StepMetrics
+from legal_ai_toolkit.utils.profiling import profiler
+from legal_ai_toolkit.utils.warmup import prefork_warm_up, warm_up
+
+# Records waiting between two stages, at most
+DEFAULT_QUEUE_SIZE = 64
+
+# How often the sink checks that every stage process is still alive (seconds)
+LIVENESS_INTERVAL = 1.0
+
+# Marks the end of the stream on a queue
+END = None
+
+
+def _stage_worker(name, step, inbox, outbox, stats):
+    """One stage: apply a step to every record from inbox and pass the result on."""
+    # Compile rules before the first record arrives (already done if forked from a warm parent)
+    warm_start = warm_up()
+    counts = {"processed": 0, "skipped": 0, "over_budget": 0}
+    failed = []
+    if profiler.enabled:
+        profiler.begin_step(step.__class__.__name__)
+    step_metrics = StepMetrics(step.__class__.__name__)
+
+    while True:
+        item = inbox.get()
+        if item is END:
+            break
+        source_id, data = item
+        started = time.perf_counter()
+        hot_rule = None
+        try:
+            processed_data, exceeded, hot_rule = step.apply(data, source_id, source_id)
+        except Exception as e:
+            failed.append((source_id, str(e)))
+            step.logger.error(f"Error processing {source_id}: {str(e)}", exc_info=True)
+            continue
+        finally:
+            text_length = len(data.get("text", ""))
+            step_metrics.observe(time.perf_counter() - started, text_length, source_id, text_length, hot_rule)
+        if processed_data is SKIP_RECORD:
+            counts["skipped"] += 1
+            continue
+        if not processed_data:
+            failed.append((source_id, "process_item returned None"))
+            continue
+        counts["over_budget"] += exceeded
+        counts["processed"] += 1
+        outbox.put((source_id, processed_data))
+
+    outbox.put(END)
+    if failed:
+        step._write_error_log(failed)
+    if profiler.enabled:
+        profiler.write(profiler.end_step(), step.state_dir)
+    counts["failed"] = len(failed)
+    step_metrics.finish(**counts, warm_start=warm_start)
+    stats.put((name, counts))
+
+
+class StreamingRunner:
+    """
+    Run a chain of BaseStep stages over a stream of records.
+
+    stages is a list of (name, step) with step a BaseStep instance; only
+    its state dir receives files (errors_, profile_), records are passed
+    in memory. The sink is called in this process with each
+    (source_id, record) leaving the last stage. With prefork, rules and
+    lookup indexes are built here before the stages fork (see utils/warmup.py).
+    """
+
+    def __init__(self, stages: List[Tuple[str, BaseStep]], queue_size: int = DEFAULT_QUEUE_SIZE,
+                 prefork: bool = True):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.prefork = prefork
+
+    def run(self, source: Iterable[Dict], sink) -> Dict[str, Dict]:
+        if self.prefork:
+            prefork_warm_up()
+        queues = [Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stats = Queue()
+        processes = []
+        for i, (name, step) in enumerate(self.stages):
+            process = Process(target=_stage_worker, name=f"stage-{name}",
+                              args=(name, step, queues[i], queues[i + 1], stats))
+            process.start()
+            processes.append(process)
+
+        # Feed from a thread: the sink must keep draining while the source blocks on a full queue
+        feed_error = []
+        fed = {"records": 0}
+
+        def feed():
+            try:
+                for data in source:
+                    queues[0].put((data.get("judgment_id"), data))
+                    fed["records"] += 1
+            except BaseException as e:
+                feed_error.append(e)
+            finally:
+                queues[0].put(END)
+
+        feeder = threading.Thread(target=feed, name="stream-feeder", daemon=True)
+        feeder.start()
+
+        try:
+            while True:
+                try:
+                    item = queues[-1].get(timeout=LIVENESS_INTERVAL)
+                except queue.Empty:
+                    dead = [p.name for p in processes if p.exitcode not in (None, 0)]
+                    if dead:
+                        raise RuntimeError(f"Stage process died: {', '.join(dead)}")
+                    continue
+                if item is END:
+                    break
+                sink(*item)
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            feeder.join(timeout=LIVENESS_INTERVAL)
+
+        results = {"source": fed}
+        for _ in processes:
+            name, counts = stats.get()
+            results[name] = counts
+        for process in processes:
+            process.join()
+        if feed_error:
+            raise feed_error[0]
+        return results
@@ -1,9 +1,33 @@
-from .ids import generate_judgment_id
-from .mappings import IPCBNSTransitionDB
-from .taxonomy import LegalIssueTaxonomy
-from .database import PrecedentDatabase
-from .demo import ShowcasePreparer
-from .data_access import load_processed_judgments, load_clusters, get_repo_root
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access
+_EXPORTS = {
+    "generate_judgment_id": ".ids",
+    "IPCBNSTransitionDB": ".mappings",
+    "LegalIssueTaxonomy": ".taxonomy",
+    "PrecedentDatabase": ".database",
+    "ShowcasePreparer": ".demo",
+    "load_processed_judgments": ".data_access",
+    "load_clusters": ".data_access",
+    "get_repo_root": ".data_access",
+    "RuleRegistry": ".rules",
+    "registry": ".rules",
+    "warm_up": ".warmup",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .ids import generate_judgment_id
+    from .mappings import IPCBNSTransitionDB
+    from .taxonomy import LegalIssueTaxonomy
+    from .database import PrecedentDatabase
+    from .demo import ShowcasePreparer
+    from .data_access import load_processed_judgments, load_clusters, get_repo_root
+    from .rules import RuleRegistry, registry
+    from .warmup import warm_up
 
 __all__ = [
     "generate_judgment_id",
@@ -13,5 +37,8 @@ __all__ = [
     "ShowcasePreparer",
     "load_processed_judgments",
     "load_clusters",
-    "get_repo_root"
+    "get_repo_root",
+    "RuleRegistry",
+    "registry",
+    "warm_up"
 ]
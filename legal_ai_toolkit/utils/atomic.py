@@ -0,0 +1,47 @@
+"""
+Atomic file replacement.
+
+Output is written to a hidden temp file in the target's directory and
+renamed over the target with ``os.replace`` once complete, so a process
+killed mid-write leaves the previous file (or none), never a truncated one.
+Temp names start with "." and end with ".tmp", so no store or glob of
+judgment files picks up a leftover one. They include the host name, so
+nodes writing to shared storage never share a temp file.
+"""
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+_HOST = socket.gethostname()
+
+
+def temp_path(path) -> Path:
+    """Unique temp file name next to path (per host, process and thread)."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{_HOST}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def commit(tmp, path):
+    os.replace(tmp, path)
+
+
+def discard(tmp):
+    try:
+        os.unlink(tmp)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_open(path, mode: str = "wb", encoding: str = "utf-8"):
+    """Open path for writing; the file appears only when the block completes without error."""
+    tmp = temp_path(path)
+    try:
+        with open(tmp, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+        commit(tmp, path)
+    except BaseException:
+        discard(tmp)
+        raise
@@ -0,0 +1,130 @@
+"""
+JSON codec used for every judgment record the pipeline reads or writes.
+
+The fastest available backend is picked at import time: ``orjson``, then
+``msgspec``, then the stdlib ``json`` module. All three produce UTF-8 JSON
+without ASCII escaping and read each other's output.
+
+Output is compact by default; serializing the large ``text`` field with
+``indent=2`` was a major share of every step. Pretty printing is a debug
+option: ``set_pretty(True)``, ``legal_ai_toolkit pipeline --pretty-json`` or
+``LEGAL_AI_PRETTY_JSON=1``.
+
+When ``msgspec`` is installed, ``decode_judgment`` decodes into the typed
+``JudgmentRecord`` (mirroring ``schemas/judgment.schema.json``) and raises
+``msgspec.ValidationError`` on records that do not match it.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from legal_ai_toolkit.utils.atomic import atomic_open
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+# Pretty-print output (debug option); compact otherwise
+PRETTY = os.environ.get("LEGAL_AI_PRETTY_JSON", "") not in ("", "0")
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder()
+    _msgspec_decoder = msgspec.json.Decoder()
+
+
+def set_pretty(enabled: bool = True):
+    """Switch pretty-printed (indent=2) output on or off for the whole process."""
+    global PRETTY
+    PRETTY = enabled
+    # Inherited by worker processes started afterwards
+    os.environ["LEGAL_AI_PRETTY_JSON"] = "1" if enabled else "0"
+
+
+def dumpb(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes."""
+    pretty = PRETTY if pretty is None else pretty
+    if BACKEND == "orjson":
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if BACKEND == "msgspec":
+        data = _msgspec_encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if pretty else data
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: Optional[bool] = None) -> str:
+    """Serialize obj to a JSON string."""
+    return dumpb(obj, pretty).decode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str."""
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    if BACKEND == "msgspec":
+        return _msgspec_decoder.decode(data)
+    return json.loads(data)
+
+
+def load(path) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump(obj: Any, path, pretty: Optional[bool] = None):
+    """Serialize obj to a JSON file (atomically: see utils.atomic)."""
+    data = dumpb(obj, pretty)
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+if msgspec is not None:
+    class Metadata(msgspec.Struct):
+        court: str
+        jurisdiction: str
+        year: Union[int, str]
+        court_level: Optional[str] = None
+        bench: Optional[Union[str, List[str]]] = None
+        case_number: Optional[str] = None
+        decision_date: Optional[str] = None
+
+    class Paragraph(msgspec.Struct):
+        para_id: int
+        text: str
+
+    class JudgmentRecord(msgspec.Struct):
+        """Typed view of a judgment (schemas/judgment.schema.json); extra fields are ignored."""
+        judgment_id: str
+        metadata: Metadata
+        text: str
+        paragraphs: List[Paragraph]
+        annotations: Dict[str, Any]
+
+    _judgment_decoder = msgspec.json.Decoder(JudgmentRecord)
+
+    def decode_judgment(data: Union[bytes, str]) -> "JudgmentRecord":
+        """Decode and validate a judgment against the schema's required fields."""
+        return _judgment_decoder.decode(data)
+else:
+    JudgmentRecord = None
+
+    def decode_judgment(data: Union[bytes, str]):
+        raise ImportError("decode_judgment requires the 'msgspec' package")
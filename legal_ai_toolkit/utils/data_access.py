@@ -1,16 +1,15 @@
-import json
 from pathlib import Path
+from legal_ai_toolkit.pipeline.storage import FileStore
+from legal_ai_toolkit.utils import codec
 
 def load_processed_judgments():
     pkg_root = Path(__file__).parent.parent
     data_dir = pkg_root / "data" / "judgments"
 
-    judgments = []
-    if data_dir.exists():
-        for file in data_dir.glob("*.json"):
-            with open(file, encoding="utf-8") as f:
-                judgments.append(json.load(f))
-    return judgments
+    # FileStore skips reports (REPORT_FILE_PREFIXES) and run state, and finds hierarchical IDs
+    if not data_dir.exists():
+        return []
+    return list(FileStore(data_dir).iter_judgments())
 
 def load_clusters(refined=True):
     repo_root = Path(__file__).parent.parent.parent
@@ -21,7 +20,7 @@ def load_clusters(refined=True):
 
     if cluster_file.exists():
         with open(cluster_file, encoding="utf-8") as f:
-            return json.load(f)
+            return codec.loads(f.read())
     return []
 
 def get_repo_root():
@@ -1,6 +1,7 @@
 import re
 import json
 from pathlib import Path
+from legal_ai_toolkit.utils.profiling import profiled
 
 
 class PrecedentDatabase:
@@ -10,6 +11,8 @@ class PrecedentDatabase:
     """
 
     LANDMARKS = {}
+    # (precedent_id, data, normalized short name, normalized aliases, year), built with LANDMARKS
+    MATCH_INDEX = []
 
     @classmethod
     def _ensure_loaded(cls):
@@ -21,6 +24,11 @@ class PrecedentDatabase:
             else:
                 # Fallback to empty or minimal set if file missing
                 cls.LANDMARKS = {}
+            cls.MATCH_INDEX = [
+                (prec_id, data, cls._normalize_for_match(data["short_name"]),
+                 [cls._normalize_for_match(alias) for alias in data.get("aliases", [])], str(data["year"]))
+                for prec_id, data in cls.LANDMARKS.items()
+            ]
 
     @staticmethod
     def _normalize_for_match(text: str) -> str:
@@ -34,15 +42,15 @@ class PrecedentDatabase:
         return text.strip()
 
     @classmethod
+    @profiled("database.match_citation", matches=lambda landmark: 1 if landmark else 0)
     def match_citation(cls, citation_text: str):
         """Match extracted citation to known landmark"""
         cls._ensure_loaded()
         citation_upper = citation_text.upper()
         citation_norm = cls._normalize_for_match(citation_text)
 
-        for prec_id, data in cls.LANDMARKS.items():
+        for prec_id, data, short_name_norm, alias_norms, year in cls.MATCH_INDEX:
             # 1. Match by short name (normalized)
-            short_name_norm = cls._normalize_for_match(data["short_name"])
             if short_name_norm and short_name_norm in citation_norm:
                 return {
                     "precedent_id": prec_id,
@@ -51,8 +59,7 @@ class PrecedentDatabase:
                 }
 
             # 2. Match by aliases
-            for alias in data.get("aliases", []):
-                alias_norm = cls._normalize_for_match(alias)
+            for alias_norm in alias_norms:
                 if alias_norm and alias_norm in citation_norm:
                     return {
                         "precedent_id": prec_id,
@@ -61,7 +68,7 @@ class PrecedentDatabase:
                     }
 
             # 3. Match by year and common reporters
-            if str(data["year"]) in citation_text:
+            if year in citation_text:
                 reporters = ["SCC", "AIR", "SCR", "JT", "SCALE", "ACC"]
                 for rep in reporters:
                     if rep in citation_upper:
@@ -2,6 +2,7 @@ import json
 import os
 import shutil
 from pathlib import Path
+from legal_ai_toolkit.utils import codec
 
 class ShowcasePreparer:
     def __init__(self, cluster_file, processed_dir, demo_dir):
@@ -16,7 +17,7 @@ class ShowcasePreparer:
             return
 
         with open(self.cluster_file) as f:
-            clusters = json.load(f)
+            clusters = codec.loads(f.read())
 
         # Find best clusters for demo
         demo_clusters = {
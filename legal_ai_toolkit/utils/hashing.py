@@ -0,0 +1,47 @@
+"""
+Full-content hashes of raw judgments.
+
+Uses xxh3-128 from the ``xxhash`` package when installed, and blake2b
+(128-bit, stdlib) otherwise. Hashes are prefixed with the algorithm name
+(``xxh3_128:...`` / ``blake2b:...``), so values from both stay comparable
+and are never silently mixed.
+"""
+import hashlib
+
+try:
+    import xxhash
+except ImportError:  # optional: blake2b is the fallback
+    xxhash = None
+
+HASH_CHUNK_SIZE = 1 << 20
+
+if xxhash is not None:
+    ALGORITHM = "xxh3_128"
+
+    def _hasher():
+        return xxhash.xxh3_128()
+else:
+    ALGORITHM = "blake2b"
+
+    def _hasher():
+        return hashlib.blake2b(digest_size=16)
+
+
+def hash_bytes(data: bytes) -> str:
+    hasher = _hasher()
+    hasher.update(data)
+    return f"{ALGORITHM}:{hasher.hexdigest()}"
+
+
+def hash_file(path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Hash a file's bytes, streamed in chunks."""
+    hasher = _hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return f"{ALGORITHM}:{hasher.hexdigest()}"
+
+
+def hash_digest(content_hash: str) -> str:
+    """The hex digest part of a prefixed hash."""
+    return content_hash.split(":", 1)[-1]
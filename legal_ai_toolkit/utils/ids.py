@@ -6,10 +6,13 @@ def generate_judgment_id(
     year: int,
     domain: str,
     text: str,
-    seq: int = None
+    seq: int = None,
+    hash_length: int = 6
 ) -> str:
     """
     Generate deterministic JITS judgment ID
+
+    hash_length widens the hash-based fallback (used to resolve collisions).
     """
 
     court_level = court_level.upper()
@@ -18,7 +21,7 @@ def generate_judgment_id(
 
     if seq is None:
         # Deterministic hash-based fallback
-        hash_part = hashlib.sha1(text.encode("utf-8")).hexdigest()[:6].upper()
+        hash_part = hashlib.sha1(text.encode("utf-8")).hexdigest()[:hash_length].upper()
         seq_part = hash_part
     else:
         seq_part = f"{seq:06d}"
@@ -0,0 +1,36 @@
+"""
+Lazy package exports (PEP 562).
+
+The package ``__init__`` modules re-export their public classes, but
+importing all of them eagerly means ``import legal_ai_toolkit`` loads every
+pipeline step, clustering, and the HTTP/HTML stack behind the downloader.
+That cost is paid again by every spawned worker process. Instead, each
+``__init__`` maps its exported names to the submodule defining them:
+
+    __getattr__, __dir__ = lazy_exports(__name__, {"BaseStep": ".runner", ...})
+
+and the submodule is imported on first attribute access (``from
+legal_ai_toolkit.pipeline import BaseStep`` still works). The resolved value
+is cached in the package namespace, so later lookups are plain attribute
+reads.
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Module-level ``__getattr__`` and ``__dir__`` for a package exporting names from (relative) submodules."""
+
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
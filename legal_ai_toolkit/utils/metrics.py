@@ -0,0 +1,259 @@
+"""
+Structured run metrics for the pipeline.
+
+Every step (BaseStep subclasses, ingestion, similarity and clustering)
+creates a ``StepMetrics``, reports each document's processing time and
+size to it, and calls ``finish()``. The summary has documents/sec,
+bytes/sec, p50/p95/p99 per-document latency, peak RSS (this process and
+its pool workers), CPU time, worker utilization (time spent processing
+documents / (wall time × workers)) and the ``SLOWEST_DOCUMENTS`` slowest
+documents with their text length and hot rule, where the step reports them.
+
+Summaries are printed as one ``[METRICS]`` line. Once a run is started on
+the process-wide ``metrics`` collector (the orchestrator does this), each
+summary is also written to ``<metrics dir>/<step>.json`` tagged with the
+run id. Steps running in child processes (``--jobs``, streaming stages)
+write their own files, and ``write_report()`` gathers the files of the
+current run into ``run_report.json`` and, optionally, a Prometheus
+textfile for node_exporter's textfile collector.
+"""
+import heapq
+import math
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows: no RSS figures
+    resource = None
+
+from legal_ai_toolkit.utils import codec
+from legal_ai_toolkit.utils.atomic import atomic_open
+
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+# Slowest documents kept per step for the run report
+SLOWEST_DOCUMENTS = 20
+PROMETHEUS_PREFIX = "legal_ai_step"
+
+
+def peak_rss_bytes() -> Optional[Dict[str, int]]:
+    """Peak resident set size of this process and of its largest (waited-for) child."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def cpu_seconds() -> float:
+    """User + system CPU time of this process and its waited-for children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def quantile(sorted_values, q: float) -> float:
+    """Nearest-rank quantile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class StepMetrics:
+    def __init__(self, step: str, workers: int = 1):
+        self.step = step
+        self.workers = max(1, workers)
+        self.latencies = array("d")
+        self.documents = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self._slowest = []  # min-heap of (seconds, seq, entry), at most SLOWEST_DOCUMENTS
+        self.started_at = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        self._cpu_start = cpu_seconds()
+
+    def observe(self, seconds: float, nbytes: int = 0, document: str = None, text_length: int = None,
+                hot_rule: Optional[Tuple[str, float]] = None):
+        """One document processed in seconds; named documents compete for the slowest list."""
+        self.latencies.append(seconds)
+        self.documents += 1
+        self.bytes += nbytes
+        self.busy_seconds += seconds
+        if document is None:
+            return
+        if len(self._slowest) == SLOWEST_DOCUMENTS and seconds <= self._slowest[0][0]:
+            return
+        entry = {"document": document, "seconds": round(seconds, 6), "text_length": text_length,
+                 "hot_rule": hot_rule[0] if hot_rule else None,
+                 "hot_rule_seconds": round(hot_rule[1], 6) if hot_rule else None}
+        item = (seconds, self.documents, entry)
+        if len(self._slowest) < SLOWEST_DOCUMENTS:
+            heapq.heappush(self._slowest, item)
+        else:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self) -> List[Dict]:
+        return [entry for _, _, entry in sorted(self._slowest, key=lambda item: item[0], reverse=True)]
+
+    def count(self, documents: int, nbytes: int = 0):
+        """Documents handled as a whole, without per-document timings (e.g. clustering)."""
+        self.documents += documents
+        self.bytes += nbytes
+
+    def add_busy(self, seconds: float):
+        """Worker time not tied to one document (e.g. a batch of pairs)."""
+        self.busy_seconds += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def summary(self, **counts) -> Dict:
+        wall = self.elapsed()
+        latencies = sorted(self.latencies)
+        summary = {
+            "step": self.step,
+            "started_at": self.started_at,
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu_seconds() - self._cpu_start, 3),
+            "workers": self.workers,
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "documents_per_second": round(self.documents / wall, 2) if wall > 0 else 0.0,
+            "bytes_per_second": round(self.bytes / wall, 1) if wall > 0 else 0.0,
+            "latency_seconds": {
+                **{f"p{int(q * 100)}": round(quantile(latencies, q), 6) for q in LATENCY_QUANTILES},
+                "max": round(latencies[-1], 6),
+                "mean": round(sum(latencies) / len(latencies), 6),
+            } if latencies else None,
+            "worker_utilization": round(min(1.0, self.busy_seconds / (wall * self.workers)), 3) if wall > 0 else 0.0,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "slowest_documents": self.slowest(),
+        }
+        summary.update(counts)
+        return summary
+
+    def finish(self, **counts) -> Dict:
+        """Summarize, print the [METRICS] line and hand the summary to the collector."""
+        summary = self.summary(**counts)
+        latency = summary["latency_seconds"]
+        rss = summary["peak_rss_bytes"]
+        line = (f"[METRICS] {self.step}: {summary['documents']} docs in {summary['wall_seconds']}s "
+                f"({summary['documents_per_second']} docs/s, {summary['bytes_per_second'] / 1e6:.2f} MB/s), ")
+        if latency:
+            line += f"p50/p95/p99 {latency['p50'] * 1000:.1f}/{latency['p95'] * 1000:.1f}/{latency['p99'] * 1000:.1f} ms, "
+        line += f"utilization {summary['worker_utilization']:.0%}"
+        if rss:
+            line += f", peak RSS {max(rss.values()) / 1e6:.0f} MB"
+        print(line)
+        if summary["slowest_documents"]:
+            slowest = summary["slowest_documents"][0]
+            hot = f", hot rule {slowest['hot_rule']} ({slowest['hot_rule_seconds'] * 1000:.1f} ms)" if slowest["hot_rule"] else ""
+            print(f"[SLOWEST] {slowest['document']}: {slowest['seconds'] * 1000:.1f} ms, "
+                  f"{slowest['text_length']} chars{hot}")
+        metrics.record(summary)
+        return summary
+
+
+class MetricsCollector:
+    """Process-wide sink for step summaries (inherited by forked step processes)."""
+
+    def __init__(self):
+        self.directory: Optional[Path] = None
+        self.run_id: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self._start = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def start_run(self, directory, run_id: Optional[str] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.started_at = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+    def record(self, summary: Dict):
+        if not self.enabled:
+            return
+        codec.dump({"run_id": self.run_id, **summary}, self.directory / f"{summary['step']}.json", pretty=True)
+
+    def steps(self) -> List[Dict]:
+        """Summaries recorded during the current run, in start order."""
+        summaries = []
+        for path in self.directory.glob("*.json"):
+            summary = codec.load(path)
+            if summary.get("run_id") == self.run_id:
+                summaries.append(summary)
+        return sorted(summaries, key=lambda s: s["started_at"])
+
+    def write_report(self, path, prometheus_file=None) -> Optional[Path]:
+        """Write the run report (and the Prometheus textfile); returns the report path."""
+        if not self.enabled:
+            return None
+        steps = self.steps()
+        report = {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(),
+            "steps": steps,
+            "totals": {
+                "wall_seconds": round(time.perf_counter() - self._start, 3),
+                "cpu_seconds": round(sum(s["cpu_seconds"] for s in steps), 3),
+                "peak_rss_bytes": max((max(s["peak_rss_bytes"].values()) for s in steps if s["peak_rss_bytes"]), default=None),
+            }
+        }
+        path = Path(path)
+        codec.dump(report, path, pretty=True)
+        if prometheus_file:
+            write_prometheus(steps, prometheus_file)
+        return path
+
+
+def write_prometheus(steps: List[Dict], path):
+    """Write step summaries in the Prometheus text exposition format (atomically, as node_exporter expects)."""
+    gauges = [
+        ("documents", "Documents processed by the step in the last run", lambda s: s["documents"]),
+        ("bytes", "Input bytes processed by the step in the last run", lambda s: s["bytes"]),
+        ("wall_seconds", "Wall time of the step in the last run", lambda s: s["wall_seconds"]),
+        ("cpu_seconds", "CPU time of the step (including workers) in the last run", lambda s: s["cpu_seconds"]),
+        ("documents_per_second", "Step throughput in documents per second", lambda s: s["documents_per_second"]),
+        ("bytes_per_second", "Step throughput in bytes per second", lambda s: s["bytes_per_second"]),
+        ("worker_utilization", "Share of worker time spent processing documents", lambda s: s["worker_utilization"]),
+        ("peak_rss_bytes", "Peak resident set size of the step or one of its workers",
+         lambda s: max(s["peak_rss_bytes"].values()) if s["peak_rss_bytes"] else None),
+    ]
+    lines = []
+    for name, help_text, value in gauges:
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge")
+        for step in steps:
+            if value(step) is not None:
+                lines.append(f'{PROMETHEUS_PREFIX}_{name}{{step="{step["step"]}"}} {value(step)}')
+
+    lines.append(f"# HELP {PROMETHEUS_PREFIX}_latency_seconds Per-document processing time in the last run")
+    lines.append(f"# TYPE {PROMETHEUS_PREFIX}_latency_seconds summary")
+    for step in steps:
+        if not step["latency_seconds"]:
+            continue
+        for q in LATENCY_QUANTILES:
+            lines.append(f'{PROMETHEUS_PREFIX}_latency_seconds{{step="{step["step"]}",quantile="{q}"}} '
+                         f'{step["latency_seconds"][f"p{int(q * 100)}"]}')
+        lines.append(f'{PROMETHEUS_PREFIX}_latency_seconds_sum{{step="{step["step"]}"}} '
+                     f'{round(step["latency_seconds"]["mean"] * step["documents"], 6)}')
+        lines.append(f'{PROMETHEUS_PREFIX}_latency_seconds_count{{step="{step["step"]}"}} {step["documents"]}')
+
+    with atomic_open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# Process-wide collector
+metrics = MetricsCollector()
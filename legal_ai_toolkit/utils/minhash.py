@@ -0,0 +1,77 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection.
+
+Signatures use one-permutation hashing: every shingle is hashed once (CRC32,
+deterministic across processes and runs, unlike ``hash()``) and
+lands in one of ``num_perm`` bins, each keeping its minimum. Empty bins are
+filled from the next non-empty bin (rotation densification), so the fraction
+of equal bins between two signatures estimates the Jaccard similarity of
+their shingle sets at O(shingles) cost, without numpy. Signatures are kept
+as ``array('I')`` (512 bytes each) so a whole corpus fits in memory.
+"""
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5          # words per shingle
+LSH_BANDS = 16            # 16 bands x 8 rows: pairs above ~0.7 similarity become candidates
+
+WORD_PATTERN = re.compile(r"\w+")
+EMPTY_BIN = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Lower-cased word n-grams of text (the whole text if it is shorter than size words)."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE) -> Optional[array]:
+    """MinHash signature of text, or None if it has no words."""
+    bins = [EMPTY_BIN] * num_perm
+    for shingle in shingles(text, shingle_size):
+        h = zlib.crc32(shingle.encode("utf-8"))
+        i = h % num_perm
+        value = h // num_perm
+        if value < bins[i]:
+            bins[i] = value
+
+    if all(value == EMPTY_BIN for value in bins):
+        return None
+
+    # Rotation densification: an empty bin takes the next filled bin's value, offset by distance
+    filled = bins[:]
+    for i in range(num_perm):
+        if bins[i] == EMPTY_BIN:
+            distance = 1
+            while bins[(i + distance) % num_perm] == EMPTY_BIN:
+                distance += 1
+            filled[i] = bins[(i + distance) % num_perm] + distance * (EMPTY_BIN // (num_perm + 1))
+    return array("I", filled)
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def candidate_groups(signatures: Dict[Hashable, array], bands: int = LSH_BANDS) -> Iterable[List[Hashable]]:
+    """
+    Yield LSH buckets with more than one key: keys whose signatures agree on a whole band.
+
+    Each key is placed in one bucket per band, so this is linear in the number of signatures.
+    """
+    rows = len(next(iter(signatures.values()))) // bands if signatures else 0
+    for band in range(bands):
+        buckets = defaultdict(list)
+        start = band * rows
+        for key, sig in signatures.items():
+            buckets[sig[start:start + rows].tobytes()].append(key)
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
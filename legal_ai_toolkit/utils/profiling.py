@@ -0,0 +1,216 @@
+"""
+Opt-in profiling for the extraction engine.
+
+When enabled (``profiler.enable()`` or ``legal_ai_toolkit pipeline --profile``),
+every registered regex rule and every extractor decorated with ``@profiled``
+records call counts, cumulative time, characters scanned and match counts. BaseStep
+groups the numbers per judgment and per step and writes them as
+``profile_<timestamp>.json`` next to the step's ``errors_*.json`` log (in
+its state directory).
+
+When disabled, a profiled extractor costs one flag check per call.
+"""
+import functools
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from legal_ai_toolkit.utils.atomic import atomic_open
+from legal_ai_toolkit.utils.rules import registry as rule_registry
+
+# Rules kept per document in the profile (by cumulative time)
+TOP_RULES_PER_DOCUMENT = 5
+
+
+def _matches(result) -> int:
+    if isinstance(result, (list, dict, tuple, set)):
+        return len(result)
+    return 1 if result else 0
+
+
+class Profiler:
+    """Collects per-rule, per-extractor and per-document timings for one step at a time."""
+
+    def __init__(self, registry=rule_registry):
+        self.enabled = False
+        self._registry = registry
+        self._step = None
+        self._step_start = 0.0
+        self._extractors: Dict[str, list] = {}
+        self._documents: List[Dict] = []
+        self._document = None
+
+    def enable(self):
+        self.enabled = True
+        self._registry.enable_stats()
+
+    def disable(self):
+        self.enabled = False
+        self._registry.disable_stats()
+
+    # --- collection ---
+
+    def begin_step(self, step_name: str):
+        """Reset counters and start collecting for a pipeline step."""
+        self._registry.reset_stats()
+        self._extractors = {}
+        self._documents = []
+        self._step = step_name
+        self._step_start = time.perf_counter()
+
+    @contextmanager
+    def document(self, document_id: str, nchars: int):
+        """Attribute rule and extractor timings inside the block to one document."""
+        if not self.enabled:
+            yield None
+            return
+
+        doc = {"document": document_id, "chars": nchars, "rules": {}, "extractors": {}}
+        self._document = doc
+        self._registry.document_stats = doc["rules"]
+        start = time.perf_counter()
+        try:
+            yield doc
+        finally:
+            doc["total_time"] = time.perf_counter() - start
+            self._registry.document_stats = None
+            self._document = None
+            self._documents.append(self._summarize_document(doc))
+
+    def record_extractor(self, name: str, elapsed: float, nchars: int, matches: int):
+        entry = self._extractors.get(name)
+        if entry is None:
+            entry = self._extractors[name] = [0, 0.0, 0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += nchars
+        entry[3] += matches
+
+        if self._document is not None:
+            extractors = self._document["extractors"]
+            extractors[name] = extractors.get(name, 0.0) + elapsed
+
+    def _summarize_document(self, doc: Dict) -> Dict:
+        top_rules = sorted(doc["rules"].items(), key=lambda item: item[1][2], reverse=True)
+        return {
+            "document": doc["document"],
+            "chars": doc["chars"],
+            "total_time": doc["total_time"],
+            "extractors": doc["extractors"],
+            "top_rules": [
+                {"rule_id": rule_id, "calls": calls, "hits": hits, "total_time": elapsed, "chars_scanned": nchars}
+                for rule_id, (calls, hits, elapsed, nchars) in top_rules[:TOP_RULES_PER_DOCUMENT]
+            ],
+        }
+
+    def end_step(self) -> Dict:
+        """Return the profile for the current step."""
+        profile = {
+            "timestamp": datetime.now().isoformat(),
+            "step": self._step,
+            "total_time": time.perf_counter() - self._step_start,
+            "documents_profiled": len(self._documents),
+            "rules": self._registry.stats(),
+            "extractors": sorted(
+                (
+                    {"name": name, "calls": calls, "total_time": elapsed, "chars_scanned": nchars, "matches": matches}
+                    for name, (calls, elapsed, nchars, matches) in self._extractors.items()
+                ),
+                key=lambda row: row["total_time"],
+                reverse=True,
+            ),
+            "documents": sorted(self._documents, key=lambda row: row["total_time"], reverse=True),
+        }
+        self._step = None
+        return profile
+
+    @staticmethod
+    def write(profile: Dict, output_dir) -> Path:
+        """Write a step profile to output_dir (a step's state dir) as profile_<timestamp>.json."""
+        path = Path(output_dir) / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with atomic_open(path, "w") as f:
+            json.dump(profile, f, indent=2, ensure_ascii=False)
+        return path
+
+
+# Process-wide profiler
+profiler = Profiler()
+
+
+def profiled(name: str, matches: Callable = None):
+    """
+    Decorator recording time, characters scanned and matches of an extractor when profiling is on.
+
+    Characters scanned is the length of the first str argument. Matches is the length
+    of the result (or 1/0 for scalars) unless a ``matches`` callable is given.
+    """
+    count = matches or _matches
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            text = next((a for a in args if isinstance(a, str)), "")
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            profiler.record_extractor(name, time.perf_counter() - start, len(text), count(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def load_profiles(path) -> List[Dict]:
+    """Load one profile file, or every profile_*.json under a directory."""
+    path = Path(path)
+    files = sorted(path.rglob("profile_*.json")) if path.is_dir() else [path]
+    profiles = []
+    for file in files:
+        with open(file, "r", encoding="utf-8") as f:
+            profiles.append(json.load(f))
+    return profiles
+
+
+def print_profile_report(path, top: int = 10):
+    """Print the top-N slowest rules, extractors and documents across profiles."""
+    profiles = load_profiles(path)
+    if not profiles:
+        print(f"No profiles found in {path}")
+        return
+
+    rules: Dict[str, Dict] = {}
+    extractors: Dict[str, Dict] = {}
+    documents = []
+    for profile in profiles:
+        for row in profile.get("rules", []):
+            agg = rules.setdefault(row["rule_id"], {"calls": 0, "hits": 0, "total_time": 0.0, "chars_scanned": 0})
+            for key in agg:
+                agg[key] += row.get(key, 0)
+        for row in profile.get("extractors", []):
+            agg = extractors.setdefault(row["name"], {"calls": 0, "total_time": 0.0, "chars_scanned": 0, "matches": 0})
+            for key in agg:
+                agg[key] += row.get(key, 0)
+        for doc in profile.get("documents", []):
+            documents.append(dict(doc, step=profile.get("step")))
+
+    print(f"Loaded {len(profiles)} profile(s) from {path}")
+
+    print(f"\nTop {top} slowest rules:")
+    print(f"  {'rule':<45} {'calls':>8} {'hits':>8} {'time (s)':>10} {'M chars':>11}")
+    for rule_id, row in sorted(rules.items(), key=lambda item: item[1]["total_time"], reverse=True)[:top]:
+        print(f"  {rule_id[:45]:<45} {row['calls']:>8} {row['hits']:>8} {row['total_time']:>10.4f} {row['chars_scanned'] / 1e6:>11.2f}")
+
+    if extractors:
+        print(f"\nExtractors:")
+        print(f"  {'extractor':<45} {'calls':>8} {'matches':>8} {'time (s)':>10} {'M chars':>11}")
+        for name, row in sorted(extractors.items(), key=lambda item: item[1]["total_time"], reverse=True)[:top]:
+            print(f"  {name[:45]:<45} {row['calls']:>8} {row['matches']:>8} {row['total_time']:>10.4f} {row['chars_scanned'] / 1e6:>11.2f}")
+
+    print(f"\nTop {top} slowest documents:")
+    print(f"  {'document':<40} {'step':<26} {'chars':>9} {'time (s)':>10}  hottest rule")
+    for doc in sorted(documents, key=lambda row: row["total_time"], reverse=True)[:top]:
+        hottest = doc["top_rules"][0]["rule_id"] if doc.get("top_rules") else "-"
+        print(f"  {str(doc['document'])[:40]:<40} {str(doc['step'])[:26]:<26} {doc.get('chars', doc.get('bytes', 0)):>9} {doc['total_time']:>10.4f}  {hottest}")
@@ -0,0 +1,49 @@
+"""
+Thread-safe token bucket shared by every request a client makes.
+
+``acquire()`` blocks until a token is available, so the request rate stays
+at ``rate`` per second (with bursts up to ``capacity``) however many worker
+threads are issuing requests. ``pause()`` holds every caller back, which is
+how a server's ``Retry-After`` is honoured across all in-flight queries.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least seconds from now (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            # No burst straight after the pause
+            self._tokens = 0
+            self._updated = max(self._updated, self._paused_until)
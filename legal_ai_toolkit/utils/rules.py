@@ -0,0 +1,343 @@
+"""
+Compile-once rule registry shared by all extraction modules.
+
+Every regex rule used by the extractors and classifiers is registered here
+under a stable id and a version. Patterns are compiled once, on first use,
+and extractors call the rule objects directly instead of passing raw strings
+to ``re.*`` (whose internal cache thrashes once several hundred distinct
+patterns are live).
+
+Patterns are compiled with the ``regex`` package when it is installed (it is
+faster on this rule set and supports per-call timeouts), and with the stdlib
+``re`` module otherwise; the two agree on every pattern registered here.
+
+Optional per-rule statistics (calls, hits, cumulative time, characters scanned)
+can be switched on with ``registry.enable_stats()``; when off, a rule call is
+a thin wrapper around the compiled pattern. While stats are on, a caller may
+also set ``registry.document_stats`` to a dict to collect the same counters
+for a single document (see ``utils.profiling``). Independently of stats,
+``registry.rule_times`` may be set to a dict to collect just the time per
+rule for one document; BaseStep uses it to name the hot rule of its slowest
+documents.
+
+``registry.time_budget(seconds)`` sets a wall-clock deadline for one
+document, counted from the start of its processing (so time spent outside
+rule calls counts too). Past the deadline, rules return "no match" instead
+of scanning, and the skipped rule ids are recorded so the caller can attach a
+warning to the document. With the ``regex`` package, a single runaway match
+is also interrupted at the deadline. A budget on its own costs one clock read
+per rule call; calls are only timed while stats or rule times are collected.
+"""
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import regex as regex_engine
+except ImportError:  # stdlib fallback: budgets are checked between rule calls only
+    regex_engine = None
+
+ENGINE = regex_engine or re
+
+
+class TimeBudget:
+    """Time budget for one document, shared by every rule call made under it."""
+
+    __slots__ = ("seconds", "deadline", "skipped")
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.deadline = time.perf_counter() + seconds if seconds else None
+        self.skipped: Dict[str, str] = {}  # rule_id -> "exhausted" | "timeout"
+
+    @property
+    def exceeded(self) -> bool:
+        return bool(self.skipped)
+
+    def remaining(self) -> float:
+        return self.deadline - time.perf_counter()
+
+
+class Rule:
+    """A named, versioned regex rule compiled on first use."""
+
+    __slots__ = ("rule_id", "pattern", "flags", "version", "_regex", "_registry",
+                 "calls", "hits", "total_time", "chars_scanned")
+
+    def __init__(self, rule_id: str, pattern: str, flags: int = 0, version: str = "1", registry=None):
+        self.rule_id = rule_id
+        self.pattern = pattern
+        self.flags = flags
+        self.version = version
+        self._regex = None
+        self._registry = registry
+        self.calls = 0
+        self.hits = 0
+        self.total_time = 0.0
+        self.chars_scanned = 0
+
+    def __repr__(self):
+        return f"Rule({self.rule_id!r}, v{self.version})"
+
+    @property
+    def regex(self):
+        """The compiled pattern (compiled on first access)."""
+        if self._regex is None:
+            self._regex = ENGINE.compile(self.pattern, self.flags)
+        return self._regex
+
+    @property
+    def compiled(self) -> bool:
+        return self._regex is not None
+
+    def _instrumented(self) -> bool:
+        registry = self._registry
+        return registry is not None and (registry.stats_enabled or registry.budget is not None
+                                         or registry.rule_times is not None)
+
+    def _timed(self) -> bool:
+        """Whether calls are timed (stats or rule times on); a budget alone only reads the clock once per call."""
+        return self._registry.stats_enabled or self._registry.rule_times is not None
+
+    def _timeout(self):
+        """Keyword arguments for a call under the active budget; None if it is used up."""
+        budget = self._registry.budget
+        if budget is None:
+            return {}
+        remaining = budget.remaining()
+        if remaining <= 0:
+            budget.skipped.setdefault(self.rule_id, "exhausted")
+            return None
+        return {"timeout": remaining} if regex_engine is not None else {}
+
+    def _timed_out(self):
+        self._registry.budget.skipped[self.rule_id] = "timeout"
+
+    def _call(self, call, fallback, count_hits, nchars: int):
+        """Run call(**timeout kwargs) under the active budget, recording its time if calls are timed."""
+        kwargs = self._timeout()
+        if kwargs is None:
+            return fallback
+        if not self._timed():
+            try:
+                return call(**kwargs)
+            except TimeoutError:
+                self._timed_out()
+                return fallback
+        start = time.perf_counter()
+        try:
+            result = call(**kwargs)
+        except TimeoutError:
+            self._timed_out()
+            result = fallback
+        self._record(time.perf_counter() - start, count_hits(result), nchars)
+        return result
+
+    def _record(self, elapsed: float, hits: int, nchars: int):
+        rule_times = self._registry.rule_times
+        if rule_times is not None:
+            rule_times[self.rule_id] = rule_times.get(self.rule_id, 0.0) + elapsed
+        if not self._registry.stats_enabled:
+            return
+        self.calls += 1
+        self.hits += hits
+        self.total_time += elapsed
+        self.chars_scanned += nchars
+
+        document_stats = self._registry.document_stats
+        if document_stats is not None:
+            entry = document_stats.get(self.rule_id)
+            if entry is None:
+                entry = document_stats[self.rule_id] = [0, 0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += hits
+            entry[2] += elapsed
+            entry[3] += nchars
+
+    # --- re.Pattern-compatible API ---
+
+    def search(self, text: str, pos: int = 0, endpos: int = None):
+        regex = self.regex
+        if endpos is None:
+            endpos = len(text)
+        if not self._instrumented():
+            return regex.search(text, pos, endpos)
+        return self._call(lambda **kwargs: regex.search(text, pos, endpos, **kwargs), None,
+                          lambda match: 1 if match else 0, endpos - pos)
+
+    def match(self, text: str, pos: int = 0, endpos: int = None):
+        regex = self.regex
+        if endpos is None:
+            endpos = len(text)
+        if not self._instrumented():
+            return regex.match(text, pos, endpos)
+        return self._call(lambda **kwargs: regex.match(text, pos, endpos, **kwargs), None,
+                          lambda match: 1 if match else 0, endpos - pos)
+
+    def findall(self, text: str) -> List:
+        if not self._instrumented():
+            return self.regex.findall(text)
+        return self._call(lambda **kwargs: self.regex.findall(text, **kwargs), [], len, len(text))
+
+    def finditer(self, text: str) -> Iterator:
+        if not self._instrumented():
+            return self.regex.finditer(text)
+        kwargs = self._timeout()
+        if kwargs is None:
+            return iter(())
+        if not kwargs and not self._timed():
+            # Budget without per-call timeout (stdlib re): nothing to catch or time while iterating
+            return self.regex.finditer(text)
+        return self._timed_finditer(text, kwargs)
+
+    def _timed_finditer(self, text: str, kwargs: Dict) -> Iterator:
+        iterator = self.regex.finditer(text, **kwargs)
+        timed = self._timed()
+        hits = 0
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter() if timed else 0.0
+                try:
+                    match = next(iterator, None)
+                except TimeoutError:
+                    self._timed_out()
+                    match = None
+                if timed:
+                    elapsed += time.perf_counter() - start
+                if match is None:
+                    break
+                hits += 1
+                yield match
+        finally:
+            if timed:
+                self._record(elapsed, hits, len(text))
+
+    def sub(self, repl, text: str, count: int = 0) -> str:
+        if not self._instrumented():
+            return self.regex.sub(repl, text, count)
+        result, _ = self._call(lambda **kwargs: self.regex.subn(repl, text, count, **kwargs), (text, 0),
+                               lambda result: result[1], len(text))
+        return result
+
+    def split(self, text: str, maxsplit: int = 0) -> List[str]:
+        if not self._instrumented():
+            return self.regex.split(text, maxsplit)
+        return self._call(lambda **kwargs: self.regex.split(text, maxsplit, **kwargs), [text],
+                          lambda parts: len(parts) - 1, len(text))
+
+    # --- statistics ---
+
+    def reset_stats(self):
+        self.calls = 0
+        self.hits = 0
+        self.total_time = 0.0
+        self.chars_scanned = 0
+
+    def stats(self) -> Dict:
+        return {
+            "rule_id": self.rule_id,
+            "version": self.version,
+            "calls": self.calls,
+            "hits": self.hits,
+            "total_time": self.total_time,
+            "chars_scanned": self.chars_scanned,
+        }
+
+
+class RuleRegistry:
+    """Registry of named rules, keyed by rule id."""
+
+    def __init__(self):
+        self._rules: Dict[str, Rule] = {}
+        self.stats_enabled = False
+        # rule_id -> [calls, hits, total_time, chars_scanned] for the current document
+        self.document_stats: Optional[Dict[str, list]] = None
+        # rule_id -> regex time for the current document (slow-document tracing)
+        self.rule_times: Optional[Dict[str, float]] = None
+        # Active per-document time budget (see time_budget)
+        self.budget: Optional[TimeBudget] = None
+
+    def register(self, rule_id: str, pattern: str, flags: int = 0, version: str = "1") -> Rule:
+        """
+        Register a rule and return it.
+
+        Registering the same id again with the same pattern and flags returns
+        the existing rule; a different pattern under an existing id is an error.
+        """
+        existing = self._rules.get(rule_id)
+        if existing is not None:
+            if existing.pattern != pattern or existing.flags != flags:
+                raise ValueError(f"Rule id already registered with a different pattern: {rule_id}")
+            return existing
+
+        rule = Rule(rule_id, pattern, flags=flags, version=version, registry=self)
+        self._rules[rule_id] = rule
+        return rule
+
+    def get(self, rule_id: str) -> Optional[Rule]:
+        return self._rules.get(rule_id)
+
+    def __getitem__(self, rule_id: str) -> Rule:
+        return self._rules[rule_id]
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def __iter__(self):
+        return iter(self._rules.values())
+
+    def __len__(self):
+        return len(self._rules)
+
+    def compile_all(self) -> int:
+        """Compile every registered rule now; returns the number of rules."""
+        for rule in self._rules.values():
+            rule.regex
+        return len(self._rules)
+
+    @contextmanager
+    def time_budget(self, seconds: Optional[float]):
+        """
+        Give rules called inside the block a wall-clock deadline `seconds` from now (None: unbounded).
+
+        Yields the TimeBudget; after the block, ``budget.skipped`` lists the rules
+        that were cut short.
+        """
+        budget = TimeBudget(seconds)
+        if budget.deadline is None:
+            yield budget
+            return
+        previous, self.budget = self.budget, budget
+        try:
+            yield budget
+        finally:
+            self.budget = previous
+
+    # --- statistics ---
+
+    def enable_stats(self):
+        self.stats_enabled = True
+
+    def disable_stats(self):
+        self.stats_enabled = False
+
+    def reset_stats(self):
+        for rule in self._rules.values():
+            rule.reset_stats()
+
+    def stats(self, sort_by: str = "total_time") -> List[Dict]:
+        """Per-rule statistics for rules that have been called, slowest first."""
+        rows = [rule.stats() for rule in self._rules.values() if rule.calls]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows
+
+
+# Process-wide registry used by all extraction modules
+registry = RuleRegistry()
+
+
+def register(rule_id: str, pattern: str, flags: int = 0, version: str = "1") -> Rule:
+    """Register a rule in the shared registry."""
+    return registry.register(rule_id, pattern, flags=flags, version=version)
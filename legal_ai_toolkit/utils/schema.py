@@ -0,0 +1,116 @@
+"""
+Precompiled validation against the JSON schemas in ``schemas/``.
+
+``compile_schema`` turns a schema into a tree of small check functions once,
+so validating a record does not re-walk the schema document. It supports the
+draft-07 subset our schemas use: ``type``, ``required``, ``properties``,
+``items``, ``enum`` and ``minLength``. Annotation keywords (``title``,
+``description``, ``$schema``) are ignored; any other keyword is rejected at
+compile time rather than silently not enforced.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from legal_ai_toolkit.utils import codec
+
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+ANNOTATION_KEYWORDS = {"$schema", "$id", "title", "description"}
+TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+# A compiled check appends "path: message" strings to the error list
+Check = Callable[[object, str, List[str]], None]
+
+
+def load_schema(name: str) -> Dict:
+    """Load schemas/<name>.schema.json."""
+    return codec.load(SCHEMAS_DIR / f"{name}.schema.json")
+
+
+def compile_schema(schema: Dict) -> Callable[[object], List[str]]:
+    """Compile a schema into a function returning the list of validation errors (empty if valid)."""
+    check = _compile(schema, "$")
+
+    def validate(instance) -> List[str]:
+        errors: List[str] = []
+        check(instance, "$", errors)
+        return errors
+
+    return validate
+
+
+def _compile(schema: Dict, where: str) -> Check:
+    unknown = set(schema) - ANNOTATION_KEYWORDS - {"type", "required", "properties", "items", "enum", "minLength"}
+    if unknown:
+        raise ValueError(f"Unsupported schema keyword(s) at {where}: {', '.join(sorted(unknown))}")
+
+    checks: List[Check] = []
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        type_checks = [TYPE_CHECKS[t] for t in types]
+        expected = " or ".join(types)
+
+        def check_type(value, path, errors):
+            if not any(test(value) for test in type_checks):
+                errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} is not one of {allowed}")
+        checks.append(check_enum)
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+
+        def check_min_length(value, path, errors):
+            if isinstance(value, str) and len(value) < min_length:
+                errors.append(f"{path}: shorter than {min_length} character(s)")
+        checks.append(check_min_length)
+
+    if "required" in schema:
+        required = schema["required"]
+
+        def check_required(value, path, errors):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append(f"{path}: missing required property '{key}'")
+        checks.append(check_required)
+
+    if "properties" in schema:
+        properties = {key: _compile(sub, f"{where}.{key}") for key, sub in schema["properties"].items()}
+
+        def check_properties(value, path, errors):
+            if isinstance(value, dict):
+                for key, check in properties.items():
+                    if key in value:
+                        check(value[key], f"{path}.{key}", errors)
+        checks.append(check_properties)
+
+    if "items" in schema:
+        item_check = _compile(schema["items"], f"{where}[]")
+
+        def check_items(value, path, errors):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", errors)
+        checks.append(check_items)
+
+    def check_all(value, path, errors):
+        for check in checks:
+            check(value, path, errors)
+
+    return check_all
@@ -1,4 +1,10 @@
 import re
+from legal_ai_toolkit.utils.rules import register
+from legal_ai_toolkit.utils.profiling import profiled
+
+# Compiled rules keyed by keyword / section number (populated at import)
+_KEYWORD_RULES = {}
+_SECTION_RULES = {}
 
 class LegalIssueTaxonomy:
     TAXONOMY = {
@@ -58,31 +64,52 @@ class LegalIssueTaxonomy:
         }
     }
 
+    @staticmethod
+    def _keyword_rule(kw: str):
+        rule = _KEYWORD_RULES.get(kw)
+        if rule is None:
+            rule = _KEYWORD_RULES[kw] = register(f"taxonomy.keyword.{kw}", rf'\b{re.escape(kw)}\b')
+        return rule
+
+    @staticmethod
+    def _section_rule(sec: str):
+        rule = _SECTION_RULES.get(sec)
+        if rule is None:
+            rule = _SECTION_RULES[sec] = register(
+                f"taxonomy.section.{sec}", rf'\b(?:Article|Section|u/s)\s+{sec}\b', re.IGNORECASE
+            )
+        return rule
+
     @classmethod
+    def register_rules(cls):
+        """Register every keyword and section rule used by TAXONOMY."""
+        for data in cls.TAXONOMY.values():
+            for kw in data["keywords"]:
+                cls._keyword_rule(kw)
+            for sec in data["sections"]:
+                cls._section_rule(sec)
+
+    @classmethod
+    @profiled("taxonomy.extract")
     def extract(cls, text: str):
         issues = {}
         text_lower = text.lower()
 
         for issue, data in cls.TAXONOMY.items():
             found_keywords = []
+            mention_count = 0
             for kw in data["keywords"]:
                 # Count keyword occurrences to avoid false positives
-                pattern = rf'\b{re.escape(kw)}\b'
-                matches = re.findall(pattern, text_lower)
+                matches = cls._keyword_rule(kw).findall(text_lower)
                 if len(matches) >= 1:  # At least 1 occurrence
                     found_keywords.append(kw)
+                    mention_count += len(matches)
 
             found_sections = []
             for sec in data["sections"]:
-                patterns = [
-                    rf'\bArticle\s+{sec}\b',
-                    rf'\bSection\s+{sec}\b',
-                    rf'\bu/s\s+{sec}\b'
-                ]
-                for pattern in patterns:
-                    if re.search(pattern, text, re.IGNORECASE):
-                        found_sections.append(sec)
-                        break
+                # "Article <sec>", "Section <sec>" or "u/s <sec>"
+                if cls._section_rule(sec).search(text):
+                    found_sections.append(sec)
 
             # CRITICAL FIX: Only add issue if evidence is strong enough
             if not (found_keywords or found_sections):
@@ -105,6 +132,10 @@ class LegalIssueTaxonomy:
                     "sections": found_sections,
                     "confidence": confidence,
                     "keyword_count": len(found_keywords),
-                    "mention_count": sum(len(re.findall(rf'\b{re.escape(kw)}\b', text_lower)) for kw in found_keywords)
+                    "mention_count": mention_count
                 }
         return issues
+
+
+# Compile-once: register every taxonomy rule at import
+LegalIssueTaxonomy.register_rules()
@@ -1,108 +1,19 @@
 
-import json
+import argparse
 import subprocess
-from datetime import datetime
+import sys
+from multiprocessing import cpu_count
+from pathlib import Path
+
+# Allow running as `python scripts/normalize_dataset.py` from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from legal_ai_toolkit.export.jsonl import JSONLExporter
 
 # Commit hash containing the full 846 judgments
 COMMIT_HASH = "9a4f934"
 DATA_DIR = "legal_ai_toolkit/data/judgments"
 OUTPUT_FILE = "train.jsonl"
 
-def normalize_string(val):
-    return str(val) if val is not None else ""
-
-def normalize_list(val):
-    if val is None:
-        return []
-    if isinstance(val, list):
-        return [str(v) for v in val] # Ensure all items are strings
-    return []
-
-def normalize_dict(val):
-    return val if isinstance(val, dict) else {}
-
-def normalize_record(data):
-    """
-    Enforces a strict schema for each record.
-    """
-    # 1. Core Fields
-    judgment_id = normalize_string(data.get("judgment_id"))
-    text = normalize_string(data.get("text"))
-
-    # 2. Metadata (Flatten/normalize known fields)
-    raw_meta = normalize_dict(data.get("metadata"))
-    metadata = {
-        "court": normalize_string(raw_meta.get("court")),
-        "date": normalize_string(raw_meta.get("date")),
-        "bench": normalize_list(raw_meta.get("bench")),
-        "case_type": normalize_string(raw_meta.get("case_type")),
-        "case_number": normalize_string(raw_meta.get("case_number")),
-        "petitioner": normalize_string(raw_meta.get("petitioner")),
-        "respondent": normalize_string(raw_meta.get("respondent"))
-    }
-
-    # 3. Classification
-    raw_class = normalize_dict(data.get("classification"))
-    classification = {
-        "domain": normalize_string(raw_class.get("domain")),
-        "confidence": normalize_string(raw_class.get("confidence", "low")), 
-        "signals": raw_class.get("signals", {}) 
-    }
-    # Ensure signals values are lists
-    if not isinstance(classification["signals"], dict):
-        classification["signals"] = {}
-    for k, v in classification["signals"].items():
-        if not isinstance(v, list):
-            classification["signals"][k] = []
-    
-    # 4. Extractions (Handle both keys and map correctly)
-    raw_extract = data.get("extractions") or data.get("annotations") or {}
-    raw_extract = normalize_dict(raw_extract)
-    
-    # Map 'annotations' keys to 'extractions' schema if needed
-    # In some JSONs: annotations = {citations: [], issues: {details: ...}}
-    # We want extractions = {citations: [], sections: [], landmarks: []}
-    
-    citations = normalize_list(raw_extract.get("citations"))
-    
-    # Try to find sections and landmarks, default to empty if not found
-    sections = normalize_list(raw_extract.get("sections"))
-    landmarks = normalize_list(raw_extract.get("landmarks"))
-    
-    extractions = {
-        "citations": citations,
-        "sections": sections,
-        "landmarks": landmarks
-    }
-
-    # 5. Statutory Transitions
-    raw_trans = data.get("statutory_transitions")
-    statutory_transitions = []
-    if isinstance(raw_trans, list):
-        for item in raw_trans:
-            if isinstance(item, dict):
-                 # Ensure all values in transition dict are strings
-                clean_item = {k: str(v) for k, v in item.items()}
-                statutory_transitions.append(clean_item)
-    
-    # 6. Provenance
-    raw_prov = normalize_dict(data.get("provenance"))
-    provenance = {
-        "version": normalize_string(raw_prov.get("version", "1.0")),
-        "processed_date": normalize_string(raw_prov.get("processed_date", datetime.now().isoformat()))
-    }
-    
-    # Construct final record
-    return {
-        "judgment_id": judgment_id,
-        "text": text,
-        "metadata": metadata,
-        "classification": classification,
-        "extractions": extractions,
-        "statutory_transitions": statutory_transitions,
-        "provenance": provenance
-    }
-
 def get_git_files(commit, path):
     """List files in a specific commit and directory."""
     try:
@@ -113,37 +24,78 @@ def get_git_files(commit, path):
         print(f"Error listing files: {e}")
         return []
 
-def read_git_file(commit, path):
-    """Read a file content from a specific commit."""
-    try:
-        cmd = ["git", "show", f"{commit}:{path}"]
-        content = subprocess.check_output(cmd, text=True, encoding="utf-8")
-        return json.loads(content)
-    except Exception as e:
-        print(f"Error reading file {path}: {e}")
-        return None
+def resolve_commit(commit):
+    """Return the full hash of a commit-ish."""
+    return subprocess.check_output(["git", "rev-parse", "--verify", f"{commit}^{{commit}}"], text=True).strip()
+
+def is_clean_head(commit, path):
+    """True if commit is HEAD and the working tree under path matches it."""
+    if resolve_commit(commit) != resolve_commit("HEAD"):
+        return False
+    status = subprocess.check_output(["git", "status", "--porcelain", "--", path], text=True)
+    return not status.strip()
+
+class GitBlobReader:
+    """Stream file contents out of one long-lived `git cat-file --batch` process."""
+
+    def __init__(self, commit):
+        self.commit = commit
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def read(self, path):
+        """Return the raw bytes of path at the commit, or None if it is missing."""
+        self.process.stdin.write(f"{self.commit}:{path}\n".encode("utf-8"))
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().decode("utf-8").split()
+        if len(header) != 3 or header[1] != "blob":
+            return None
+        content = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)  # trailing newline
+        return content
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_blobs(commit, files, data_dir):
+    """Yield (path, raw bytes) in listing order, from the working tree when it matches commit."""
+    if is_clean_head(commit, data_dir):
+        print("Commit is HEAD with a clean working tree, reading files directly.")
+        for fpath in files:
+            yield fpath, Path(fpath).read_bytes()
+        return
+
+    with GitBlobReader(commit) as reader:
+        for fpath in files:
+            yield fpath, reader.read(fpath)
 
 def main():
-    print(f"Listing files from commit {COMMIT_HASH} in {DATA_DIR}...")
-    files = get_git_files(COMMIT_HASH, DATA_DIR)
+    parser = argparse.ArgumentParser(description="Export judgments from a commit as a normalized JSONL file")
+    parser.add_argument("--commit", default=COMMIT_HASH)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--quarantine", default=None, help="Rejected records (default: <output>.quarantine.jsonl)")
+    parser.add_argument("--workers", type=int, default=max(1, cpu_count() - 1))
+    args = parser.parse_args()
+
+    print(f"Listing files from commit {args.commit} in {args.data_dir}...")
+    files = get_git_files(args.commit, args.data_dir)
     print(f"Found {len(files)} JSON files in git history.")
     
     if not files:
         print("No files found!")
         return
 
-    count = 0
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as out_f:
-        for fpath in files:
-            data = read_git_file(COMMIT_HASH, fpath)
-            if data:
-                clean_record = normalize_record(data)
-                out_f.write(json.dumps(clean_record) + '\n')
-                count += 1
-            if count % 100 == 0:
-                print(f"Processed {count} files...")
-    
-    print(f"Successfully wrote {count} records to {OUTPUT_FILE}")
+    exporter = JSONLExporter(args.output, quarantine_file=args.quarantine, workers=args.workers)
+    exporter.run(iter_blobs(args.commit, files, args.data_dir))
 
 if __name__ == "__main__":
     main()